@@ -7,6 +7,7 @@ create_app(config_override) returns a configured Flask app and calls `db.init_ap
 so the shared extension is registered with the Flask application instance.
 """
 
+import atexit
 import os
 
 try:
@@ -24,11 +25,18 @@ if load_dotenv is not None:
 # be None and will be created inside `create_app` when needed.
 try:
     from flask_sqlalchemy import SQLAlchemy as _SQLAlchemy
+
+    # Session routing reads in @read_replica views to DATABASE_REPLICA_URL
+    from app.replicas import RoutingSession as _RoutingSession
 except Exception:
     _SQLAlchemy = None
 
 # Shared SQLAlchemy instance (may be None in very minimal environments)
-db = _SQLAlchemy() if _SQLAlchemy is not None else None
+db = (
+    _SQLAlchemy(session_options={"class_": _RoutingSession})
+    if _SQLAlchemy is not None
+    else None
+)
 # Rate limiter placeholder (initialized in create_app when available)
 limiter = None
 
@@ -48,6 +56,9 @@ def create_app(config_override=None):
     try:
         from flask_limiter import Limiter
         from flask_limiter.util import get_remote_address
+
+        # Registers the process-shared sqlite:// storage scheme
+        from app import ratelimit_storage  # noqa: F401
     except Exception:
         Limiter = None
         get_remote_address = None
@@ -57,27 +68,72 @@ def create_app(config_override=None):
         Migrate = None
     from werkzeug.exceptions import HTTPException
 
+    from app.assets import init_assets
+    from app.compression import init_compression
+    from app.json_provider import init_json
+    from app.metrics import init_metrics
+    from app.profiling import init_profiling
+    from app.static_cache import init_static_serving
+    from app.db_pool import engine_options
+    from app.jobs import init_job_runner
+    from app.replicas import REPLICA_BIND, configure_replica
+    from app.post_writer import init_post_writer
+    from app.settings import get_settings, install_settings, load_settings
+
     global db, limiter
 
     app = Flask(__name__)
     # Apply base config from environment, then override with provided dict
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL")
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "default-secret-key")
-    app.config["ENABLE_RATE_LIMITING"] = (
-        os.getenv("ENABLE_RATE_LIMITING", "true").lower() == "true"
-    )
     if config_override:
         app.config.update(config_override)
+    # Snapshot runtime flags once; handlers read them via get_settings()
+    install_settings(app, load_settings(overrides=config_override), config_override)
+
+    # Pool sizing/pre-ping from DB_POOL_* settings; explicit options win
+    pool_options = engine_options(
+        get_settings(app), app.config.get("SQLALCHEMY_DATABASE_URI")
+    )
+    pool_options.update(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = pool_options
+    configure_replica(app, get_settings(app), engine_options)
 
     # Ensure a single SQLAlchemy instance is used across the package
     if db is None:
         db = SQLAlchemy()
     db.init_app(app)
+    # The replica mirrors the primary's tables; it has no models of its own,
+    # and its (empty) metadata would break create_all() for apps without it
+    db.metadatas.pop(REPLICA_BIND, None)
     if Migrate is not None:
         Migrate(app, db)
 
-    # Configure optional rate limiter
+    # Optional group-commit pipeline for POST /api/posts
+    writer = init_post_writer(app, db, get_settings(app))
+    if writer is not None:
+        atexit.register(writer.close)
+
+    # Sampled request profiles (ENABLE_PROFILING); see app/profiling.py
+    init_profiling(app, get_settings(app))
+    # Prometheus metrics and GET /metrics (ENABLE_METRICS); see app/metrics.py
+    init_metrics(app, get_settings(app))
+    # orjson-backed jsonify when installed (JSON_BACKEND); see app/json_provider.py
+    init_json(app, get_settings(app))
+    # Hashed/minified static build (STATIC_DIST=1); see app/assets.py
+    init_assets(app, get_settings(app))
+    # STATIC_SERVE=memory|x-accel|x-sendfile keeps static files off Flask
+    init_static_serving(app, get_settings(app))
+    # gzip/brotli for API responses over COMPRESS_MIN_SIZE; see app/compression.py
+    init_compression(app, get_settings(app))
+
+    # Housekeeping jobs; the scheduler thread starts per worker when enabled
+    runner = init_job_runner(app, get_settings(app))
+    atexit.register(runner.stop)
+
+    # Configure optional rate limiter. Storage comes from RATELIMIT_STORAGE_URI
+    # (mirrored into app.config by the settings snapshot); use a sqlite:// URI
+    # so all workers on a host share one limit.
     if app.config.get("ENABLE_RATE_LIMITING") and Limiter is not None:
         limiter = Limiter(key_func=get_remote_address)
         limiter.init_app(app)
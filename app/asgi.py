@@ -0,0 +1,686 @@
+"""
+app/asgi.py
+
+ASGI serving mode for the long-lived and read-heavy endpoints.
+
+Run with:
+    uvicorn --factory app.asgi:create_asgi_app --host 0.0.0.0 --port 5000
+
+`AsyncJeetApp` serves these routes on the event loop:
+
+- ``GET /api/posts`` (feed, same shape and parameters as the Flask view)
+- ``GET /api/posts/stream`` (Server-Sent Events: one ``post`` event per new
+  post, resumable with ``Last-Event-ID`` or ``?after_id=``)
+- ``GET /api/posts/<id>/kindness``
+- ``POST /api/kindness/token``, ``/api/kindness/tokens``, ``/api/kindness/redeem``
+
+Queries use the same `app/models.py` tables through SQLAlchemy's asyncio
+engine (asyncpg for Postgres, aiosqlite for SQLite; ``pip install -e
+.[asgi]``). A slow or idle client therefore holds a coroutine, not a worker
+thread. Every other request falls through to the regular Flask app, which
+runs in a thread pool, so one server can handle the whole API.
+
+With `DATABASE_REPLICA_URL` set, the feed, stream and kindness reads use a
+second async engine on the replica, honouring the same read-your-writes
+cookie as `app/replicas.py`; a successful redeem sets that cookie.
+JSON responses are compressed with the Flask app's `app/compression.py`
+settings and cache.
+"""
+
+import asyncio
+import io
+import json
+import logging
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.cookies import CookieError, SimpleCookie
+from urllib.parse import parse_qs
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+
+from app import metrics, post_service, schemas
+from app.compression import get_compressor
+from app.models import KindnessVote, Post
+from app.replicas import RYW_COOKIE, wrote_recently
+from app.settings import get_settings
+from app.utils import (
+    generate_kindness_token,
+    hash_token_for_storage,
+    verify_kindness_token,
+)
+
+logger = logging.getLogger(__name__)
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# Posts sent per SSE poll, and idle seconds between keep-alive comments
+SSE_BATCH = 100
+SSE_HEARTBEAT = 15.0
+
+INTERNAL_ERROR = "Sorry, something went wrong. Please try again later."
+
+_FEED_COLUMNS = (
+    Post.id,
+    Post.username,
+    Post.message,
+    Post.timestamp,
+    Post.kindness_points,
+)
+
+
+def async_database_url(url):
+    """Map a sync database URL onto its asyncio driver."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    if url.get_driver_name() in ("asyncpg", "aiosqlite"):
+        return url
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+class _Request:
+    def __init__(self, scope, receive):
+        self.scope = scope
+        self.receive = receive
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.args = {
+            k: v[0]
+            for k, v in parse_qs(
+                scope.get("query_string", b"").decode("latin-1"),
+                keep_blank_values=True,
+            ).items()
+        }
+        self.headers = {
+            k.decode("latin-1").lower(): v.decode("latin-1")
+            for k, v in scope.get("headers", [])
+        }
+        self._body = None
+
+    @property
+    def mimetype(self):
+        return self.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    async def body(self):
+        if self._body is None:
+            self._body = await _read_body(self.receive)
+        return self._body
+
+    def cookie(self, name):
+        try:
+            morsel = SimpleCookie(self.headers.get("cookie", "")).get(name)
+        except CookieError:
+            return None
+        return morsel.value if morsel else None
+
+    async def params(self, *names):
+        """Same lookup as `routes._kindness_params`: body first, then query."""
+        raw = await self.body()
+        data = None
+        if raw:
+            if self.mimetype != "application/x-www-form-urlencoded":
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    pass
+            if not isinstance(data, dict):
+                data = {
+                    k: v[0] for k, v in parse_qs(raw.decode("utf-8", "replace")).items()
+                }
+        data = data or {}
+        params = {}
+        for name in names:
+            value = data.get(name)
+            if value is None:
+                value = self.args.get(name)
+            if value is not None:
+                params[name] = value
+        return params
+
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+async def _close_body(send):
+    """End a response whose start was already sent."""
+    try:
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+    except Exception:
+        pass  # the client is already gone
+
+
+async def _send_json(send, status, payload, headers=(), encode=None, backend="auto"):
+    body = schemas.encode(payload, backend)
+    headers = list(headers)
+    if encode is not None and 200 <= status < 300:
+        body, extra = encode(body)
+        headers.extend(extra)
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                *headers,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class AsyncJeetApp:
+    """ASGI application: async fast paths in front of the Flask app."""
+
+    def __init__(self, flask_app, engine, max_threads=None, read_engine=None):
+        self.flask_app = flask_app
+        self.engine = engine
+        self.read_engine = read_engine
+        self.executor = ThreadPoolExecutor(max_threads, thread_name_prefix="wsgi")
+        # (method, path pattern, handler, route label as in the Flask URL map)
+        self.routes = [
+            ("GET", re.compile(r"^/api/posts$"), self.feed, "/api/posts"),
+            (
+                "GET",
+                re.compile(r"^/api/posts/stream$"),
+                self.stream,
+                "/api/posts/stream",
+            ),
+            (
+                "GET",
+                re.compile(r"^/api/posts/(?P<post_id>\d+)/kindness$"),
+                self.kindness,
+                "/api/posts/<int:post_id>/kindness",
+            ),
+            (
+                "POST",
+                re.compile(r"^/api/kindness/token$"),
+                self.issue_token,
+                "/api/kindness/token",
+            ),
+            (
+                "POST",
+                re.compile(r"^/api/kindness/tokens$"),
+                self.issue_tokens,
+                "/api/kindness/tokens",
+            ),
+            (
+                "POST",
+                re.compile(r"^/api/kindness/redeem$"),
+                self.redeem,
+                "/api/kindness/redeem",
+            ),
+        ]
+
+    @property
+    def settings(self):
+        # Read per request so /_admin/config/reload applies here too
+        return get_settings(self.flask_app)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        for method, pattern, handler, route in self.routes:
+            match = pattern.match(scope["path"])
+            if match and scope["method"] == method:
+                request = _Request(scope, receive)
+                stats = metrics.start_request(route)
+                started = False
+
+                async def tracked_send(message):
+                    nonlocal started
+                    if message["type"] == "http.response.start":
+                        started = True
+                    await send(message)
+
+                try:
+                    result = await handler(request, tracked_send, **match.groupdict())
+                except Exception:
+                    logger.exception(f"Unhandled exception in {scope['path']}")
+                    result = 500, {"error": INTERNAL_ERROR}
+                    if started:
+                        # Too late for a 500 (e.g. a database error mid-stream);
+                        # end the body so the client sees the stream close
+                        result = None
+                        await _close_body(send)
+                if result is not None:
+                    await _send_json(
+                        send,
+                        *result,
+                        encode=self._encoder(request),
+                        backend=self.flask_app.json.backend,
+                    )
+                metrics.finish_request(
+                    stats, method, 200 if result is None else result[0]
+                )
+                return
+        await self._wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.engine.dispose()
+                if self.read_engine is not None:
+                    await self.read_engine.dispose()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _encoder(self, request):
+        """Compress JSON bodies like `app/compression.py` does for Flask."""
+        compressor = get_compressor(self.flask_app)
+        if compressor is None:
+            return None
+
+        def encode(body):
+            settings = self.settings
+            compressed, encoding = compressor.encode(
+                settings,
+                body,
+                "application/json",
+                request.headers.get("accept-encoding"),
+            )
+            headers = []
+            if settings.compress_responses and len(body) >= settings.compress_min_size:
+                headers.append((b"vary", b"Accept-Encoding"))
+            if encoding is not None:
+                headers.append((b"content-encoding", encoding.encode("latin-1")))
+            return compressed, headers
+
+        return encode
+
+    def _reader(self, request):
+        """Replica engine for reads, unless this client just wrote."""
+        if self.read_engine is None or wrote_recently(request.cookie(RYW_COOKIE)):
+            return self.engine
+        return self.read_engine
+
+    # Async endpoints
+
+    async def feed(self, request, send):
+        args = request.args
+        has_paging = "page" in args or "limit" in args or "since" in args
+        try:
+            page = int(args.get("page", 1))
+        except ValueError:
+            return 400, {"error": "Invalid page or limit"}
+        limit, error = post_service.parse_feed_limit(args.get("limit"))
+        if error:
+            return 400, {"error": error}
+        cursor = args.get("cursor")
+        position = None
+        if cursor:
+            position = post_service.decode_cursor(cursor)
+            if position is None:
+                return 400, {"error": "Invalid cursor"}
+        next_cursor = None
+        stmt = select(*_FEED_COLUMNS)
+        since = args.get("since")
+        if since:
+            try:
+                try:
+                    since_dt = datetime.fromisoformat(since)
+                except ValueError:
+                    since_dt = datetime.utcfromtimestamp(float(since))
+                stmt = stmt.where(Post.timestamp >= since_dt)
+            except Exception:
+                pass
+        async with self._reader(request).connect() as conn:
+            if args.get("view", "latest") == "top":
+                # Like the Flask view (`post_service.top_posts`), the top
+                # view has its own 24h window and ignores `since`
+                cutoff = datetime.utcnow() - timedelta(hours=24)
+                stmt = (
+                    select(*_FEED_COLUMNS)
+                    .where(Post.timestamp >= cutoff)
+                    .order_by(Post.kindness_points.desc(), Post.timestamp.desc())
+                )
+                posts = (await conn.execute(stmt.limit(limit))).all()
+                total_count = len(posts)
+            elif cursor is not None:
+                if position is not None:
+                    stmt = stmt.where(post_service.after_cursor(position))
+                stmt = stmt.order_by(*post_service.FEED_ORDER).limit(limit + 1)
+                posts = (await conn.execute(stmt)).all()
+                if len(posts) > limit:
+                    posts = posts[:limit]
+                    next_cursor = post_service.encode_cursor(posts[-1])
+                total_count = None
+            else:
+                count_stmt = select(func.count()).select_from(stmt.subquery())
+                total_count = (await conn.execute(count_stmt)).scalar_one()
+                stmt = (
+                    stmt.order_by(Post.timestamp.desc())
+                    .offset((page - 1) * limit)
+                    .limit(limit)
+                )
+                posts = (await conn.execute(stmt)).all()
+        now = datetime.utcnow()
+        viewer_tz = args.get("tz")
+        compact = args.get("compact") == "1"
+        items = [post_service.feed_item(p, now, viewer_tz, compact) for p in posts]
+        if cursor is not None and args.get("view", "latest") != "top":
+            return 200, schemas.CursorPage(
+                posts=items,
+                limit=limit,
+                has_more=next_cursor is not None,
+                next_cursor=next_cursor,
+            )
+        if not has_paging:
+            return 200, items
+        return 200, schemas.PostPage(
+            posts=items,
+            total_count=total_count,
+            page=page,
+            limit=limit,
+            has_more=(page * limit) < total_count,
+        )
+
+    async def stream(self, request, send):
+        """Server-Sent Events feed of posts created after the cursor."""
+        cursor = request.headers.get("last-event-id") or request.args.get("after_id")
+        try:
+            last_id = int(cursor) if cursor else None
+        except ValueError:
+            return 400, {"error": "Invalid after_id"}
+        reader = self._reader(request)
+        if last_id is None:
+            async with reader.connect() as conn:
+                last_id = (await conn.execute(select(func.max(Post.id)))).scalar() or 0
+
+        disconnected = asyncio.Event()
+
+        async def watch():
+            while (await request.receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        watcher = asyncio.create_task(watch())
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            }
+        )
+        loop = asyncio.get_running_loop()
+        last_sent = loop.time()
+        backend = self.flask_app.json.backend
+        try:
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": b"retry: 5000\n\n",
+                    "more_body": True,
+                }
+            )
+            while not disconnected.is_set():
+                stmt = (
+                    select(*_FEED_COLUMNS)
+                    .where(Post.id > last_id)
+                    .order_by(Post.id)
+                    .limit(SSE_BATCH)
+                )
+                async with reader.connect() as conn:
+                    rows = (await conn.execute(stmt)).all()
+                now = datetime.utcnow()
+                chunks = []
+                for row in rows:
+                    last_id = row.id
+                    data = schemas.encode(post_service.feed_item(row, now), backend)
+                    chunks.append(f"id: {row.id}\nevent: post\ndata: ".encode())
+                    chunks.append(data + b"\n\n")
+                if not chunks and loop.time() - last_sent >= SSE_HEARTBEAT:
+                    chunks.append(b": keep-alive\n\n")
+                if chunks:
+                    body = b"".join(chunks)
+                    await send(
+                        {"type": "http.response.body", "body": body, "more_body": True}
+                    )
+                    last_sent = loop.time()
+                if len(rows) == SSE_BATCH:
+                    continue
+                try:
+                    await asyncio.wait_for(
+                        disconnected.wait(), self.settings.sse_poll_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        except OSError:
+            # Client went away mid-write
+            pass
+        finally:
+            watcher.cancel()
+        if not disconnected.is_set():
+            await send({"type": "http.response.body", "body": b""})
+        return None
+
+    async def kindness(self, request, send, post_id):
+        async with self._reader(request).connect() as conn:
+            points = (
+                await conn.execute(
+                    select(Post.kindness_points).where(Post.id == int(post_id))
+                )
+            ).first()
+        if points is None:
+            return 404, {"error": "Post not found"}
+        return 200, schemas.KindnessCount(kindness_points=points[0])
+
+    async def _existing(self, post_ids):
+        async with self.engine.connect() as conn:
+            rows = await conn.execute(select(Post.id).where(Post.id.in_(post_ids)))
+            return {row[0] for row in rows}
+
+    async def issue_token(self, request, send):
+        if not self.settings.enable_kindness_points:
+            return 404, {"error": "Feature disabled"}
+        params = await request.params("post_id")
+        if "post_id" not in params:
+            return 400, {"error": "Missing post_id"}
+        try:
+            post_id = int(params["post_id"])
+        except (TypeError, ValueError):
+            return 404, {"error": "Post not found"}
+        if not await self._existing([post_id]):
+            return 404, {"error": "Post not found"}
+        token = generate_kindness_token(post_id)
+        return 200, schemas.KindnessToken(token=token, expires_in=300)
+
+    async def issue_tokens(self, request, send):
+        if not self.settings.enable_kindness_points:
+            return 404, {"error": "Feature disabled"}
+        try:
+            data = json.loads(await request.body() or b"{}")
+        except ValueError:
+            data = {}
+        raw_ids = data.get("post_ids") if isinstance(data, dict) else None
+        if raw_ids is None and request.args.get("post_ids"):
+            raw_ids = [s for s in request.args["post_ids"].split(",") if s.strip()]
+        post_ids, error = post_service.parse_post_ids(raw_ids)
+        if error:
+            return 400, {"error": error}
+        existing = await self._existing(post_ids)
+        tokens = {
+            str(pid): generate_kindness_token(pid)
+            for pid in post_ids
+            if pid in existing
+        }
+        missing = [pid for pid in post_ids if pid not in existing]
+        return 200, schemas.KindnessTokens(
+            tokens=tokens, missing=missing, expires_in=300
+        )
+
+    async def redeem(self, request, send):
+        if not self.settings.enable_kindness_points:
+            return 404, {"error": "Feature disabled"}
+        params = await request.params("post_id", "token")
+        if "post_id" not in params or "token" not in params:
+            return 400, {"error": "Missing post_id or token"}
+        token_string = params["token"]
+        if not verify_kindness_token(token_string):
+            return 400, {"error": "Invalid or expired token"}
+        try:
+            post_id = int(params["post_id"])
+        except (TypeError, ValueError):
+            return 400, {"error": "Invalid post_id"}
+        try:
+            async with self.engine.begin() as conn:
+                if not (
+                    await conn.execute(select(Post.id).where(Post.id == post_id))
+                ).first():
+                    return 404, {"error": "Post not found"}
+                await conn.execute(
+                    insert(KindnessVote).values(
+                        post_id=post_id,
+                        token_hash=hash_token_for_storage(token_string),
+                    )
+                )
+                # Atomic increment instead of read-modify-write
+                new_points = (
+                    await conn.execute(
+                        update(Post)
+                        .where(Post.id == post_id)
+                        .values(kindness_points=Post.kindness_points + 1)
+                        .returning(Post.kindness_points)
+                    )
+                ).scalar_one()
+        except IntegrityError:
+            return 409, {"error": "Token already used"}
+        headers = ()
+        if self.read_engine is not None:
+            window = self.settings.read_your_writes_seconds
+            cookie = (
+                f"{RYW_COOKIE}={int(time.time() + window)}; Max-Age={window}; "
+                "Path=/; HttpOnly; SameSite=Lax"
+            )
+            headers = ((b"set-cookie", cookie.encode("latin-1")),)
+        return (
+            200,
+            schemas.KindnessResult(success=True, new_points=new_points),
+            headers,
+        )
+
+    # WSGI fallback
+
+    async def _wsgi(self, scope, receive, send):
+        environ = _wsgi_environ(scope, await _read_body(receive))
+        loop = asyncio.get_running_loop()
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started["status"] = int(status.split(" ", 1)[0])
+            started["headers"] = [
+                (k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers
+            ]
+
+        def first_chunk():
+            result = self.flask_app.wsgi_app(environ, start_response)
+            iterator = iter(result)
+            return result, iterator, next(iterator, None)
+
+        result, iterator, chunk = await loop.run_in_executor(self.executor, first_chunk)
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": started["status"],
+                    "headers": started["headers"],
+                }
+            )
+            # Stream the rest (e.g. NDJSON export) without buffering it all
+            while chunk is not None:
+                if chunk:
+                    await send(
+                        {"type": "http.response.body", "body": chunk, "more_body": True}
+                    )
+                chunk = await loop.run_in_executor(self.executor, next, iterator, None)
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            if hasattr(result, "close"):
+                await loop.run_in_executor(self.executor, result.close)
+
+
+def _wsgi_environ(scope, body):
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+        "CONTENT_LENGTH": str(len(body)),
+    }
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+            continue
+        if name == "CONTENT_LENGTH":
+            continue
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def create_asgi_app(config_override=None, max_threads=None):
+    """Build the Flask app plus its async engine and wrap both for ASGI."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app import create_app
+    from app.db_pool import engine_options
+
+    flask_app = create_app(config_override)
+    settings = get_settings(flask_app)
+    url = async_database_url(flask_app.config["SQLALCHEMY_DATABASE_URI"])
+    engine = create_async_engine(url, **engine_options(settings, url, is_async=True))
+    read_engine = None
+    if settings.database_replica_url:
+        replica_url = async_database_url(settings.database_replica_url)
+        read_engine = create_async_engine(
+            replica_url, **engine_options(settings, replica_url, is_async=True)
+        )
+    return AsyncJeetApp(
+        flask_app, engine, max_threads=max_threads, read_engine=read_engine
+    )
@@ -0,0 +1,586 @@
+"""
+app/assets.py
+
+Static asset build and serving.
+
+`build()` turns `app/static/` into a production tree under `app/static/dist/`:
+
+- JavaScript is minified (comments and indentation removed) and, in
+  production builds, every ``console.debug(...)`` call is replaced with
+  ``void 0``; CSS and inline ``<style>`` blocks are minified
+- every file except HTML pages gets a content hash in its name
+  (``main.3f2a91c0d7.js``) and references to it in HTML, CSS and JS
+  (``/static/...`` URLs and ``./relative.js`` module imports) are rewritten
+- the CDN emoji picker is swapped for the vendored copy in
+  ``static/vendor/`` when present (`jeet assets vendor` downloads it)
+- compressible files get ``.gz`` and, with the optional ``brotli`` package,
+  ``.br`` siblings
+- ``manifest.json`` maps source paths to hashed names
+
+With `STATIC_DIST=1`, `send_asset` serves from that tree: hashed files with
+``Cache-Control: immutable`` for a year, HTML pages with ``no-cache``, and
+the precompressed variant the client accepts.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import urllib.request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip-only precompression
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST = "manifest.json"
+EXTENSION_KEY = "jeet.assets"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+COMPRESSIBLE = {".js", ".css", ".html", ".svg", ".json", ".txt", ".map"}
+MIN_COMPRESS_BYTES = 256
+# Source files that are not shipped (browser-side test helpers, build output)
+_SKIP = re.compile(r"(^|/)(dist/|test_[^/]*$|\.)")
+
+EMOJI_PICKER_CDN = re.compile(
+    r"https://cdn\.jsdelivr\.net/npm/emoji-picker-element@[^/\"']+/index\.js"
+)
+EMOJI_PICKER_FILES = ("index.js", "picker.js", "database.js")
+EMOJI_PICKER_JS = "vendor/emoji-picker-element/index.js"
+EMOJI_DATA = "vendor/emoji-picker-element-data/en/emojibase/data.json"
+
+
+# JavaScript
+
+_JS_KEYWORDS_BEFORE_REGEX = {
+    "return",
+    "typeof",
+    "instanceof",
+    "in",
+    "of",
+    "new",
+    "delete",
+    "void",
+    "throw",
+    "case",
+    "do",
+    "else",
+    "yield",
+    "await",
+}
+_IDENT = re.compile(r"[A-Za-z0-9_$]")
+_JS_TIGHT = set("{}()[];,:=<>!?&|*%^~")
+
+
+def _scan_string(src, i):
+    quote = src[i]
+    i += 1
+    while i < len(src) and src[i] != quote:
+        i += 2 if src[i] == "\\" else 1
+    return i + 1
+
+
+def _scan_template(src, i):
+    i += 1
+    while i < len(src) and src[i] != "`":
+        if src[i] == "\\":
+            i += 2
+        elif src.startswith("${", i):
+            i = _scan_code_block(src, i + 2)
+        else:
+            i += 1
+    return i + 1
+
+
+def _scan_code_block(src, i):
+    """Skip a ``${...}`` expression; returns the index after its ``}``."""
+    depth = 1
+    while i < len(src):
+        c = src[i]
+        if c in "'\"":
+            i = _scan_string(src, i)
+        elif c == "`":
+            i = _scan_template(src, i)
+        elif c == "{":
+            depth += 1
+            i += 1
+        elif c == "}":
+            depth -= 1
+            i += 1
+            if not depth:
+                return i
+        else:
+            i += 1
+    return i
+
+
+def _scan_regex(src, i):
+    i += 1
+    in_class = False
+    while i < len(src):
+        c = src[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            i += 1
+            while i < len(src) and _IDENT.match(src[i]):
+                i += 1
+            return i
+        elif c == "\n":
+            break
+        i += 1
+    return i
+
+
+def _regex_allowed(tokens):
+    """Whether a ``/`` after `tokens` starts a regex literal (not division)."""
+    for kind, text in reversed(tokens):
+        if kind in ("ws", "nl", "comment"):
+            continue
+        if kind != "code":
+            return False
+        last = text.rstrip()[-1:]
+        if last in (")", "]"):
+            return False
+        if _IDENT.match(last or " "):
+            word = re.search(r"[A-Za-z0-9_$]+$", text).group(0)
+            return word in _JS_KEYWORDS_BEFORE_REGEX
+        return True
+    return True
+
+
+def js_tokens(src):
+    """Split JavaScript into ``(kind, text)`` tokens.
+
+    Kinds: ``code``, ``str`` (quotes and template literals), ``regex``,
+    ``comment``, ``ws`` and ``nl`` (whitespace containing a newline).
+    """
+    tokens = []
+    code_start = None
+    i = 0
+    n = len(src)
+
+    def flush(end):
+        nonlocal code_start
+        if code_start is not None:
+            tokens.append(("code", src[code_start:end]))
+            code_start = None
+
+    while i < n:
+        c = src[i]
+        if c in " \t\r\n":
+            flush(i)
+            j = i
+            while j < n and src[j] in " \t\r\n":
+                j += 1
+            tokens.append(("nl" if "\n" in src[i:j] else "ws", src[i:j]))
+            i = j
+        elif src.startswith("//", i):
+            flush(i)
+            j = src.find("\n", i)
+            j = n if j < 0 else j
+            tokens.append(("comment", src[i:j]))
+            i = j
+        elif src.startswith("/*", i):
+            flush(i)
+            j = src.find("*/", i + 2)
+            j = n if j < 0 else j + 2
+            tokens.append(("comment", src[i:j]))
+            i = j
+        elif c in "'\"`":
+            flush(i)
+            j = _scan_template(src, i) if c == "`" else _scan_string(src, i)
+            tokens.append(("str", src[i:j]))
+            i = j
+        elif c == "/":
+            flush(i)
+            if _regex_allowed(tokens):
+                j = _scan_regex(src, i)
+                tokens.append(("regex", src[i:j]))
+                i = j
+            else:
+                tokens.append(("code", "/"))
+                i += 1
+        else:
+            if code_start is None:
+                code_start = i
+            i += 1
+    flush(n)
+    return tokens
+
+
+_DEBUG_CALL = re.compile(r"(?<![A-Za-z0-9_$.])console\s*\.\s*debug\s*\(")
+
+
+def _closing_paren(tokens, i, start):
+    """``(token index, offset)`` of the ``)`` closing a call opened before
+    `start` in ``tokens[i]``, or None when the source is truncated."""
+    depth = 1
+    for j in range(i, len(tokens)):
+        kind, text = tokens[j]
+        if kind != "code":
+            continue
+        for pos in range(start if j == i else 0, len(text)):
+            depth += {"(": 1, ")": -1}.get(text[pos], 0)
+            if not depth:
+                return j, pos
+    return None
+
+
+def strip_debug_calls(tokens):
+    """Replace every ``console.debug(...)`` call with ``void 0``."""
+    tokens = list(tokens)
+    out = []
+    i = 0
+    while i < len(tokens):
+        kind, text = tokens[i]
+        match = kind == "code" and _DEBUG_CALL.search(text)
+        end = match and _closing_paren(tokens, i, match.end())
+        if not end:
+            # No call here, or unbalanced (truncated source): leave it alone
+            out.append(tokens[i])
+            i += 1
+            continue
+        j, pos = end
+        head, rest = text[: match.start()], tokens[j][1][pos + 1 :]  # noqa: E203
+        # Re-scan the joined token: `rest` may hold another call
+        tokens[j] = ("code", head + "void 0" + rest)
+        i = j
+    return out
+
+
+def minify_js(src, strip_debug=True):
+    """Conservative minifier: keeps line breaks (ASI), drops the rest."""
+    tokens = js_tokens(src)
+    if strip_debug:
+        tokens = strip_debug_calls(tokens)
+    parts = []
+    pending = None  # whitespace waiting to see the next token
+    for kind, text in tokens:
+        if kind == "comment":
+            if "\n" in text or text.startswith("//"):
+                pending = "\n" if pending == "\n" or "\n" in text else pending
+            pending = pending or " "
+            continue
+        if kind in ("ws", "nl"):
+            pending = "\n" if kind == "nl" or pending == "\n" else " "
+            continue
+        if kind == "code":
+            text = re.sub(r"[ \t]+", " ", text)
+        if pending and parts:
+            prev = parts[-1][-1]
+            nxt = text[0]
+            if pending == "\n":
+                parts.append("\n")
+            elif not (prev in _JS_TIGHT or nxt in _JS_TIGHT):
+                parts.append(" ")
+        pending = None
+        parts.append(text)
+    out = "".join(parts)
+    return re.sub(r"\n+", "\n", out).strip() + "\n"
+
+
+# CSS / HTML
+
+
+def minify_css(src):
+    out = []
+    i = 0
+    while i < len(src):
+        c = src[i]
+        if src.startswith("/*", i):
+            end = src.find("*/", i + 2)
+            i = len(src) if end < 0 else end + 2
+            out.append(" ")
+        elif c in "'\"":
+            j = _scan_string(src, i)
+            out.append(src[i:j])
+            i = j
+        else:
+            out.append(c)
+            i += 1
+    css = re.sub(r"\s+", " ", "".join(out))
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+
+def minify_html(src):
+    """Drop comments and minify inline ``<style>`` blocks; text is untouched."""
+    src = re.sub(r"<!--(?!\[if).*?-->", "", src, flags=re.S)
+    return re.sub(
+        r"(<style[^>]*>)(.*?)(</style>)",
+        lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3),
+        src,
+        flags=re.S | re.I,
+    )
+
+
+# Build
+
+_STATIC_REF = re.compile(r"/static/([A-Za-z0-9_./-]+)")
+_RELATIVE_IMPORT = re.compile(r"""(['"])\./([A-Za-z0-9_.-]+\.js)\1""")
+
+
+def _references(rel, text, sources):
+    """Source paths referenced by `text` (from file `rel`)."""
+    refs = {m.group(1) for m in _STATIC_REF.finditer(text)}
+    base = os.path.dirname(rel)
+    refs.update(
+        os.path.join(base, m.group(2)) if base else m.group(2)
+        for m in _RELATIVE_IMPORT.finditer(text)
+    )
+    return {r for r in refs if r in sources and r != rel}
+
+
+def _rewrite(rel, text, manifest):
+    def static_ref(m):
+        return "/static/" + manifest.get(m.group(1), m.group(1))
+
+    base = os.path.dirname(rel)
+
+    def relative_import(m):
+        target = os.path.join(base, m.group(2)) if base else m.group(2)
+        if target not in manifest:
+            return m.group(0)
+        return f"{m.group(1)}./{os.path.basename(manifest[target])}{m.group(1)}"
+
+    text = _STATIC_REF.sub(static_ref, text)
+    return _RELATIVE_IMPORT.sub(relative_import, text)
+
+
+def _hashed_name(rel, data):
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    stem, ext = os.path.splitext(rel)
+    return f"{stem}.{digest}{ext}"
+
+
+def _precompress(path, data):
+    encodings = []
+    if os.path.splitext(path)[1] not in COMPRESSIBLE or len(data) < MIN_COMPRESS_BYTES:
+        return encodings
+    if brotli is not None:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+        encodings.append("br")
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, 9, mtime=0))
+    encodings.append("gzip")
+    return encodings
+
+
+def build(src=STATIC_DIR, out=DIST_DIR, minify=True, strip_debug=True):
+    """Build `src` into `out` (replacing it); returns the manifest dict."""
+    sources = {}
+    for root, dirs, files in os.walk(src):
+        for name in files:
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, src).replace(os.sep, "/")
+            if os.path.abspath(path).startswith(os.path.abspath(out) + os.sep):
+                continue
+            if not _SKIP.search(rel):
+                sources[rel] = path
+
+    vendored = EMOJI_PICKER_JS in sources
+    texts = {}
+    for rel, path in sources.items():
+        if os.path.splitext(rel)[1] in (".js", ".css", ".html", ".svg", ".json"):
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            if rel.endswith(".html") and vendored:
+                text = EMOJI_PICKER_CDN.sub(f"/static/{EMOJI_PICKER_JS}", text)
+                if EMOJI_DATA in sources:
+                    text = text.replace(
+                        "<emoji-picker ",
+                        f'<emoji-picker data-source="/static/{EMOJI_DATA}" ',
+                        1,
+                    )
+            texts[rel] = text
+
+    if os.path.isdir(out):
+        shutil.rmtree(out)
+    os.makedirs(out)
+    manifest = {}
+    encodings = {}
+    pending = dict.fromkeys(sorted(sources))
+    # Files are emitted once everything they reference has a hashed name
+    while pending:
+        ready = [
+            rel
+            for rel in pending
+            if rel not in texts
+            or not (_references(rel, texts[rel], sources) - set(manifest))
+        ]
+        if not ready:
+            ready = list(pending)  # reference cycle: emit with partial rewrites
+        for rel in ready:
+            del pending[rel]
+            ext = os.path.splitext(rel)[1]
+            if rel in texts:
+                text = _rewrite(rel, texts[rel], manifest)
+                if minify and ext == ".js":
+                    is_vendor = rel.startswith("vendor/")
+                    text = minify_js(text, strip_debug=strip_debug and not is_vendor)
+                elif minify and ext == ".css":
+                    text = minify_css(text)
+                elif minify and ext == ".html":
+                    text = minify_html(text)
+                data = text.encode("utf-8")
+            else:
+                with open(sources[rel], "rb") as f:
+                    data = f.read()
+            # HTML pages are entry points with stable URLs
+            name = rel if ext == ".html" else _hashed_name(rel, data)
+            manifest[rel] = name
+            target = os.path.join(out, name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as f:
+                f.write(data)
+            encodings[name] = _precompress(target, data)
+
+    with open(os.path.join(out, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "assets": manifest,
+                "encodings": {k: v for k, v in encodings.items() if v},
+            },
+            f,
+            indent=2,
+            sort_keys=True,
+        )
+    return manifest
+
+
+def vendor_emoji_picker(version="1", dest=STATIC_DIR, timeout=30):
+    """Download emoji-picker-element and its English data into static/vendor."""
+    files = [
+        (
+            f"https://cdn.jsdelivr.net/npm/emoji-picker-element@{version}/{name}",
+            os.path.join(dest, os.path.dirname(EMOJI_PICKER_JS), name),
+        )
+        for name in EMOJI_PICKER_FILES
+    ]
+    files.append(
+        (
+            f"https://cdn.jsdelivr.net/npm/emoji-picker-element-data@{version}"
+            "/en/emojibase/data.json",
+            os.path.join(dest, EMOJI_DATA),
+        )
+    )
+    for url, path in files:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            data = resp.read()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    return [path for _, path in files]
+
+
+# Serving
+
+
+class AssetDist:
+    """A built asset tree: its manifest and precompressed variants."""
+
+    def __init__(self, root):
+        self.root = root
+        with open(os.path.join(root, MANIFEST), encoding="utf-8") as f:
+            data = json.load(f)
+        self.assets = data["assets"]
+        self.hashed = {v for k, v in self.assets.items() if not k.endswith(".html")}
+        self.encodings = data.get("encodings", {})
+
+
+def init_assets(app, settings):
+    """Load the built tree when `STATIC_DIST` is on (missing build: raw files)."""
+    dist = None
+    if settings.static_dist:
+        root = settings.static_dist_dir or DIST_DIR
+        try:
+            dist = AssetDist(root)
+        except (OSError, ValueError, KeyError) as exc:
+            app.logger.warning(
+                f"STATIC_DIST is on but {root} has no usable build ({exc}); "
+                "serving app/static as-is. Run `jeet assets build`."
+            )
+    app.extensions[EXTENSION_KEY] = dist
+    # Flask's own /static rule matches before the blueprint's; route it here too
+    app.view_functions["static"] = _static_view
+    return dist
+
+
+def _static_view(filename):
+    return send_asset(filename)
+
+
+def send_asset(path):
+    """Serve `path` from the built tree if there is one, else from app/static."""
+    from flask import current_app, request, send_from_directory
+    from werkzeug.exceptions import NotFound
+
+    from app.settings import get_settings
+
+    accel = get_settings().static_serve == "x-accel"
+    dist = current_app.extensions.get(EXTENSION_KEY)
+    if dist is None or path not in dist.hashed and path not in dist.assets:
+        if accel and dist is None:
+            response = _accel_redirect(current_app.static_folder, path)
+            if response is not None:
+                return response
+        return current_app.send_static_file(path)
+    path = dist.assets.get(path, path) if path.endswith(".html") else path
+    if accel:
+        # nginx picks the .gz sibling itself (gzip_static on)
+        response = _accel_redirect(dist.root, path)
+        if response is None:
+            return current_app.send_static_file(path)
+    else:
+        filename, encoding = path, None
+        for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if (
+                candidate in dist.encodings.get(path, ())
+                and request.accept_encodings[candidate] > 0
+            ):
+                filename, encoding = path + suffix, candidate
+                break
+        try:
+            response = send_from_directory(
+                dist.root, filename, mimetype=mimetypes.guess_type(path)[0]
+            )
+        except NotFound:
+            return current_app.send_static_file(path)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        if dist.encodings.get(path):
+            response.vary.add("Accept-Encoding")
+    if path in dist.hashed:
+        response.headers["Cache-Control"] = IMMUTABLE
+    else:
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _accel_redirect(root, path):
+    """Empty response handing `root/path` to nginx; None if there is no file."""
+    from flask import current_app
+    from werkzeug.security import safe_join
+
+    from app.settings import get_settings
+
+    full = safe_join(root, path)
+    if full is None or not os.path.isfile(full):
+        return None
+    response = current_app.response_class(mimetype=mimetypes.guess_type(path)[0])
+    prefix = get_settings().static_accel_prefix.rstrip("/")
+    response.headers["X-Accel-Redirect"] = f"{prefix}/{path}"
+    return response
@@ -0,0 +1,33 @@
+"""
+app/checkpoints.py
+
+Tiny JSON checkpoint files shared by the importer and maintenance tasks.
+Writes go to a temporary file that is atomically renamed over the old
+checkpoint, so a crash never leaves a half-written file behind.
+"""
+
+import json
+import os
+
+
+def read_checkpoint(path):
+    """Return the checkpoint dict stored at `path`, or None if absent."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_checkpoint(path, state):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def clear_checkpoint(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,263 @@
+"""
+app/cli.py
+
+`jeet` command-line entry point for operational tasks.
+
+Usage:
+    jeet import posts.ndjson [--batch-size 1000] [--no-resume] [--dry-run]
+    python -m app.cli import posts.csv --format csv
+    jeet export --since 2025-01-01T00:00:00Z -o posts.ndjson
+    jeet maintain truncate-long-posts --dry-run
+    jeet jobs run prune-kindness-votes [--force]
+    jeet assets build [--out app/static/dist] [--keep-debug] [--no-minify]
+    jeet assets vendor
+    jeet profiles [--dir /tmp/jeet-profiles] [--route /api/posts] [--out profiles/]
+
+Commands run against the database configured by `DATABASE_URL`.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+
+def _app():
+    from app import create_app
+
+    return create_app()
+
+
+def cmd_import(args):
+    from app import db
+    from app.importer import import_posts
+
+    app = _app()
+    rejects = open(args.rejects, "a", encoding="utf-8") if args.rejects else None
+    try:
+        with app.app_context():
+            stats = import_posts(
+                db.engine,
+                args.source,
+                fmt=args.format,
+                batch_size=args.batch_size,
+                checkpoint=args.checkpoint,
+                resume=not args.no_resume,
+                dry_run=args.dry_run,
+                rejects=rejects,
+                out=None if args.quiet else sys.stderr,
+            )
+    finally:
+        if rejects is not None:
+            rejects.close()
+    print(json.dumps(stats))
+    return 0
+
+
+def cmd_export(args):
+    from app import db
+    from app.exporter import iter_ndjson, parse_bound
+
+    try:
+        since, until = parse_bound(args.since), parse_bound(args.until)
+    except (TypeError, ValueError, OverflowError, OSError):
+        print("Invalid --since or --until (ISO 8601 or epoch seconds)", file=sys.stderr)
+        return 2
+    app = _app()
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    count = 0
+    try:
+        with app.app_context():
+            for line in iter_ndjson(
+                db.engine,
+                since=since,
+                until=until,
+                after_id=args.after_id,
+                chunk_size=args.chunk_size,
+            ):
+                out.write(line)
+                count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Exported {count} posts", file=sys.stderr)
+    return 0
+
+
+def cmd_maintain(args):
+    from app import db
+    from app.maintenance import TASKS, run_task
+
+    if args.list:
+        for name, task in TASKS.items():
+            print(f"{name:<24}{task.description}")
+        return 0
+    if args.task not in TASKS:
+        print(f"Unknown task {args.task!r}; use --list", file=sys.stderr)
+        return 2
+    app = _app()
+    with app.app_context():
+        stats = run_task(
+            db.engine,
+            TASKS[args.task],
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+            checkpoint=args.checkpoint,
+            resume=not args.no_resume,
+            sleep=args.sleep,
+            out=None if args.quiet else sys.stderr,
+        )
+    print(json.dumps(stats))
+    return 0
+
+
+def cmd_jobs(args):
+    from sqlalchemy import select
+
+    from app import db
+    from app.jobs import get_job_runner, print_history
+    from app.models import JobRun
+
+    app = _app()
+    runner = get_job_runner(app)
+    if args.action == "list":
+        for name, job in runner.jobs.items():
+            every = f"every {job.interval:g}s" if job.interval else "manual"
+            print(f"{name:<24}{every:<16}{job.description}")
+        return 0
+    if args.action == "run":
+        if args.name not in runner.jobs:
+            print(f"Unknown job {args.name!r}; use `jeet jobs list`", file=sys.stderr)
+            return 2
+        status = runner.run(args.name, force=args.force)
+        print(json.dumps({"job": args.name, "status": status}))
+        return 0 if status != "error" else 1
+    with app.app_context():
+        stmt = select(JobRun).order_by(JobRun.started_at.desc()).limit(args.limit)
+        if args.name:
+            stmt = stmt.where(JobRun.job == args.name)
+        print_history(db.session.execute(stmt).scalars())
+    return 0
+
+
+def cmd_assets(args):
+    from app import assets
+
+    if args.action == "vendor":
+        for path in assets.vendor_emoji_picker(version=args.version):
+            print(path)
+        return 0
+    manifest = assets.build(
+        out=args.out or assets.DIST_DIR,
+        minify=not args.no_minify,
+        strip_debug=not args.keep_debug,
+    )
+    print(json.dumps({"assets": len(manifest), "out": args.out or assets.DIST_DIR}))
+    return 0
+
+
+def cmd_profiles(args):
+    from app import profiling
+    from app.settings import load_settings
+
+    directory = args.dir or load_settings().profile_dir
+    groups = profiling.aggregate(directory, route=args.route, min_ms=args.min_ms)
+    if not groups:
+        print(f"No profiles in {directory}", file=sys.stderr)
+        return 1
+    ordered = sorted(groups.items(), key=lambda item: -item[1]["samples"])
+    for (method, route), group in ordered:
+        print(
+            f"{method} {route}: {group['profiles']} profiles, "
+            f"p50 {group['p50_ms']:.1f}ms, p95 {group['p95_ms']:.1f}ms, "
+            f"max {group['max_ms']:.1f}ms, {group['samples']} samples"
+        )
+        samples = group["samples"] or 1
+        for frame, own, total in profiling.top_frames(group["counts"], args.top):
+            print(
+                f"  {own / samples:>6.1%} self {total / samples:>6.1%} total  {frame}"
+            )
+        if args.out:
+            os.makedirs(args.out, exist_ok=True)
+            slug = profiling.route_slug(method, route)
+            if args.format == "speedscope":
+                path = os.path.join(args.out, f"{slug}.speedscope.json")
+                doc = profiling.to_speedscope(f"{method} {route}", group["weights"])
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(doc, f)
+            else:
+                path = os.path.join(args.out, f"{slug}.folded")
+                with open(path, "w", encoding="utf-8") as f:
+                    for stack, count in group["counts"].most_common():
+                        f.write(f"{stack} {count}\n")
+            print(f"  -> {path}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="jeet", description="jeetSocial tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import", help="Bulk import posts from NDJSON or CSV")
+    p.add_argument("source", help="Path to a .ndjson/.jsonl or .csv file")
+    p.add_argument("--format", choices=["ndjson", "csv"], help="Override detection")
+    p.add_argument("--batch-size", type=int, default=1000)
+    p.add_argument("--checkpoint", help="Checkpoint file (default <source>.checkpoint)")
+    p.add_argument("--no-resume", action="store_true", help="Ignore any checkpoint")
+    p.add_argument("--dry-run", action="store_true", help="Validate only")
+    p.add_argument("--rejects", help="Append rejected records (NDJSON) to this file")
+    p.add_argument("--quiet", action="store_true", help="No progress output")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("export", help="Stream posts as NDJSON in id order")
+    p.add_argument("--since", help="ISO 8601 or epoch lower bound (inclusive)")
+    p.add_argument("--until", help="ISO 8601 or epoch upper bound (exclusive)")
+    p.add_argument("--after-id", type=int, default=0, help="Resume after this id")
+    p.add_argument("--chunk-size", type=int, default=None)
+    p.add_argument("--output", "-o", help="Write to this file instead of stdout")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("maintain", help="Run a chunked maintenance task")
+    p.add_argument("task", nargs="?", help="Task name (see --list)")
+    p.add_argument("--list", action="store_true", help="List available tasks")
+    p.add_argument("--dry-run", action="store_true", help="Only count matches")
+    p.add_argument("--batch-size", type=int, default=5000, help="Ids per range")
+    p.add_argument("--sleep", type=float, default=0.0, help="Pause between ranges")
+    p.add_argument("--checkpoint", help="Checkpoint file path")
+    p.add_argument("--no-resume", action="store_true", help="Ignore any checkpoint")
+    p.add_argument("--quiet", action="store_true", help="No progress output")
+    p.set_defaults(func=cmd_maintain)
+
+    p = sub.add_parser("jobs", help="List, run or inspect background jobs")
+    p.add_argument("action", choices=["list", "run", "history"])
+    p.add_argument("name", nargs="?", help="Job name (required for run)")
+    p.add_argument("--force", action="store_true", help="Run even if ran recently")
+    p.add_argument("--limit", type=int, default=20, help="History rows to show")
+    p.set_defaults(func=cmd_jobs)
+
+    p = sub.add_parser("assets", help="Build or vendor static assets")
+    p.add_argument("action", choices=["build", "vendor"])
+    p.add_argument("--out", help="Build directory (default app/static/dist)")
+    p.add_argument("--keep-debug", action="store_true", help="Keep console.debug")
+    p.add_argument("--no-minify", action="store_true", help="Hash/compress only")
+    p.add_argument("--version", default="1", help="emoji-picker-element version")
+    p.set_defaults(func=cmd_assets)
+
+    p = sub.add_parser("profiles", help="Aggregate request profiles per route")
+    p.add_argument("--dir", help="Profile directory (default PROFILE_DIR)")
+    p.add_argument("--route", help="Only this route, e.g. /api/posts")
+    p.add_argument("--min-ms", type=float, default=0.0, help="Skip faster requests")
+    p.add_argument("--top", type=int, default=10, help="Frames to list per route")
+    p.add_argument("--out", help="Write one merged profile per route here")
+    p.add_argument("--format", choices=["folded", "speedscope"], default="folded")
+    p.set_defaults(func=cmd_profiles)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+app/compression.py
+
+Response compression for API responses (Flask and the ASGI fast paths).
+
+Bodies of compressible types at least `COMPRESS_MIN_SIZE` bytes long are
+sent with brotli (when the optional ``brotli`` package is installed) or gzip
+at `COMPRESS_LEVEL`, whichever the client prefers. Static files are left to
+`app/assets.py`, which serves precompressed builds.
+
+A live-feed poll returns the same bytes to every client until a post or a
+kindness point changes, so compressed bodies are kept in a small LRU keyed by
+a digest of the uncompressed body: a hot response is compressed once and
+hashed (much cheaper than compressing) on every later request.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from werkzeug.http import parse_accept_header
+
+from app import metrics
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+EXTENSION_KEY = "jeet.compression"
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/csv",
+    "text/javascript",
+    "application/javascript",
+    "image/svg+xml",
+}
+# Bodies larger than this are compressed per request, not cached
+MAX_CACHED_BODY = 1 << 20
+
+
+def negotiate(accept_encoding):
+    """Pick ``"br"``, ``"gzip"`` or None from an Accept-Encoding header value."""
+    if not accept_encoding:
+        return None
+    accept = parse_accept_header(accept_encoding)
+    best = None
+    best_q = 0
+    for encoding in ("br", "gzip") if brotli is not None else ("gzip",):
+        q = accept[encoding]
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class ResponseCompressor:
+    """Compresses bodies, remembering the last `cache_size` results."""
+
+    def __init__(self, cache_size=256):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compress(self, data, encoding, level=6):
+        cacheable = self.cache_size > 0 and len(data) <= MAX_CACHED_BODY
+        if cacheable:
+            key = (hashlib.blake2b(data, digest_size=16).digest(), encoding, level)
+            with self._lock:
+                body = self._cache.get(key)
+                if body is not None:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            metrics.count_cache("compression", body is not None)
+            if body is not None:
+                return body
+        if encoding == "br":
+            body = brotli.compress(data, quality=min(level, 11))
+        else:
+            body = gzip.compress(data, compresslevel=min(max(level, 1), 9), mtime=0)
+        if cacheable:
+            with self._lock:
+                self._cache[key] = body
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return body
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def encode(self, settings, body, mimetype, accept_encoding):
+        """``(body, encoding)`` for a response; encoding None means unchanged."""
+        if (
+            not settings.compress_responses
+            or mimetype not in COMPRESSIBLE_MIMETYPES
+            or len(body) < settings.compress_min_size
+        ):
+            return body, None
+        encoding = negotiate(accept_encoding)
+        if encoding is None:
+            return body, None
+        return self.compress(body, encoding, settings.compress_level), encoding
+
+
+def get_compressor(app):
+    return app.extensions.get(EXTENSION_KEY)
+
+
+def init_compression(app, settings):
+    """Install the compressor; COMPRESS_RESPONSES etc. are read per request."""
+    compressor = ResponseCompressor(settings.compress_cache_size)
+    app.extensions[EXTENSION_KEY] = compressor
+    app.after_request(_compress_response)
+    return compressor
+
+
+def _compress_response(response):
+    from flask import current_app, request
+
+    from app.settings import get_settings
+
+    settings = get_settings()
+    if (
+        not settings.compress_responses
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or not 200 <= response.status_code < 300
+        or response.status_code in (204, 206)
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+    data = response.get_data()
+    if len(data) < settings.compress_min_size:
+        return response
+    response.vary.add("Accept-Encoding")
+    body, encoding = get_compressor(current_app).encode(
+        settings, data, response.mimetype, request.headers.get("Accept-Encoding")
+    )
+    if encoding is not None:
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+    return response
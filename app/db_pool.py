@@ -0,0 +1,136 @@
+"""
+app/db_pool.py
+
+Database connection pool configuration and pool metrics.
+
+`engine_options` turns the `DB_POOL_*` settings into SQLAlchemy engine
+options (`SQLALCHEMY_ENGINE_OPTIONS`). Pooled engines use
+`InstrumentedQueuePool`, which times every checkout. `pool_stats` reports
+the wait counters together with the pool's live size, in-use and overflow
+counts (`GET /_admin/pool`), so pool exhaustion is visible before the feed
+stalls.
+
+With `DB_PGBOUNCER=1` the app expects a local PgBouncer in transaction
+mode. PgBouncer then owns pooling, so the app opens a connection per
+checkout (`NullPool`), and asyncpg's prepared statement caches are turned
+off because server-side statements do not survive transaction pooling.
+Session-level features such as the job runner's advisory locks need
+PgBouncer's session mode.
+"""
+
+import threading
+import time
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+
+class PoolStats:
+    """Thread-safe checkout counters shared by a pool and its recreations."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, seconds, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            if seconds > self.wait_seconds_max:
+                self.wait_seconds_max = seconds
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+
+
+class _TimedCheckout:
+    """Mixin timing `_do_get`, i.e. the wait for a free pooled connection."""
+
+    def __init__(self, *args, stats=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = stats or PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep counting into the same stats
+        new_pool = super().recreate()
+        new_pool.stats = self.stats
+        return new_pool
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def _is_memory_sqlite(url):
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(settings, database_url, is_async=False):
+    """SQLAlchemy engine options for `database_url` under `settings`."""
+    options = {"pool_pre_ping": settings.db_pool_pre_ping}
+    if not database_url:
+        return options
+    url = make_url(database_url)
+    if settings.db_pgbouncer:
+        options["poolclass"] = NullPool
+        if is_async and url.get_backend_name() == "postgresql":
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+            }
+        return options
+    if _is_memory_sqlite(url):
+        # In-memory SQLite needs its single shared connection (StaticPool)
+        return options
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    return options
+
+
+def pool_stats(engine):
+    """Live gauges and checkout counters for `engine`'s pool."""
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(0, pool.overflow()),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, _TimedCheckout):
+        stats.update(pool.stats.snapshot())
+    return stats
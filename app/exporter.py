@@ -0,0 +1,87 @@
+"""
+app/exporter.py
+
+Streaming NDJSON export of the post table (`GET /api/posts/export` and
+`jeet export`).
+
+Rows are read in keyset order (``WHERE id > :last_id ORDER BY id LIMIT n``)
+so each chunk is an index range scan regardless of depth, unlike offset
+pagination. Each chunk of plain column tuples is fetched and its connection
+returned to the pool before any row is yielded, so memory is bounded by the
+chunk size and a slow consumer never holds a connection (or a transaction)
+open while it reads.
+"""
+
+import json
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.models import Post
+from app.post_service import iso_z
+
+EXPORT_CHUNK_SIZE = 1000
+
+_COLUMNS = (
+    Post.id,
+    Post.username,
+    Post.message,
+    Post.timestamp,
+    Post.kindness_points,
+)
+
+
+def parse_bound(value):
+    """Parse an ISO 8601 or epoch-seconds `since`/`until` bound (None passes)."""
+    if value in (None, ""):
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        dt = datetime.utcfromtimestamp(float(value))
+    if dt.tzinfo is not None:
+        dt = datetime.utcfromtimestamp(dt.timestamp())
+    return dt
+
+
+def iter_post_rows(engine, since=None, until=None, after_id=0, chunk_size=None):
+    """Yield post rows with ``since <= timestamp < until`` in id order."""
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    last_id = int(after_id or 0)
+    while True:
+        stmt = select(*_COLUMNS).where(Post.id > last_id)
+        if since is not None:
+            stmt = stmt.where(Post.timestamp >= since)
+        if until is not None:
+            stmt = stmt.where(Post.timestamp < until)
+        stmt = stmt.order_by(Post.id).limit(chunk_size)
+        with engine.connect() as conn:
+            rows = conn.execute(stmt).all()
+        # Yield only after the connection is back in the pool
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1][0]
+
+
+def row_to_ndjson(row):
+    post_id, username, message, timestamp, kindness_points = row
+    return (
+        json.dumps(
+            {
+                "id": post_id,
+                "username": username,
+                "message": message,
+                "timestamp": iso_z(timestamp),
+                "kindness_points": int(kindness_points or 0),
+            },
+            ensure_ascii=False,
+        )
+        + "\n"
+    )
+
+
+def iter_ndjson(engine, **kwargs):
+    """Yield one NDJSON line per post; see `iter_post_rows` for arguments."""
+    for row in iter_post_rows(engine, **kwargs):
+        yield row_to_ndjson(row)
@@ -0,0 +1,142 @@
+"""
+app/gunicorn_conf.py
+
+Production gunicorn profile for jeetSocial.
+
+Usage:
+    gunicorn -c python:app.gunicorn_conf "app:create_app()"
+
+Workers and threads are derived from the CPU count and the worker class:
+
+- ``gthread`` (default): ``2 * CPU + 1`` processes × 4 threads. Threads
+  overlap the database and network waits of the polling-heavy feed.
+- ``gevent``: one process per CPU, ``WEB_WORKER_CONNECTIONS`` greenlets
+  each (requires ``pip install gevent psycogreen``; falls back to gthread
+  when gevent is missing). ``preload_app`` defaults to off: the worker
+  monkey-patches before it imports the app, whereas a preloading master
+  would create `threading` locks (usernames, jobs, post writer, profiling)
+  before the patch, and a lock that blocks then stalls the whole worker.
+- ``sync``: ``2 * CPU + 1`` single-threaded processes (the old behaviour).
+
+``preload_app`` is on by default for gthread and sync. The master
+imports and builds the app once (routes, models, `HATEFUL_REGEX`, the
+username pool), freezes the GC so the shared pages stay shared, and forks.
+Each worker then drops the inherited database connections. Per-process
+helpers (rate-limit storage, group-commit writer, job runner) already
+restart themselves after fork.
+
+With ``PROMETHEUS_MULTIPROC_DIR`` set (see `app/metrics.py`), the master
+empties that directory on startup and drops the live files of each worker
+that exits, so `/metrics` only merges values of this server's workers.
+
+Every value can be overridden from the environment: WEB_BIND, WEB_WORKERS,
+WEB_THREADS, WEB_WORKER_CLASS, WEB_WORKER_CONNECTIONS, WEB_PRELOAD,
+WEB_KEEPALIVE, WEB_TIMEOUT, WEB_MAX_REQUESTS.
+"""
+
+import gc
+import glob
+import importlib.util
+import multiprocessing
+import os
+
+WORKER_CLASSES = ("gthread", "gevent", "sync")
+
+
+def _int(environ, name, default):
+    value = environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def resolve(environ=None, cpu_count=None):
+    """Return the gunicorn settings for `environ` as a dict."""
+    env = os.environ if environ is None else environ
+    cpus = cpu_count or multiprocessing.cpu_count()
+
+    worker_class = env.get("WEB_WORKER_CLASS", "gthread").lower()
+    if worker_class not in WORKER_CLASSES:
+        raise ValueError(f"WEB_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}")
+    if worker_class == "gevent" and importlib.util.find_spec("gevent") is None:
+        worker_class = "gthread"
+
+    if worker_class == "gevent":
+        workers, threads = cpus, 1
+    elif worker_class == "gthread":
+        workers, threads = 2 * cpus + 1, 4
+    else:
+        workers, threads = 2 * cpus + 1, 1
+
+    # gevent must monkey-patch before the app is imported (see above)
+    preload = "0" if worker_class == "gevent" else "1"
+    max_requests = _int(env, "WEB_MAX_REQUESTS", 2000)
+    return {
+        "bind": env.get("WEB_BIND", "0.0.0.0:5000"),
+        "worker_class": worker_class,
+        "workers": _int(env, "WEB_WORKERS", workers),
+        "threads": _int(env, "WEB_THREADS", threads),
+        "worker_connections": _int(env, "WEB_WORKER_CONNECTIONS", 1000),
+        "preload_app": env.get("WEB_PRELOAD", preload) == "1",
+        # Longer than typical LB idle timeouts so polling clients reuse sockets
+        "keepalive": _int(env, "WEB_KEEPALIVE", 75),
+        "timeout": _int(env, "WEB_TIMEOUT", 30),
+        "graceful_timeout": 30,
+        # Recycle workers periodically (jittered) to cap slow leaks
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests // 10,
+        "accesslog": env.get("WEB_ACCESS_LOG") or None,
+        "errorlog": "-",
+    }
+
+
+globals().update(resolve())
+
+
+def on_starting(server):
+    """Master hook: start metrics from an empty multiprocess directory."""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        return
+    os.makedirs(path, exist_ok=True)
+    for name in glob.glob(os.path.join(path, "*.db")):
+        os.remove(name)
+
+
+def child_exit(server, worker):
+    """Master hook: forget the live gauges of a worker that exited."""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server):
+    """Master hook: warm shared state, then freeze it before workers fork."""
+    if not server.cfg.preload_app:
+        return
+    from app.usernames import get_allocator
+
+    get_allocator().warm()
+    gc.collect()
+    # Keep refcount/GC bookkeeping from dirtying the shared pages post-fork
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Worker hook: never reuse database sockets inherited from the master."""
+    app = getattr(server.app, "callable", None)
+    if app is None or not hasattr(app, "app_context"):
+        return
+    from app import db
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+    if server.cfg.worker_class_str == "gevent":
+        try:
+            from psycogreen.gevent import patch_psycopg
+        except ImportError:
+            server.log.warning("psycogreen not installed; psycopg2 calls will block")
+        else:
+            patch_psycopg()
@@ -0,0 +1,218 @@
+"""
+app/importer.py
+
+Bulk post import for seeding and migrations (`jeet import`).
+
+Records are streamed from NDJSON or CSV, run through the same length and
+moderation checks as `POST /api/posts` (`post_service.check_message`), given
+a `generate_username()` name when none is supplied, and loaded in batches:
+Postgres (psycopg2) uses ``COPY ... FROM STDIN``, every other backend falls
+back to an ``executemany`` insert.
+
+After each committed batch a JSON checkpoint recording how many source
+records have been consumed is atomically replaced, so an interrupted import
+resumes at the next batch. A crash between commit and checkpoint write can
+replay at most one batch.
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+
+from app.checkpoints import read_checkpoint, write_checkpoint
+from app.models import Post
+from app.post_service import check_message
+from app.utils import generate_username
+
+COPY_COLUMNS = ("username", "message", "timestamp", "kindness_points")
+
+
+def detect_format(path):
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def read_records(fh, fmt, skip=0):
+    """Yield raw dict records (or None for unparseable lines) from `fh`.
+
+    The first `skip` records are consumed without being decoded.
+    """
+    if fmt == "csv":
+        for index, row in enumerate(csv.DictReader(fh)):
+            if index >= skip:
+                yield row
+        return
+    index = 0
+    for line in fh:
+        line = line.strip()
+        if not line:
+            continue
+        index += 1
+        if index <= skip:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield record if isinstance(record, dict) else None
+
+
+def _parse_timestamp(value):
+    if not value:
+        return datetime.utcnow()
+    dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is not None:
+        # Stored timestamps are naive UTC, matching Post.timestamp defaults
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def prepare_row(record):
+    """Validate a raw record; return ``(row, None)`` or ``(None, error)``."""
+    if record is None:
+        return None, "Unparseable record"
+    message, error, _ = check_message(record.get("message") or record.get("content"))
+    if error:
+        return None, error
+    username = record.get("username") or ""
+    if not isinstance(username, str):
+        return None, "Username must be a string"
+    username = username.strip() or generate_username()
+    if len(username) > 32:
+        return None, "Username exceeds 32 characters"
+    try:
+        timestamp = _parse_timestamp(
+            record.get("timestamp") or record.get("creation_timestamp")
+        )
+        kindness_points = int(record.get("kindness_points") or 0)
+    except (TypeError, ValueError):
+        return None, "Invalid timestamp or kindness_points"
+    return {
+        "username": username,
+        "message": message,
+        "timestamp": timestamp,
+        "kindness_points": kindness_points,
+    }, None
+
+
+def _copy_rows(conn, rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow(
+            [
+                row["username"],
+                row["message"],
+                row["timestamp"].isoformat(),
+                row["kindness_points"],
+            ]
+        )
+    buf.seek(0)
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY post ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buf,
+        )
+    finally:
+        cursor.close()
+
+
+def load_rows(engine, rows):
+    """Insert `rows` in one transaction using the fastest available path."""
+    if not rows:
+        return
+    dialect = engine.dialect
+    use_copy = dialect.name == "postgresql" and dialect.driver == "psycopg2"
+    with engine.begin() as conn:
+        if use_copy:
+            _copy_rows(conn, rows)
+        else:
+            conn.execute(insert(Post), rows)
+
+
+def import_posts(
+    engine,
+    source,
+    fmt=None,
+    batch_size=1000,
+    checkpoint=None,
+    resume=True,
+    dry_run=False,
+    rejects=None,
+    out=sys.stderr,
+):
+    """Import posts from `source` (a path); return the final stats dict.
+
+    Args:
+        engine: SQLAlchemy engine to load into.
+        fmt: ``"ndjson"`` or ``"csv"`` (detected from the extension if None).
+        checkpoint: checkpoint file path (default ``<source>.checkpoint``).
+        resume: skip records already consumed according to the checkpoint.
+        dry_run: validate and report only; nothing (not even the
+            checkpoint) is written and `inserted` counts valid records.
+        rejects: optional file object receiving one NDJSON line per reject.
+        out: progress stream (None for silent).
+    """
+    fmt = fmt or detect_format(source)
+    checkpoint = checkpoint or f"{source}.checkpoint"
+    stats = {
+        "source": os.path.abspath(source),
+        "offset": 0,
+        "inserted": 0,
+        "rejected": 0,
+        "dry_run": dry_run,
+    }
+    state = read_checkpoint(checkpoint) if resume and not dry_run else None
+    if state and state.get("source") == stats["source"]:
+        stats.update(
+            {k: int(state.get(k, 0)) for k in ("offset", "inserted", "rejected")}
+        )
+        if out:
+            print(f"Resuming {source} after record {stats['offset']}", file=out)
+    skip = stats["offset"]
+
+    started = time.perf_counter()
+    processed = 0
+    batch = []
+
+    def flush():
+        if not dry_run:
+            load_rows(engine, batch)
+        stats["inserted"] += len(batch)
+        if not dry_run:
+            write_checkpoint(checkpoint, stats)
+        batch.clear()
+        if out:
+            elapsed = time.perf_counter() - started
+            rate = processed / elapsed if elapsed else 0.0
+            print(
+                f"records={stats['offset']} inserted={stats['inserted']} "
+                f"rejected={stats['rejected']} rate={rate:,.0f}/s",
+                file=out,
+            )
+
+    with open(source, "r", encoding="utf-8", newline="") as fh:
+        for index, record in enumerate(read_records(fh, fmt, skip), start=skip):
+            row, error = prepare_row(record)
+            stats["offset"] = index + 1
+            processed += 1
+            if error:
+                stats["rejected"] += 1
+                if rejects is not None:
+                    rejects.write(
+                        json.dumps({"record": index + 1, "error": error}) + "\n"
+                    )
+            else:
+                batch.append(row)
+            if len(batch) >= batch_size:
+                flush()
+    if batch or processed:
+        flush()
+    stats["elapsed"] = round(time.perf_counter() - started, 3)
+    return stats
@@ -0,0 +1,338 @@
+"""
+app/jobs.py
+
+In-app scheduler for periodic and one-shot housekeeping jobs.
+
+With `ENABLE_JOB_RUNNER=1` every worker process starts a `JobRunner`
+daemon thread (lazily, on its first request, so it survives gunicorn's
+fork). When a job is due, the runner first takes a per-job leader lock,
+a Postgres advisory lock (`pg_try_advisory_lock`) or an `flock` file lock
+on other databases, so only one worker runs it at a time. Inside the lock
+it skips the job if another worker already completed it within the
+interval. Every run is timed and recorded in the `job_runs` table, and
+per-process counters are kept in `JobRunner.metrics()`.
+
+The destructive `truncate-long-posts` job is only scheduled with
+`JOB_TRUNCATE_LONG_POSTS=1`; otherwise it runs only from the CLI.
+
+Jobs can also be triggered or inspected with `jeet jobs run|list|history`.
+"""
+
+import contextlib
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import delete, select, text
+
+from app import db
+from app.models import JobRun, KindnessVote
+
+EXTENSION_KEY = "jeet.job_runner"
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+@dataclass(frozen=True)
+class Job:
+    """A named unit of housekeeping work.
+
+    `func(app)` runs inside an app context. `interval` is in seconds; None
+    makes it one-shot: it runs once at startup when `run_at_start` is set,
+    otherwise only when triggered from the CLI.
+    """
+
+    name: str
+    func: Callable
+    interval: Optional[float] = None
+    run_at_start: bool = False
+    description: str = ""
+
+
+def _lock_key(name):
+    # Stable signed 32-bit key for pg advisory locks
+    return zlib.crc32(f"jeet-job:{name}".encode("utf-8")) - 2**31
+
+
+@contextlib.contextmanager
+def leader_lock(engine, name, lock_dir=None):
+    """Yield True if this process holds the cluster-wide lock for job `name`."""
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            key = _lock_key(name)
+            got = conn.execute(
+                text("SELECT pg_try_advisory_lock(:k)"), {"k": key}
+            ).scalar()
+            try:
+                yield bool(got)
+            finally:
+                if got:
+                    conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": key})
+                conn.commit()
+        return
+    if fcntl is None:
+        yield True
+        return
+    path = os.path.join(lock_dir or tempfile.gettempdir(), f"jeet-job-{name}.lock")
+    with open(path, "a") as fh:
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+class JobRunner:
+    """Run registered jobs on a schedule from a background thread."""
+
+    def __init__(self, app, jobs, tick=1.0, lock_dir=None):
+        self.app = app
+        self.jobs = {job.name: job for job in jobs}
+        self.tick = tick
+        self.lock_dir = lock_dir
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._next = {}
+        self._metrics = {
+            name: {
+                "runs": 0,
+                "failures": 0,
+                "skipped": 0,
+                "last_status": None,
+                "last_duration_ms": None,
+                "total_duration_ms": 0.0,
+            }
+            for name in self.jobs
+        }
+
+    def ensure_started(self):
+        """Start the scheduler thread once per process (safe to call often).
+
+        A thread that died (or was inherited across a fork) is replaced.
+        """
+        if self._running():
+            return
+        with self._start_lock:
+            if self._running():
+                return
+            self._pid = os.getpid()
+            self.worker = f"{socket.gethostname()}:{self._pid}"
+            self._stop.clear()
+            now = time.monotonic()
+            for job in self.jobs.values():
+                if job.run_at_start:
+                    self._next[job.name] = now
+                elif job.interval:
+                    # Jitter first runs so workers do not all race at boot
+                    self._next[job.name] = now + random.uniform(5, 60)
+            self._thread = threading.Thread(
+                target=self._loop, name="job-runner", daemon=True
+            )
+            self._thread.start()
+
+    def _running(self):
+        thread = self._thread
+        return thread is not None and self._pid == os.getpid() and thread.is_alive()
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def metrics(self):
+        """Per-process counters and timings for each job."""
+        return {name: dict(values) for name, values in self._metrics.items()}
+
+    def _loop(self):
+        while not self._stop.wait(self.tick):
+            now = time.monotonic()
+            for name, due in list(self._next.items()):
+                if now < due:
+                    continue
+                job = self.jobs[name]
+                if job.interval:
+                    self._next[name] = now + job.interval
+                else:
+                    del self._next[name]
+                try:
+                    self.run(name)
+                except Exception:
+                    # e.g. the leader lock cannot reach the database; keep
+                    # the scheduler alive and try again at the next due time
+                    self.app.logger.exception(f"Job {name} could not be run")
+
+    def _ran_recently(self, job):
+        cutoff = datetime.utcnow() - timedelta(seconds=job.interval * 0.9)
+        last = db.session.execute(
+            select(JobRun.started_at)
+            .where(JobRun.job == job.name, JobRun.status == "ok")
+            .order_by(JobRun.started_at.desc())
+            .limit(1)
+        ).scalar()
+        return last is not None and last >= cutoff
+
+    def run(self, name, force=False):
+        """Run job `name` now if this process wins its leader lock.
+
+        Returns "ok", "error" or "skipped". `force` ignores the recent-run
+        check (the leader lock is always honoured).
+        """
+        job = self.jobs[name]
+        stats = self._metrics[name]
+        with self.app.app_context():
+            with leader_lock(db.engine, name, self.lock_dir) as leader:
+                if not leader:
+                    stats["skipped"] += 1
+                    return "skipped"
+                try:
+                    if not force and job.interval and self._ran_recently(job):
+                        stats["skipped"] += 1
+                        return "skipped"
+                except Exception:
+                    db.session.rollback()
+                started_at = datetime.utcnow()
+                start = time.perf_counter()
+                error = None
+                try:
+                    job.func(self.app)
+                    status = "ok"
+                except Exception as exc:
+                    db.session.rollback()
+                    status, error = "error", str(exc)
+                    self.app.logger.exception(f"Job {name} failed")
+                duration_ms = (time.perf_counter() - start) * 1000.0
+                stats["runs"] += 1
+                stats["failures"] += status == "error"
+                stats["last_status"] = status
+                stats["last_duration_ms"] = round(duration_ms, 3)
+                stats["total_duration_ms"] += duration_ms
+                self._record(name, started_at, duration_ms, status, error)
+                self.app.logger.info(
+                    f"Job {name} {status} in {duration_ms:.1f}ms on {self.worker}"
+                )
+                return status
+
+    def _record(self, name, started_at, duration_ms, status, error):
+        try:
+            db.session.add(
+                JobRun(
+                    job=name,
+                    started_at=started_at,
+                    duration_ms=duration_ms,
+                    status=status,
+                    error=error,
+                    worker=self.worker,
+                )
+            )
+            db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            self.app.logger.warning(f"Could not record run of job {name}: {exc}")
+
+
+# Built-in jobs
+
+KINDNESS_VOTE_RETENTION = timedelta(days=7)
+JOB_RUN_RETENTION = timedelta(days=30)
+_PRUNE_BATCH = 5000
+
+
+def _prune_in_batches(model, column, cutoff):
+    total = 0
+    while True:
+        ids = select(model.id).where(column < cutoff).limit(_PRUNE_BATCH)
+        result = db.session.execute(delete(model).where(model.id.in_(ids)))
+        db.session.commit()
+        total += result.rowcount
+        if result.rowcount < _PRUNE_BATCH:
+            return total
+
+
+def prune_kindness_votes(app):
+    """Drop redeemed-token records long after their tokens expired.
+
+    Tokens live for minutes, so old `kindness_votes` rows no longer guard
+    against double-spend; points already live on `post.kindness_points`.
+    """
+    cutoff = datetime.utcnow() - KINDNESS_VOTE_RETENTION
+    return _prune_in_batches(KindnessVote, KindnessVote.created_at, cutoff)
+
+
+def prune_job_runs(app):
+    cutoff = datetime.utcnow() - JOB_RUN_RETENTION
+    return _prune_in_batches(JobRun, JobRun.started_at, cutoff)
+
+
+def truncate_long_posts(app):
+    from app.maintenance import TASKS, run_task
+
+    return run_task(db.engine, TASKS["truncate-long-posts"], sleep=0.05, out=None)
+
+
+def default_jobs(settings=None):
+    """Built-in jobs; `settings` opts into scheduling the destructive ones."""
+    truncate = settings is not None and settings.job_truncate_long_posts
+    return [
+        Job(
+            "prune-kindness-votes",
+            prune_kindness_votes,
+            interval=6 * 3600,
+            description="Delete kindness votes older than 7 days",
+        ),
+        Job(
+            "prune-job-runs",
+            prune_job_runs,
+            interval=24 * 3600,
+            description="Delete job history older than 30 days",
+        ),
+        Job(
+            "truncate-long-posts",
+            truncate_long_posts,
+            interval=24 * 3600 if truncate else None,
+            description="Truncate posts over the character limit"
+            + ("" if truncate else " (manual; JOB_TRUNCATE_LONG_POSTS=1 schedules it)"),
+        ),
+    ]
+
+
+def init_job_runner(app, settings):
+    """Attach a runner to `app`; start it per worker when the flag is on."""
+    runner = JobRunner(app, default_jobs(settings))
+    app.extensions[EXTENSION_KEY] = runner
+    if settings.enable_job_runner:
+        app.before_request(runner.ensure_started)
+    return runner
+
+
+def get_job_runner(app):
+    return app.extensions[EXTENSION_KEY]
+
+
+def print_history(rows, out=None):
+    out = out or sys.stdout
+    for row in rows:
+        print(
+            f"{row.started_at.isoformat()}Z  {row.job:<24}{row.status:<7}"
+            f"{row.duration_ms:>10.1f}ms  {row.worker or ''}"
+            + (f"  {row.error}" if row.error else ""),
+            file=out,
+        )
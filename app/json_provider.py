@@ -0,0 +1,104 @@
+"""
+app/json_provider.py
+
+JSON encoding for API responses.
+
+`FastJSONProvider` is installed as `app.json` by `create_app`, so `jsonify`,
+`request.get_json` and the ASGI fast paths (through `dumps`) share one
+encoder: orjson when it is installed (``pip install -e .[fast]``), else the
+stdlib `json` module. `JSON_BACKEND=stdlib` forces the fallback.
+
+Both backends write `datetime` values the way the API always has: ISO 8601
+UTC ending in ``Z`` (naive datetimes are taken as UTC), so handlers can put
+`Post.timestamp` straight into a response.
+"""
+
+import json
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider, _default
+
+from app.post_service import iso_z
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json
+    orjson = None
+
+JSON_BACKENDS = ("auto", "orjson", "stdlib")
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def _stdlib_default(obj):
+    if isinstance(obj, datetime):
+        return iso_z(obj)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    return _default(obj)
+
+
+def _orjson_default(obj):
+    # orjson handles datetime, date, UUID and dataclasses itself
+    return _default(obj)
+
+
+def backend_name(name="auto"):
+    """Resolve `JSON_BACKEND` to the backend that will actually be used."""
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"JSON_BACKEND must be one of {', '.join(JSON_BACKENDS)}")
+    if name == "auto":
+        return "orjson" if orjson is not None else "stdlib"
+    if name == "orjson" and orjson is None:
+        raise ValueError("JSON_BACKEND=orjson but orjson is not installed")
+    return name
+
+
+def dumps(obj, backend="auto", sort_keys=False):
+    """Encode `obj` as compact UTF-8 JSON bytes."""
+    if backend_name(backend) == "orjson":
+        option = _ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=_orjson_default, option=option)
+    return json.dumps(
+        obj,
+        default=_stdlib_default,
+        separators=(",", ":"),
+        sort_keys=sort_keys,
+    ).encode("utf-8")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson when available."""
+
+    default = staticmethod(_stdlib_default)
+    # Insertion order is already stable; UTF-8 output matches orjson
+    sort_keys = False
+    ensure_ascii = False
+
+    def __init__(self, app, backend="auto"):
+        super().__init__(app)
+        self.backend = backend_name(backend)
+
+    def dumps(self, obj, **kwargs):
+        if self.backend == "orjson" and not kwargs.keys() - {"separators"}:
+            return dumps(obj, "orjson", self.sort_keys).decode("utf-8")
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.backend == "orjson" and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if self.backend != "orjson" or self._app.debug or self.compact is False:
+            return super().response(*args, **kwargs)
+        # Skip the bytes -> str -> bytes round trip of the default provider
+        body = dumps(self._prepare_response_obj(args, kwargs), "orjson", self.sort_keys)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+def init_json(app, settings):
+    """Install `FastJSONProvider` as `app.json` (`JSON_BACKEND` picks the encoder)."""
+    app.json = FastJSONProvider(app, settings.json_backend)
+    return app.json
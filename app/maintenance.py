@@ -0,0 +1,162 @@
+"""
+app/maintenance.py
+
+Chunked, resumable, set-based maintenance over the post table.
+
+A `MaintenanceTask` describes a row filter and a set-based statement (an
+``UPDATE`` or ``DELETE``). `run_task` applies it to bounded primary-key
+ranges (``id >= lo AND id < hi``), one short transaction per range, so locks
+and WAL growth stay bounded however many rows match. After each range a
+checkpoint records the next id so an interrupted run resumes where it
+stopped; the checkpoint is removed once a run completes. An optional sleep
+between ranges throttles load on a live database. Dry runs issue only
+``COUNT(*)`` per range and stream the totals; no rows are ever loaded into
+Python.
+
+Future backfills subclass `MaintenanceTask`, implement `where` and `apply`,
+and register themselves in `TASKS` to become available to
+`jeet maintain <task>`.
+"""
+
+import sys
+import time
+
+from sqlalchemy import delete, func, select, update
+
+from app.checkpoints import clear_checkpoint, read_checkpoint, write_checkpoint
+from app.models import KindnessVote, Post
+from app.post_service import MAX_MESSAGE_LENGTH
+
+
+class MaintenanceTask:
+    """Base class: a filter on `post` plus a statement applied per id range."""
+
+    name = None
+    description = ""
+
+    def where(self):
+        """Return the SQLAlchemy condition selecting rows this task touches."""
+        raise NotImplementedError
+
+    def apply(self, conn, id_range):
+        """Apply the change to matching rows in `id_range`; return the count."""
+        raise NotImplementedError
+
+
+class TruncateLongPosts(MaintenanceTask):
+    name = "truncate-long-posts"
+    description = f"Truncate messages longer than {MAX_MESSAGE_LENGTH} characters"
+
+    def where(self):
+        return func.length(Post.message) > MAX_MESSAGE_LENGTH
+
+    def apply(self, conn, id_range):
+        stmt = (
+            update(Post)
+            .where(id_range, self.where())
+            .values(message=func.substr(Post.message, 1, MAX_MESSAGE_LENGTH))
+            .execution_options(synchronize_session=False)
+        )
+        return conn.execute(stmt).rowcount
+
+
+class DeleteLongPosts(MaintenanceTask):
+    name = "delete-long-posts"
+    description = f"Delete posts longer than {MAX_MESSAGE_LENGTH} characters"
+
+    def where(self):
+        return func.length(Post.message) > MAX_MESSAGE_LENGTH
+
+    def apply(self, conn, id_range):
+        doomed = select(Post.id).where(id_range, self.where())
+        # Redeemed kindness votes reference the post; remove them first
+        conn.execute(
+            delete(KindnessVote)
+            .where(KindnessVote.post_id.in_(doomed))
+            .execution_options(synchronize_session=False)
+        )
+        stmt = (
+            delete(Post)
+            .where(id_range, self.where())
+            .execution_options(synchronize_session=False)
+        )
+        return conn.execute(stmt).rowcount
+
+
+TASKS = {task.name: task for task in (TruncateLongPosts(), DeleteLongPosts())}
+
+
+def default_checkpoint_path(task):
+    return f".maintenance-{task.name}.checkpoint"
+
+
+def run_task(
+    engine,
+    task,
+    batch_size=5000,
+    dry_run=False,
+    checkpoint=None,
+    resume=True,
+    sleep=0.0,
+    out=sys.stderr,
+):
+    """Run `task` over the post table in id ranges of `batch_size`.
+
+    Args:
+        engine: SQLAlchemy engine.
+        task: a `MaintenanceTask` instance (see `TASKS`).
+        dry_run: only count matching rows per range.
+        checkpoint: checkpoint path (default ``.maintenance-<task>.checkpoint``);
+            ignored for dry runs.
+        resume: continue from the checkpoint if one exists for `task`.
+        sleep: seconds to pause between ranges (throttling).
+        out: progress stream (None for silent).
+
+    Returns a stats dict with ``matched`` (dry run) or ``affected`` totals.
+    """
+    checkpoint = checkpoint or default_checkpoint_path(task)
+    with engine.connect() as conn:
+        lo, max_id = conn.execute(select(func.min(Post.id), func.max(Post.id))).one()
+    stats = {"task": task.name, "dry_run": dry_run, "next_id": lo or 0}
+    stats["matched" if dry_run else "affected"] = 0
+    if lo is None:
+        return stats
+
+    state = read_checkpoint(checkpoint) if resume and not dry_run else None
+    if state and state.get("task") == task.name:
+        stats["next_id"] = max(lo, int(state["next_id"]))
+        stats["affected"] = int(state.get("affected", 0))
+        if out:
+            print(f"Resuming {task.name} at id {stats['next_id']}", file=out)
+
+    started = time.perf_counter()
+    while stats["next_id"] <= max_id:
+        start = stats["next_id"]
+        end = start + batch_size
+        id_range = (Post.id >= start) & (Post.id < end)
+        if dry_run:
+            with engine.connect() as conn:
+                n = conn.execute(
+                    select(func.count()).select_from(Post).where(id_range, task.where())
+                ).scalar_one()
+            stats["matched"] += n
+        else:
+            with engine.begin() as conn:
+                n = task.apply(conn, id_range)
+            stats["affected"] += n
+        stats["next_id"] = end
+        if not dry_run:
+            write_checkpoint(checkpoint, stats)
+        if out:
+            key = "matched" if dry_run else "affected"
+            print(
+                f"{task.name}: ids [{start}, {end}) {key}={n} "
+                f"total={stats[key]} elapsed={time.perf_counter() - started:.1f}s",
+                file=out,
+            )
+        if sleep and stats["next_id"] <= max_id:
+            time.sleep(sleep)
+    if not dry_run:
+        # Finished: the next run should start from the lowest id again
+        clear_checkpoint(checkpoint)
+    return stats
@@ -0,0 +1,259 @@
+"""
+app/metrics.py
+
+Prometheus metrics (`ENABLE_METRICS=1`, scraped from `GET /metrics`):
+
+- ``jeet_http_request_duration_seconds`` / ``jeet_http_requests_total``:
+  latency and status per method and route (the URL rule, e.g.
+  ``/api/posts/<int:post_id>``), for Flask views and the ASGI fast paths
+- ``jeet_db_queries_total``, ``jeet_db_query_duration_seconds`` and
+  ``jeet_db_queries_per_request`` per route, from SQLAlchemy cursor events
+  on every engine (``<background>`` for the job runner and batch writer)
+- ``jeet_moderation_duration_seconds``: the hate speech check on new posts
+- ``jeet_serialization_duration_seconds``: JSON encoding per response schema
+- ``jeet_cache_requests_total``: hits and misses per cache (the hit ratio is
+  ``hit / (hit + miss)``)
+
+Requires ``prometheus_client`` (``pip install -e .[metrics]``; it is in
+requirements-runtime.txt). Nothing is registered or recorded unless metrics
+are enabled, so the hooks cost one attribute check when they are off.
+
+Each gunicorn worker counts on its own. Point ``PROMETHEUS_MULTIPROC_DIR``
+at a writable directory before the server starts and prometheus_client
+keeps the values in per-process files there; `/metrics` merges all of them
+through `MultiProcessCollector`, whichever worker answers.
+`app/gunicorn_conf.py` empties the directory when the master starts and
+marks exited workers dead.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # optional: metrics stay disabled
+    prometheus_client = None
+
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+# Route label for queries run outside a request (job runner, batch writer)
+BACKGROUND = "<background>"
+UNMATCHED = "<unmatched>"
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+FAST_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Created by `init_metrics`; None means metrics are off in this process
+_metrics = None
+_current = ContextVar("jeet_metrics_request", default=None)
+
+
+class _Metrics:
+    def __init__(self):
+        from prometheus_client import Counter, Histogram
+
+        self.request_latency = Histogram(
+            "jeet_http_request_duration_seconds",
+            "Request latency by route",
+            ["method", "route"],
+            buckets=LATENCY_BUCKETS,
+        )
+        self.requests = Counter(
+            "jeet_http_requests_total",
+            "Requests by route and status",
+            ["method", "route", "status"],
+        )
+        self.db_queries = Counter(
+            "jeet_db_queries_total", "Database queries by route", ["route"]
+        )
+        self.db_query_latency = Histogram(
+            "jeet_db_query_duration_seconds",
+            "Database query duration by route",
+            ["route"],
+            buckets=LATENCY_BUCKETS,
+        )
+        self.db_queries_per_request = Histogram(
+            "jeet_db_queries_per_request",
+            "Database queries issued while serving one request",
+            ["route"],
+            buckets=QUERY_COUNT_BUCKETS,
+        )
+        self.moderation = Histogram(
+            "jeet_moderation_duration_seconds",
+            "Hate speech check duration per post",
+            buckets=FAST_BUCKETS,
+        )
+        self.serialization = Histogram(
+            "jeet_serialization_duration_seconds",
+            "JSON encoding duration by response schema",
+            ["schema"],
+            buckets=FAST_BUCKETS,
+        )
+        self.cache = Counter(
+            "jeet_cache_requests_total", "Cache lookups by result", ["cache", "result"]
+        )
+
+
+class RequestStats:
+    """Per-request counters, reachable from SQLAlchemy events via a ContextVar."""
+
+    __slots__ = ("route", "start", "queries")
+
+    def __init__(self, route):
+        self.route = route
+        self.start = time.perf_counter()
+        self.queries = 0
+
+
+def enabled():
+    return _metrics is not None
+
+
+# Request tracking (shared by the Flask hooks and app/asgi.py)
+
+
+def start_request(route):
+    """Begin timing a request to `route`; returns the stats, or None when off."""
+    if _metrics is None:
+        return None
+    stats = RequestStats(route)
+    _current.set(stats)
+    return stats
+
+
+def finish_request(stats, method, status):
+    if stats is None:
+        return
+    _current.set(None)
+    _metrics.request_latency.labels(method, stats.route).observe(
+        time.perf_counter() - stats.start
+    )
+    _metrics.requests.labels(method, stats.route, str(status)).inc()
+    _metrics.db_queries_per_request.labels(stats.route).observe(stats.queries)
+
+
+# Stage timings and caches
+
+
+def observe_moderation(seconds):
+    if _metrics is not None:
+        _metrics.moderation.observe(seconds)
+
+
+def observe_serialization(obj, seconds):
+    if _metrics is not None:
+        _metrics.serialization.labels(type(obj).__name__).observe(seconds)
+
+
+def count_cache(cache, hit):
+    if _metrics is not None:
+        _metrics.cache.labels(cache, "hit" if hit else "miss").inc()
+
+
+# SQLAlchemy hooks
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info["jeet_query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    start = conn.info.pop("jeet_query_start", None)
+    if _metrics is None or start is None:
+        return
+    stats = _current.get()
+    route = BACKGROUND if stats is None else stats.route
+    if stats is not None:
+        stats.queries += 1
+    _metrics.db_queries.labels(route).inc()
+    _metrics.db_query_latency.labels(route).observe(time.perf_counter() - start)
+
+
+def _install_query_hooks():
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    # Class-level listeners cover the primary, the replica and async engines
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# Flask integration
+
+
+def _flask_start():
+    from flask import g, request
+
+    route = request.url_rule.rule if request.url_rule is not None else UNMATCHED
+    g.jeet_metrics = start_request(route)
+
+
+def _flask_finish(response):
+    from flask import g, request
+
+    finish_request(g.pop("jeet_metrics", None), request.method, response.status_code)
+    return response
+
+
+def _flask_teardown(exc):
+    # after_request is skipped when a response cannot be built
+    _current.set(None)
+
+
+def registry():
+    """The registry to expose: merged worker files in multiprocess mode."""
+    if os.environ.get(MULTIPROC_ENV):
+        merged = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(merged)
+        return merged
+    return prometheus_client.REGISTRY
+
+
+def metrics_view():
+    from flask import current_app
+
+    body = prometheus_client.generate_latest(registry())
+    return current_app.response_class(
+        body, content_type=prometheus_client.CONTENT_TYPE_LATEST
+    )
+
+
+def init_metrics(app, settings):
+    """Record metrics and serve `/metrics` when `ENABLE_METRICS` is set.
+
+    Registered before the other after_request hooks so request latency
+    includes response compression.
+    """
+    global _metrics
+    if not settings.enable_metrics:
+        return None
+    if prometheus_client is None:
+        raise ValueError("ENABLE_METRICS=1 but prometheus_client is not installed")
+    if _metrics is None:
+        path = os.environ.get(MULTIPROC_ENV)
+        if path:
+            os.makedirs(path, exist_ok=True)
+        _metrics = _Metrics()
+        _install_query_hooks()
+    app.before_request(_flask_start)
+    app.after_request(_flask_finish)
+    app.teardown_request(_flask_teardown)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
+    return _metrics
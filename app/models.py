@@ -48,3 +48,28 @@ class KindnessVote(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     post = db.relationship("Post", backref=db.backref("kindness_votes", lazy="dynamic"))
+
+
+class JobRun(db.Model):
+    __tablename__ = "job_runs"
+    """
+    One execution of a background maintenance job (see app/jobs.py).
+    Fields:
+      - id: Primary key
+      - job: registered job name
+      - started_at: UTC start time
+      - duration_ms: wall time of the run
+      - status: "ok" or "error"
+      - error: error message for failed runs
+      - worker: "<hostname>:<pid>" of the process that ran it
+    """
+
+    id = db.Column(db.Integer, primary_key=True)
+    job = db.Column(db.String(64), nullable=False)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    duration_ms = db.Column(db.Float, nullable=False, default=0.0)
+    status = db.Column(db.String(16), nullable=False)
+    error = db.Column(db.Text)
+    worker = db.Column(db.String(128))
+
+    __table_args__ = (db.Index("ix_job_runs_job_started_at", "job", "started_at"),)
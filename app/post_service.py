@@ -4,10 +4,58 @@ app/post_service.py
 Service utilities for post-related computations.
 """
 
+import base64
+import binascii
+import time
 from datetime import datetime, timedelta
 from typing import List, Optional
 
+from sqlalchemy import and_, or_
+
+from app import metrics, schemas
 from app.models import Post
+from app.utils import format_display_timestamp, is_hate_speech
+
+MAX_MESSAGE_LENGTH = 280
+
+# Upper bound on ids accepted by batch kindness token issuance (roughly a few
+# feed pages) so a single request cannot mint an unbounded number of tokens.
+KINDNESS_TOKEN_BATCH_LIMIT = 100
+
+# Default and largest feed page size; larger `limit` values are capped
+FEED_LIMIT_DEFAULT = 50
+MAX_FEED_LIMIT = 200
+
+# Keyset order of the latest feed; `id` breaks timestamp ties so cursors are exact
+FEED_ORDER = (Post.timestamp.desc(), Post.id.desc())
+
+
+def check_message(raw):
+    """Apply the post length and moderation rules to `raw`.
+
+    Returns ``(message, error, status)``: the stripped message and
+    ``(None, None)`` when it is acceptable, otherwise the user-facing error
+    and the HTTP status the API responds with.
+    """
+    message = (raw or "").strip() if isinstance(raw, str) else ""
+    if not message:
+        return message, "Message required", 400
+    if len(message) > MAX_MESSAGE_LENGTH:
+        return (
+            message,
+            f"Message exceeds {MAX_MESSAGE_LENGTH} character limit",
+            400,
+        )
+    start = time.perf_counter()
+    is_hate, reason, details = is_hate_speech(message)
+    metrics.observe_moderation(time.perf_counter() - start)
+    if is_hate:
+        return (
+            message,
+            f"Hateful content not allowed (detected by {reason}: {details})",
+            403,
+        )
+    return message, None, None
 
 
 def top_posts(
@@ -58,3 +106,141 @@ def top_posts(
     if limit:
         return sorted_posts[:limit]
     return sorted_posts
+
+
+def existing_post_ids(post_ids, *, session):
+    """Return the subset of `post_ids` that exist in the post table.
+
+    Uses a single `IN` query so callers validating many ids (e.g. batch
+    kindness token issuance) avoid one primary-key lookup per id.
+    """
+    if not post_ids:
+        return set()
+    rows = session.query(Post.id).filter(Post.id.in_(list(post_ids))).all()
+    return {row[0] for row in rows}
+
+
+def parse_post_ids(raw_ids):
+    """Validate a batch of post ids from a request.
+
+    Returns ``(post_ids, error)``: the de-duplicated ids in client order, or
+    None and the user-facing error message.
+    """
+    if not isinstance(raw_ids, list) or not raw_ids:
+        return None, "Missing post_ids"
+    if len(raw_ids) > KINDNESS_TOKEN_BATCH_LIMIT:
+        return (
+            None,
+            f"Too many post_ids (max {KINDNESS_TOKEN_BATCH_LIMIT} per request)",
+        )
+    try:
+        return list(dict.fromkeys(_post_id(pid) for pid in raw_ids)), None
+    except (TypeError, ValueError):
+        return None, "post_ids must be integers"
+
+
+def _post_id(value):
+    # int() would quietly turn JSON `true` into 1 and truncate 1.9 to 1
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"Not an integer post id: {value!r}")
+    return int(value)
+
+
+def parse_feed_limit(raw):
+    """Validate the feed's `limit` query parameter.
+
+    Returns ``(limit, error)``: the page size (the default when `raw` is
+    None, capped at `MAX_FEED_LIMIT`), or None and the user-facing error.
+    """
+    if raw is None:
+        return FEED_LIMIT_DEFAULT, None
+    try:
+        limit = int(raw)
+    except (TypeError, ValueError):
+        return None, "Invalid limit"
+    if limit < 1:
+        return None, "limit must be at least 1"
+    return min(limit, MAX_FEED_LIMIT), None
+
+
+def iso_z(dt):
+    """Render a naive-UTC (or UTC-aware) datetime as ISO 8601 ending in 'Z'."""
+    if dt is None:
+        return None
+    try:
+        s = dt.isoformat()
+        # If tzinfo serialized as +00:00, prefer Z. If naive, append Z.
+        if s.endswith("+00:00"):
+            return s.replace("+00:00", "Z")
+        if s.endswith("Z"):
+            return s
+        return s + "Z"
+    except Exception:
+        return None
+
+
+def feed_item(post, now, viewer_tz=None, compact=False):
+    """Build the `schemas.Post` for `post` (a Post or a column row).
+
+    `post` needs `id`, `username`, `message`, `timestamp` and
+    `kindness_points` attributes. With `viewer_tz`, `meta.display` carries
+    the server-computed display object instead of the ISO timestamp.
+
+    `compact` (clients that send ``compact=1``) drops the duplicate `content`
+    and `creation_timestamp` fields, and `meta` unless it carries a
+    server-computed display object.
+    """
+    creation_ts = iso_z(post.timestamp)
+    try:
+        future = bool(post.timestamp and post.timestamp > now)
+    except Exception:
+        future = False
+    display_obj = None
+    if viewer_tz and creation_ts:
+        try:
+            display_obj = format_display_timestamp(str(creation_ts), viewer_tz)
+        except Exception:
+            display_obj = None
+    item = schemas.Post(
+        id=post.id,
+        username=post.username,
+        message=post.message,
+        timestamp=creation_ts,
+        kindness_points=int(getattr(post, "kindness_points", 0) or 0),
+    )
+    if compact:
+        if display_obj is not None:
+            item.meta = schemas.PostMeta(display=display_obj, future=future)
+        return item
+    item.content = post.message
+    item.creation_timestamp = creation_ts
+    item.meta = schemas.PostMeta(
+        display=display_obj if display_obj is not None else creation_ts,
+        future=future,
+    )
+    return item
+
+
+def encode_cursor(post):
+    """Opaque feed cursor pointing just past `post` (see `FEED_ORDER`)."""
+    raw = f"{post.timestamp.isoformat()}|{post.id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Parse an `encode_cursor` value into ``(timestamp, id)``; None if invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        stamp, post_id = raw.decode("ascii").split("|")
+        return datetime.fromisoformat(stamp), int(post_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def after_cursor(position):
+    """Filter selecting feed posts that come after `position` in `FEED_ORDER`."""
+    timestamp, post_id = position
+    return or_(
+        Post.timestamp < timestamp,
+        and_(Post.timestamp == timestamp, Post.id < post_id),
+    )
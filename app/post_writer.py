@@ -0,0 +1,160 @@
+"""
+app/post_writer.py
+
+Optional group-commit pipeline for post creation.
+
+When `ENABLE_POST_BATCHING=1`, `_create_post_impl` hands validated posts to
+a `GroupCommitWriter` instead of committing them one transaction at a time.
+A background thread drains the queue and writes every pending post with one
+multi-row ``INSERT ... RETURNING id, timestamp`` once `max_batch` posts are
+waiting or `max_delay` seconds have passed since the first one arrived,
+whichever comes first. Each request blocks on its own future and still
+returns its real id, so the API contract is unchanged; only the number of
+commits (and fsyncs) per post goes down. A request that gives up waiting
+cancels its future, and the writer drops the row if it has not been sent to
+the database yet, so a retry does not create a duplicate post.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy import insert
+
+from app.models import Post
+
+EXTENSION_KEY = "jeet.post_writer"
+
+
+class GroupCommitWriter:
+    """Batch post inserts from many request threads into shared commits."""
+
+    def __init__(self, engine, max_batch=64, max_delay=0.005, logger=None):
+        self.engine = engine
+        self.max_batch = max(1, int(max_batch))
+        self.max_delay = max(0.0, float(max_delay))
+        self.logger = logger
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stmt = insert(Post).returning(
+            Post.id, Post.timestamp, sort_by_parameter_order=True
+        )
+
+    def submit(self, username, message, timestamp):
+        """Queue a post; the returned future resolves to ``(id, timestamp)``."""
+        self._ensure_started()
+        future = Future()
+        row = {
+            "username": username,
+            "message": message,
+            "timestamp": timestamp,
+            "kindness_points": 0,
+        }
+        self._queue.put((row, future))
+        return future
+
+    def close(self, timeout=5.0):
+        """Flush pending posts and stop the writer thread."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout)
+        self._thread = None
+
+    def _running(self):
+        thread = self._thread
+        return thread is not None and self._pid == os.getpid() and thread.is_alive()
+
+    def _ensure_started(self):
+        # Threads do not survive fork, so (re)start per worker process, and
+        # replace a thread that died
+        if self._running():
+            return
+        with self._lock:
+            if not self._running():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run, name="post-group-commit", daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is None:
+                # Shutdown sentinel: write what we have, then stop
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            self._write(self._collect(first))
+
+    def _write(self, batch):
+        # Skip posts whose request timed out and cancelled its future
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if batch:
+            self._insert(batch)
+
+    def _insert(self, batch):
+        rows = [row for row, _ in batch]
+        try:
+            with self.engine.begin() as conn:
+                results = conn.execute(self._stmt, rows).all()
+        except Exception as exc:
+            if len(batch) == 1:
+                batch[0][1].set_exception(exc)
+                return
+            if self.logger is not None:
+                self.logger.warning(
+                    "Group commit of %d posts failed (%s); retrying singly",
+                    len(batch),
+                    exc,
+                )
+            # Isolate the failing row so one bad post does not fail its peers
+            for item in batch:
+                self._insert([item])
+            return
+        for (_, future), (post_id, timestamp) in zip(batch, results):
+            future.set_result((post_id, timestamp))
+
+
+def get_post_writer(app):
+    """Return the app's writer, or None when batching is disabled."""
+    return app.extensions.get(EXTENSION_KEY)
+
+
+def init_post_writer(app, db, settings):
+    """Create the writer for `app` if `settings.enable_post_batching` is set."""
+    if not settings.enable_post_batching:
+        app.extensions.pop(EXTENSION_KEY, None)
+        return None
+    with app.app_context():
+        engine = db.engine
+    writer = GroupCommitWriter(
+        engine,
+        max_batch=settings.post_batch_size,
+        max_delay=settings.post_batch_delay_ms / 1000.0,
+        logger=app.logger,
+    )
+    app.extensions[EXTENSION_KEY] = writer
+    return writer
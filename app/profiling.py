@@ -0,0 +1,338 @@
+"""
+app/profiling.py
+
+Sampled per-request profiling (`ENABLE_PROFILING=1`).
+
+A request is profiled when:
+
+- a random draw falls under `PROFILE_SAMPLE_RATE` (0.01 = 1% of requests), or
+- it carries ``X-Profile: 1`` together with a valid ``X-Admin-Token``.
+
+While a profiled request runs, one background thread per worker reads its
+Python stack every `PROFILE_INTERVAL_MS` (`sys._current_frames`), so other
+requests only pay for the sampling decision. The stacks are written to
+`PROFILE_DIR` as collapsed stacks (``root;...;leaf count`` per line), which
+speedscope and flamegraph.pl open directly. Each profile also gets a line
+in ``index.jsonl`` with its method, route, path, status, duration and
+sample count. The path keeps only the query parameters in
+`PROFILE_QUERY_PARAMS`, so kindness tokens (``?token=``) never reach
+disk. `jeet profiles` aggregates them per route (`aggregate`).
+
+Only Flask requests are profiled. The ASGI fast paths share one event loop
+thread, so a stack sample there cannot be attributed to a single request.
+"""
+
+import hmac
+import itertools
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from urllib.parse import urlencode
+
+EXTENSION_KEY = "jeet.profiling"
+PROFILE_HEADER = "X-Profile"
+INDEX = "index.jsonl"
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+# Query parameters worth keeping in the index (they change what a feed does)
+PROFILE_QUERY_PARAMS = ("view", "page", "limit", "compact", "tz")
+
+_seq = itertools.count(1)
+
+
+class Sampler:
+    """Samples the stacks of registered threads from one daemon thread."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._active = {}
+        self._thread = None
+        self._pid = None
+
+    def start(self, thread_id):
+        """Begin sampling `thread_id`; returns its (live) stack counter."""
+        counts = Counter()
+        with self._lock:
+            self._active[thread_id] = counts
+            # Threads do not survive a fork; start one per worker process
+            if self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run, name="jeet-profiler", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+        return counts
+
+    def stop(self, thread_id):
+        with self._lock:
+            return self._active.pop(thread_id, None)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                idle = not self._active
+            if idle:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, counts in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        counts[_stack(frame)] += 1
+            del frames
+
+
+@lru_cache(maxsize=None)
+def _short_path(filename):
+    # Relative to the longest sys.path entry: app/routes.py, flask/app.py
+    roots = [
+        p for p in sys.path if p and filename.startswith(p.rstrip(os.sep) + os.sep)
+    ]
+    if not roots:
+        return filename
+    return filename[len(max(roots, key=len).rstrip(os.sep)) + 1 :]  # noqa: E203
+
+
+@lru_cache(maxsize=None)
+def _label(code):
+    name = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+    return name.replace(";", ":")
+
+
+def _stack(frame):
+    labels = []
+    while frame is not None:
+        labels.append(_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+def write_profile(directory, counts, meta):
+    """Write `counts` as collapsed stacks and append `meta` to the index."""
+    os.makedirs(directory, exist_ok=True)
+    name = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{next(_seq)}.folded"
+    with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+        for stack, count in counts.most_common():
+            f.write(f"{';'.join(stack)} {count}\n")
+    # One short O_APPEND write per line, so workers can share the index
+    with open(os.path.join(directory, INDEX), "a", encoding="utf-8") as f:
+        f.write(json.dumps({"file": name, **meta}) + "\n")
+    return name
+
+
+# Flask integration
+
+
+def _should_profile(settings, headers):
+    if headers.get(PROFILE_HEADER) == "1" and settings.admin_token:
+        supplied = headers.get("X-Admin-Token", "").encode("utf-8")
+        if hmac.compare_digest(supplied, settings.admin_token.encode("utf-8")):
+            return "header"
+    rate = settings.profile_sample_rate
+    if rate > 0 and random.random() < rate:
+        return "sampled"
+    return None
+
+
+def _logged_path(request):
+    query = [
+        (name, value)
+        for name in PROFILE_QUERY_PARAMS
+        for value in request.args.getlist(name)
+    ]
+    return request.path + ("?" + urlencode(query) if query else "")
+
+
+def _start_profile():
+    from flask import current_app, g, request
+
+    from app.settings import get_settings
+
+    trigger = _should_profile(get_settings(), request.headers)
+    if trigger is None:
+        return
+    current_app.extensions[EXTENSION_KEY].start(threading.get_ident())
+    g.jeet_profile = (trigger, time.perf_counter())
+
+
+def _finish_profile(response):
+    from flask import current_app, g, request
+
+    from app.settings import get_settings
+
+    profile = g.pop("jeet_profile", None)
+    if profile is None:
+        return response
+    trigger, start = profile
+    sampler = current_app.extensions[EXTENSION_KEY]
+    counts = sampler.stop(threading.get_ident())
+    rule = request.url_rule
+    meta = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "method": request.method,
+        "route": rule.rule if rule is not None else "<unmatched>",
+        "path": _logged_path(request),
+        "status": response.status_code,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+        "samples": sum(counts.values()),
+        "interval_ms": sampler.interval * 1000,
+        "trigger": trigger,
+    }
+    try:
+        write_profile(get_settings().profile_dir, counts, meta)
+    except OSError as exc:
+        current_app.logger.warning(f"Could not write request profile: {exc}")
+    return response
+
+
+def _discard_profile(exc):
+    # after_request is skipped when a response cannot be built
+    from flask import current_app, g
+
+    if g.pop("jeet_profile", None) is not None:
+        current_app.extensions[EXTENSION_KEY].stop(threading.get_ident())
+
+
+def init_profiling(app, settings):
+    """Install the profiling hooks when `ENABLE_PROFILING` is set.
+
+    Registered before the other request hooks, so profiles cover them (and
+    response compression) too. The sample rate and directory are read per
+    request; the sampling interval is fixed at startup.
+    """
+    if not settings.enable_profiling:
+        return None
+    sampler = Sampler(settings.profile_interval_ms / 1000.0)
+    app.extensions[EXTENSION_KEY] = sampler
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_discard_profile)
+    return sampler
+
+
+# Aggregation (`jeet profiles`)
+
+
+def read_stacks(path):
+    counts = Counter()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                counts[stack] += int(count)
+    return counts
+
+
+def load_index(directory, route=None, min_ms=0.0):
+    """Index entries of `directory`, optionally for one route or slower ones."""
+    entries = []
+    try:
+        f = open(os.path.join(directory, INDEX), encoding="utf-8")
+    except FileNotFoundError:
+        return entries
+    with f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by a crash
+            if route is not None and entry["route"] != route:
+                continue
+            if entry["duration_ms"] < min_ms:
+                continue
+            entries.append(entry)
+    return entries
+
+
+def aggregate(directory, route=None, min_ms=0.0):
+    """Merge the profiles in `directory` per ``(method, route)``.
+
+    Returns ``{(method, route): summary}`` where the summary holds the
+    profile count, duration percentiles, the merged stack ``counts`` and
+    ``weights`` (milliseconds, from each profile's sampling interval).
+    """
+    groups = {}
+    for entry in load_index(directory, route, min_ms):
+        path = os.path.join(directory, entry["file"])
+        if not os.path.exists(path):
+            continue
+        group = groups.setdefault(
+            (entry["method"], entry["route"]),
+            {"durations": [], "counts": Counter(), "weights": Counter()},
+        )
+        group["durations"].append(entry["duration_ms"])
+        for stack, count in read_stacks(path).items():
+            group["counts"][stack] += count
+            group["weights"][stack] += count * entry["interval_ms"]
+    for group in groups.values():
+        durations = sorted(group.pop("durations"))
+        group.update(
+            profiles=len(durations),
+            p50_ms=statistics.median(durations),
+            p95_ms=durations[math.ceil(len(durations) * 0.95) - 1],
+            max_ms=durations[-1],
+            samples=sum(group["counts"].values()),
+        )
+    return groups
+
+
+def top_frames(counts, limit=10):
+    """``(frame, self samples, total samples)`` for the busiest frames."""
+    self_counts = Counter()
+    total_counts = Counter()
+    for stack, count in counts.items():
+        frames = stack.split(";")
+        self_counts[frames[-1]] += count
+        for frame in set(frames):
+            total_counts[frame] += count
+    return [
+        (frame, count, total_counts[frame])
+        for frame, count in self_counts.most_common(limit)
+    ]
+
+
+def to_speedscope(name, weights):
+    """A speedscope "sampled" profile document for merged stack `weights`."""
+    frames = {}
+    samples = []
+    for stack in weights:
+        samples.append(
+            [frames.setdefault(frame, len(frames)) for frame in stack.split(";")]
+        )
+    total = sum(weights.values())
+    return {
+        "$schema": SPEEDSCOPE_SCHEMA,
+        "name": name,
+        "exporter": "jeet profiles",
+        "shared": {"frames": [{"name": frame} for frame in frames]},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": total,
+                "samples": samples,
+                "weights": list(weights.values()),
+            }
+        ],
+    }
+
+
+def route_slug(method, route):
+    """File-name-safe ``GET_api_posts_post_id`` for a method and route."""
+    parts = [method] + [p.strip("<>").split(":")[-1] for p in route.split("/") if p]
+    return "_".join(parts) or method
@@ -0,0 +1,141 @@
+"""
+app/ratelimit_storage.py
+
+Process-shared rate limit storage for Flask-Limiter without an external
+service.
+
+Importing this module registers a `limits` storage backend for the
+``sqlite://`` scheme. Counters live in a single SQLite file (WAL journal,
+no fsync) so every gunicorn worker on a host enforces one shared
+`RATE_LIMIT` instead of one limit per worker. Point it at a tmpfs path
+such as ``/dev/shm`` to keep it in shared memory::
+
+    RATELIMIT_STORAGE_URI=sqlite:////dev/shm/jeet-ratelimit.db
+
+Each counter update is a single atomic upsert, so no cross-process locking
+beyond SQLite's own write lock is needed. Only the fixed-window strategy
+(Flask-Limiter's default) is supported.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from limits.storage import Storage
+
+# Expired rows are purged every N increments per process
+_PURGE_EVERY = 1000
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS ratelimit ("
+    " key TEXT PRIMARY KEY,"
+    " count INTEGER NOT NULL,"
+    " expiry REAL NOT NULL"
+    ") WITHOUT ROWID"
+)
+_UPSERT = (
+    "INSERT INTO ratelimit (key, count, expiry) VALUES (?1, ?2, ?3) "
+    "ON CONFLICT(key) DO UPDATE SET "
+    "count = CASE WHEN expiry <= ?4 THEN excluded.count "
+    "ELSE count + excluded.count END, "
+    "expiry = CASE WHEN expiry <= ?4 THEN excluded.expiry ELSE expiry END"
+)
+
+
+class SQLiteStorage(Storage):
+    """Fixed-window counters in a SQLite file shared by local processes.
+
+    URI forms: ``sqlite:////abs/path.db``, ``sqlite:///relative.db`` or
+    ``sqlite://`` (process-private in-memory database, for tests).
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri="sqlite://", wrap_exceptions=False, **options):
+        path = uri.split("://", 1)[1] if "://" in uri else uri
+        path = path[1:] if path.startswith("/") else path
+        self.path = path or ":memory:"
+        self.timeout = float(options.get("timeout", 5.0))
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._incr_calls = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _conn(self):
+        # Connections must not cross a fork (e.g. gunicorn --preload)
+        if self._pid != os.getpid():
+            self._local = threading.local()
+            self._pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            if self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            # Counters are disposable; skip fsync on every write
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def incr(self, key, expiry, elastic_expiry=False, amount=1):
+        """Increment `key` by `amount`, starting a new window if expired."""
+        now = time.time()
+        conn = self._conn()
+        params = (key, amount, now + expiry, now)
+        if _HAS_RETURNING:
+            count = conn.execute(_UPSERT + " RETURNING count", params).fetchone()[0]
+        else:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(_UPSERT, params)
+                count = conn.execute(
+                    "SELECT count FROM ratelimit WHERE key = ?", (key,)
+                ).fetchone()[0]
+        self._incr_calls += 1
+        if self._incr_calls % _PURGE_EVERY == 0:
+            conn.execute("DELETE FROM ratelimit WHERE expiry <= ?", (now,))
+        return count
+
+    def get(self, key):
+        row = (
+            self._conn()
+            .execute(
+                "SELECT count FROM ratelimit WHERE key = ? AND expiry > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = (
+            self._conn()
+            .execute(
+                "SELECT expiry FROM ratelimit WHERE key = ? AND expiry > ?",
+                (key, now),
+            )
+            .fetchone()
+        )
+        return row[0] if row else now
+
+    def check(self):
+        try:
+            self._conn().execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self._conn().execute("DELETE FROM ratelimit").rowcount
+
+    def clear(self, key):
+        self._conn().execute("DELETE FROM ratelimit WHERE key = ?", (key,))
@@ -0,0 +1,95 @@
+"""
+app/replicas.py
+
+Read-replica routing for read-only endpoints.
+
+When `DATABASE_REPLICA_URL` is set, the replica is registered as the
+``replica`` SQLAlchemy bind. Views decorated with `@read_replica` (the feed,
+single post and kindness count endpoints) then run their queries there;
+flushes and every other view still use the primary.
+
+Read-your-writes: any successful POST/PUT/PATCH/DELETE sets a short-lived
+``jeet_ryw`` cookie (`READ_YOUR_WRITES_SECONDS`, default 5). While it is
+present, that client's reads stay on the primary, so a user who just posted
+or redeemed a token sees the change despite replication lag. The cookie
+only ever moves reads to the primary, so a forged one costs nothing.
+"""
+
+import time
+from functools import wraps
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = "replica"
+RYW_COOKIE = "jeet_ryw"
+_WRITE_METHODS = frozenset(("POST", "PUT", "PATCH", "DELETE"))
+
+
+class RoutingSession(Session):
+    """Session that sends reads inside `@read_replica` views to the replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and has_request_context()
+            and g.get("jeet_read_replica")
+        ):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def wrote_recently(cookie_value, now=None):
+    """True if a read-your-writes cookie value has not expired yet."""
+    if not cookie_value:
+        return False
+    try:
+        return float(cookie_value) > (now or time.time())
+    except ValueError:
+        return False
+
+
+def read_replica(view):
+    """Route the view's queries to the replica unless the client just wrote."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if REPLICA_BIND in current_app.config.get("SQLALCHEMY_BINDS", {}):
+            g.jeet_read_replica = not wrote_recently(request.cookies.get(RYW_COOKIE))
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def _mark_write(response):
+    if request.method in _WRITE_METHODS and response.status_code < 400:
+        from app.settings import get_settings
+
+        window = get_settings().read_your_writes_seconds
+        response.set_cookie(
+            RYW_COOKIE,
+            str(int(time.time() + window)),
+            max_age=window,
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+def configure_replica(app, settings, engine_options):
+    """Register the replica bind (call before `db.init_app`)."""
+    if not settings.database_replica_url:
+        return False
+    binds = app.config.setdefault("SQLALCHEMY_BINDS", {})
+    binds.setdefault(
+        REPLICA_BIND,
+        {
+            "url": settings.database_replica_url,
+            **engine_options(settings, settings.database_replica_url),
+        },
+    )
+    app.after_request(_mark_write)
+    return True
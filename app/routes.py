@@ -6,92 +6,87 @@ Handles static files, feed, and post creation with moderation
 and rate limiting.
 """
 
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app
 from app import db, limiter
+from app import db_pool, exporter, post_service, schemas
+from app.assets import send_asset
 from app.models import Post, KindnessVote
+from app.post_writer import get_post_writer
+from app.replicas import read_replica
+from app.settings import get_settings, reload_settings
 from app.utils import (
     generate_username,
-    is_hate_speech,
     generate_kindness_token,
     verify_kindness_token,
     hash_token_for_storage,
-    format_display_timestamp,
 )
-import os
+import hmac
+import json
+import logging
+from collections.abc import Mapping
+from urllib.parse import parse_qs
 
 bp = Blueprint("routes", __name__)
 
 # Kindness Points API Endpoints
 
 
+def _kindness_params(*names):
+    """Extract `names` from the request body or query string in a single pass.
+
+    The body is read once and decoded as a form (for form content types),
+    JSON, or a query-string encoded payload, in that order. Query string
+    arguments fill in any field the body does not provide. Debug details are
+    only built when the app logger is enabled for DEBUG.
+    """
+    data = None
+    if request.mimetype in ("application/x-www-form-urlencoded", "multipart/form-data"):
+        data = request.form
+    else:
+        raw = request.get_data(cache=True)
+        if raw:
+            try:
+                data = json.loads(raw)
+            except ValueError:
+                data = {
+                    k: v[0] for k, v in parse_qs(raw.decode("utf-8", "replace")).items()
+                }
+    if not isinstance(data, Mapping):
+        data = {}
+    params = {}
+    for name in names:
+        value = data.get(name)
+        if value is None:
+            value = request.args.get(name)
+        if value is not None:
+            params[name] = value
+    logger = current_app.logger
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "[KINDNESS-SERVER] %s %s content_type=%r body_bytes=%d params=%s",
+            request.method,
+            request.path,
+            request.mimetype,
+            request.content_length or 0,
+            sorted(params),
+        )
+    return params
+
+
+def _kindness_enabled():
+    return get_settings().enable_kindness_points
+
+
 @bp.route("/api/kindness/token", methods=["POST"])
 def issue_kindness_token():
-    # Debug: log incoming request headers/raw body for troubleshooting
-    try:
-        current_app.logger.debug(f"[KINDNESS] Headers: {dict(request.headers)}")
-        raw_body = request.get_data(as_text=True)
-        if raw_body:
-            current_app.logger.debug(f"[KINDNESS] Raw body: {raw_body}")
-    except Exception:
-        current_app.logger.debug("[KINDNESS] Failed to log incoming request body")
-
     """Issue a new kindness token for a specific post."""
-    if not os.getenv("ENABLE_KINDNESS_POINTS", "0") == "1":
-        try:
-            val = os.getenv("ENABLE_KINDNESS_POINTS", "0")
-            current_app.logger.debug(f"[KINDNESS-SERVER] ENABLE_KINDNESS_POINTS={val}")
-        except Exception:
-            pass
+    if not _kindness_enabled():
         return jsonify({"error": "Feature disabled"}), 404
 
-    # Accept JSON, form-encoded, or raw bodies
-    def _parse_request_json():
-        data = None
-        try:
-            if request.is_json:
-                data = request.get_json(silent=True)
-            if not data and request.form:
-                data = request.form.to_dict()
-            if not data:
-                raw = request.get_data(as_text=True)
-                if raw:
-                    try:
-                        import json as _json
-
-                        data = _json.loads(raw)
-                    except Exception:
-                        # Try parsing as query-string format
-                        from urllib.parse import parse_qs
-
-                        parsed = parse_qs(raw)
-                        if parsed:
-                            data = {k: v[0] for k, v in parsed.items()}
-        except Exception:
-            data = None
-        return data
-
-    data = _parse_request_json()
-    # Fallback: accept post_id from query string
-    if not data or "post_id" not in data:
-        post_id_arg = request.args.get("post_id")
-        if post_id_arg:
-            data = {"post_id": post_id_arg}
-        else:
-            # Print debugging information to stdout so Playwright captures it
-            try:
-                current_app.logger.debug(
-                    f"[KINDNESS-SERVER] Headers: {dict(request.headers)}"
-                )
-                raw_body = request.get_data(as_text=True)
-                if raw_body:
-                    current_app.logger.debug(f"[KINDNESS-SERVER] Raw body: {raw_body}")
-            except Exception:
-                current_app.logger.debug(
-                    "[KINDNESS-SERVER] Failed to dump request body"
-                )
-            return jsonify({"error": "Missing post_id"}), 400
-
-    post_id = data["post_id"]
+    params = _kindness_params("post_id")
+    if "post_id" not in params:
+        return jsonify({"error": "Missing post_id"}), 400
+    post_id = params["post_id"]
 
     # Verify post exists
     post = db.session.get(Post, post_id)
@@ -100,92 +95,61 @@ def issue_kindness_token():
 
     try:
         token = generate_kindness_token(post_id)
-        return jsonify({"token": token, "expires_in": 300}), 200  # 5 minutes
+        return schemas.respond(schemas.KindnessToken(token=token, expires_in=300))
     except Exception as exc:
         current_app.logger.error(f"Token generation failed: {exc}")
         return jsonify({"error": "Token generation failed"}), 500
 
 
-@bp.route("/api/kindness/redeem", methods=["POST"])
-def redeem_kindness_token():
-    # Debug: log incoming request headers/raw body for troubleshooting
+KINDNESS_TOKEN_BATCH_LIMIT = post_service.KINDNESS_TOKEN_BATCH_LIMIT
+
+
+@bp.route("/api/kindness/tokens", methods=["POST"])
+def issue_kindness_tokens():
+    """Issue kindness tokens for several posts in one round trip.
+
+    Body: ``{"post_ids": [1, 2, 3]}`` (or ``?post_ids=1,2,3``). Post existence
+    is checked with a single ``IN`` query; unknown ids are reported under
+    ``missing`` instead of failing the whole batch.
+    """
+    if not _kindness_enabled():
+        return jsonify({"error": "Feature disabled"}), 404
+
+    data = request.get_json(silent=True) or {}
+    raw_ids = data.get("post_ids") if isinstance(data, dict) else None
+    if raw_ids is None and request.args.get("post_ids"):
+        raw_ids = [s for s in request.args["post_ids"].split(",") if s.strip()]
+    post_ids, error = post_service.parse_post_ids(raw_ids)
+    if error:
+        return jsonify({"error": error}), 400
+
+    existing = post_service.existing_post_ids(post_ids, session=db.session)
     try:
-        current_app.logger.debug(f"[KINDNESS] Headers: {dict(request.headers)}")
-        raw_body = request.get_data(as_text=True)
-        if raw_body:
-            current_app.logger.debug(f"[KINDNESS] Raw body: {raw_body}")
-    except Exception:
-        current_app.logger.debug("[KINDNESS] Failed to log incoming request body")
+        tokens = {
+            str(pid): generate_kindness_token(pid)
+            for pid in post_ids
+            if pid in existing
+        }
+    except Exception as exc:
+        current_app.logger.error(f"Batch token generation failed: {exc}")
+        return jsonify({"error": "Token generation failed"}), 500
+    missing = [pid for pid in post_ids if pid not in existing]
+    return schemas.respond(
+        schemas.KindnessTokens(tokens=tokens, missing=missing, expires_in=300)
+    )
+
 
+@bp.route("/api/kindness/redeem", methods=["POST"])
+def redeem_kindness_token():
     """Redeem token to award kindness point to a post."""
-    if not os.getenv("ENABLE_KINDNESS_POINTS", "0") == "1":
-        try:
-            val = os.getenv("ENABLE_KINDNESS_POINTS", "0")
-            current_app.logger.debug(f"[KINDNESS-SERVER] ENABLE_KINDNESS_POINTS={val}")
-        except Exception:
-            pass
+    if not _kindness_enabled():
         return jsonify({"error": "Feature disabled"}), 404
-    # Tolerant parsing similar to token issuance
-    try:
-        data = request.get_json(silent=True)
-    except Exception:
-        data = None
-    if not data:
-        # Try form or raw
-        if request.form:
-            data = request.form.to_dict()
-        else:
-            raw = request.get_data(as_text=True)
-            try:
-                import json as _json
 
-                data = _json.loads(raw) if raw else None
-            except Exception:
-                data = None
-    # Debug: print args and preliminary parsed data
-    try:
-        current_app.logger.debug(
-            f"[KINDNESS-SERVER] request.args: {dict(request.args)}"
-        )
-        current_app.logger.debug(
-            f"[KINDNESS-SERVER] parsed data before fallback: {data}"
-        )
-    except Exception:
-        pass
-    # Accept post_id/token from query string as fallback
-    # (e.g., client may send them in the URL)
-    if not data or "post_id" not in data or "token" not in data:
-        post_id_arg = request.args.get("post_id")
-        token_arg = request.args.get("token")
-        try:
-            current_app.logger.debug(
-                f"[KINDNESS-SERVER] fallback args - post_id_arg: {post_id_arg} "
-                f"token_arg present? {bool(token_arg)}"
-            )
-        except Exception:
-            pass
-        if post_id_arg and token_arg:
-            data = {"post_id": post_id_arg, "token": token_arg}
-        else:
-            try:
-                current_app.logger.debug(
-                    f"[KINDNESS-SERVER] Headers: {dict(request.headers)}"
-                )
-                raw = request.get_data(as_text=True)
-                if raw:
-                    current_app.logger.debug(f"[KINDNESS-SERVER] Raw body: {raw}")
-            except Exception:
-                current_app.logger.debug(
-                    "[KINDNESS-SERVER] Failed to dump request body"
-                )
-            return jsonify({"error": "Missing post_id or token"}), 400
-    # Debug: final data used for redeem
-    try:
-        current_app.logger.debug(f"[KINDNESS-SERVER] final redeem data: {data}")
-    except Exception:
-        pass
-    post_id = data["post_id"]
-    token_string = data["token"]
+    params = _kindness_params("post_id", "token")
+    if "post_id" not in params or "token" not in params:
+        return jsonify({"error": "Missing post_id or token"}), 400
+    post_id = params["post_id"]
+    token_string = params["token"]
     # Verify token
     nonce = verify_kindness_token(token_string)
     if not nonce:
@@ -215,7 +179,9 @@ def redeem_kindness_token():
         db.session.flush()
         post.kindness_points += 1
         db.session.commit()
-        return jsonify({"success": True, "new_points": post.kindness_points}), 200
+        return schemas.respond(
+            schemas.KindnessResult(success=True, new_points=post.kindness_points)
+        )
     except Exception as e:
         import traceback
 
@@ -256,39 +222,47 @@ def redeem_kindness_token():
 
 
 @bp.route("/api/posts/<int:post_id>/kindness", methods=["GET"])
+@read_replica
 def get_post_kindness(post_id):
     """Get kindness points for a specific post."""
     post = db.session.get(Post, post_id)
     if not post:
         return jsonify({"error": "Post not found"}), 404
-    return jsonify({"kindness_points": post.kindness_points}), 200
+    return schemas.respond(schemas.KindnessCount(kindness_points=post.kindness_points))
 
 
 @bp.route("/")
 def index():
-    # Use Flask's configured static file serving to avoid working-directory issues
-    return current_app.send_static_file("index.html")
+    # The built index.html when STATIC_DIST is on, else app/static/index.html
+    return send_asset("index.html")
 
 
 @bp.route("/static/<path:path>")
 def static_files(path):
-    # Delegate to Flask's static file handler which uses `current_app.static_folder`.
-    return current_app.send_static_file(path)
+    # Hashed build files when STATIC_DIST is on, else `current_app.static_folder`
+    return send_asset(path)
 
 
 @bp.route("/api/posts", methods=["GET"])
+@read_replica
 def get_posts():
     """
     GET /api/posts
     Returns either a simple list of post items (when no paging params are present)
     or a paginated object with `posts`, `total_count`, `page`, `limit`, and `has_more`.
 
+    With `cursor` (empty for the first page) the latest feed is paged by keyset
+    instead: the response has `posts`, `limit`, `has_more` and `next_cursor`,
+    and skips the total count, so deep pages cost the same as the first.
+
     The individual post items include both legacy and canonical fields to support
     existing tests and new contract/TDD tests:
       - id, username, message, content
       - timestamp, creation_timestamp (ISO 8601 UTC ending with 'Z')
       - kindness_points
       - meta: { display: str, future: bool }
+    With `compact=1` only id, username, message, timestamp and kindness_points
+    are sent (plus `meta` when `tz` is given).
     """
     from datetime import datetime
 
@@ -301,7 +275,16 @@ def get_posts():
         "page" in request.args or "limit" in request.args or "since" in request.args
     )
     page = int(request.args.get("page", 1))
-    limit = int(request.args.get("limit", 50))
+    limit, error = post_service.parse_feed_limit(request.args.get("limit"))
+    if error:
+        return jsonify({"error": error}), 400
+    cursor = request.args.get("cursor")
+    position = None
+    if cursor:
+        position = post_service.decode_cursor(cursor)
+        if position is None:
+            return jsonify({"error": "Invalid cursor"}), 400
+    next_cursor = None
     query = Post.query
     if since:
         try:
@@ -317,13 +300,11 @@ def get_posts():
     view = request.args.get("view", "latest")
     import time
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
         if view == "top":
             # Use the post_service DB-backed path to get top posts
             try:
-                from app import post_service
-
                 posts = post_service.top_posts(
                     session=db.session, limit=limit, window_hours=24
                 )
@@ -333,6 +314,14 @@ def get_posts():
                 # Fallback to empty list on error
                 posts = []
                 total_count = 0
+        elif cursor is not None:
+            if position is not None:
+                query = query.filter(post_service.after_cursor(position))
+            posts = query.order_by(*post_service.FEED_ORDER).limit(limit + 1).all()
+            if len(posts) > limit:
+                posts = posts[:limit]
+                next_cursor = post_service.encode_cursor(posts[-1])
+            total_count = None
         else:
             total_count = query.count()
             posts = (
@@ -342,83 +331,79 @@ def get_posts():
                 .all()
             )
 
-        latency = time.time() - start_time
+        latency = time.perf_counter() - start_time
         current_app.logger.info(
             f"GET /api/posts view={view} count={len(posts)} " f"latency={latency:.3f}s"
         )
     except Exception as e:
-        latency = time.time() - start_time
+        latency = time.perf_counter() - start_time
         current_app.logger.error(f"Error in GET /api/posts: {e} latency={latency:.3f}s")
         raise
 
-    def _iso_z(dt):
-        if dt is None:
-            return None
-        try:
-            s = dt.isoformat()
-            # If tzinfo serialized as +00:00, prefer Z. If naive, append Z.
-            if s.endswith("+00:00"):
-                return s.replace("+00:00", "Z")
-            if s.endswith("Z"):
-                return s
-            return s + "Z"
-        except Exception:
-            return None
-
     now = datetime.utcnow()
-    items = []
-    for p in posts:
-        creation_ts = _iso_z(p.timestamp)
-        try:
-            future = bool(p.timestamp and p.timestamp > now)
-        except Exception:
-            future = False
-        # If client supplies a `tz` query param, compute a server-side
-        # human-friendly display object using format_display_timestamp so
-        # tests can assert deterministic display output. Otherwise fall back to
-        # canonical UTC ISO string to preserve backward compatibility.
-        viewer_tz = request.args.get("tz")
-        display_obj = None
-        if viewer_tz and creation_ts:
-            try:
-                display_obj = format_display_timestamp(str(creation_ts), viewer_tz)
-            except Exception:
-                display_obj = None
-        items.append(
-            {
-                "id": p.id,
-                "username": p.username,
-                "message": p.message,
-                "content": p.message,
-                "timestamp": creation_ts,
-                "creation_timestamp": creation_ts,
-                "kindness_points": int(getattr(p, "kindness_points", 0) or 0),
-                "meta": {
-                    "display": display_obj if display_obj is not None else creation_ts,
-                    "future": future,
-                },
-            }
-        )
+    # If client supplies a `tz` query param, compute a server-side
+    # human-friendly display object using format_display_timestamp so
+    # tests can assert deterministic display output. Otherwise fall back to
+    # canonical UTC ISO string to preserve backward compatibility.
+    viewer_tz = request.args.get("tz")
+    compact = request.args.get("compact") == "1"
+    items = [post_service.feed_item(p, now, viewer_tz, compact) for p in posts]
 
     # When client did not ask for paging, return a flat list for easier
     # consumption in newer clients. Otherwise, preserve the legacy paginated
     # object shape.
+    if cursor is not None and view != "top":
+        return schemas.respond(
+            schemas.CursorPage(
+                posts=items,
+                limit=limit,
+                has_more=next_cursor is not None,
+                next_cursor=next_cursor,
+            )
+        )
     if not has_paging:
-        return jsonify(items)
-
-    has_more = (page * limit) < total_count
-    return jsonify(
-        {
-            "posts": items,
-            "total_count": total_count,
-            "page": page,
-            "limit": limit,
-            "has_more": has_more,
-        }
+        return schemas.respond(items)
+
+    return schemas.respond(
+        schemas.PostPage(
+            posts=items,
+            total_count=total_count,
+            page=page,
+            limit=limit,
+            has_more=(page * limit) < total_count,
+        )
     )
 
 
+@bp.route("/api/posts/export", methods=["GET"])
+def export_posts():
+    """
+    GET /api/posts/export
+    Stream every post as NDJSON (one JSON object per line) in id order.
+
+    Query params:
+      - since / until: ISO 8601 or epoch-seconds bounds on `timestamp`
+        (`since` inclusive, `until` exclusive)
+      - after_id: resume after this post id
+
+    Reads the whole table, so it needs `ADMIN_TOKEN` sent as `X-Admin-Token`
+    like the `/_admin` endpoints (404 when no token is configured).
+    """
+    denied = _admin_denied()
+    if denied is not None:
+        return denied
+    try:
+        since = exporter.parse_bound(request.args.get("since"))
+        until = exporter.parse_bound(request.args.get("until"))
+        after_id = int(request.args.get("after_id", 0))
+    except (TypeError, ValueError, OverflowError, OSError):
+        return jsonify({"error": "Invalid since, until or after_id"}), 400
+    body = exporter.iter_ndjson(db.engine, since=since, until=until, after_id=after_id)
+    return Response(body, mimetype="application/x-ndjson")
+
+
 @bp.route("/api/posts/<int:post_id>", methods=["GET"])
+@read_replica
 def get_post(post_id):
     """Return a single post by id with canonical fields and meta."""
     from datetime import datetime as _dt
@@ -427,45 +412,13 @@ def get_post(post_id):
     if not post:
         return jsonify({"error": "Not found"}), 404
 
-    def _iso_z(dt):
-        if dt is None:
-            return None
-        s = dt.isoformat()
-        if s.endswith("+00:00"):
-            return s.replace("+00:00", "Z")
-        if s.endswith("Z"):
-            return s
-        return s + "Z"
-
-    creation_ts = _iso_z(post.timestamp)
-    try:
-        now = _dt.utcnow()
-        future = bool(post.timestamp and post.timestamp > now)
-    except Exception:
-        future = False
+    # Same schema as feed items; `tz` adds the server-computed display object
+    item = post_service.feed_item(post, _dt.utcnow(), request.args.get("tz"))
+    return schemas.respond(item)
 
-    # Support optional `tz` query param for server-computed display fields
-    viewer_tz = request.args.get("tz")
-    display_obj = None
-    if viewer_tz:
-        try:
-            display_obj = format_display_timestamp(str(creation_ts), viewer_tz)
-        except Exception:
-            display_obj = None
-
-    return jsonify(
-        {
-            "id": post.id,
-            "username": post.username,
-            "message": post.message,
-            "content": post.message,
-            "creation_timestamp": creation_ts,
-            "meta": {
-                "display": display_obj if display_obj is not None else creation_ts,
-                "future": future,
-            },
-        }
-    )
+
+# Seconds a request waits for the group-commit writer before giving up
+POST_WRITE_TIMEOUT = 10
 
 
 def _create_post_impl():
@@ -478,23 +431,11 @@ def _create_post_impl():
     """
     data = request.get_json() or {}
     # Support both `message` (legacy) and `content` (new tests)
-    message = (data.get("message") or data.get("content") or "").strip()
-    if not message:
-        return jsonify({"error": "Message required"}), 400
-    if len(message) > 280:
-        return jsonify({"error": "Message exceeds 280 character limit"}), 400
-    is_hate, reason, details = is_hate_speech(message)
-    if is_hate:
-        return (
-            jsonify(
-                {
-                    "error": (
-                        f"Hateful content not allowed (detected by {reason}: {details})"
-                    )
-                }
-            ),
-            403,
-        )
+    message, error, status = post_service.check_message(
+        data.get("message") or data.get("content")
+    )
+    if error:
+        return jsonify({"error": error}), status
     username = generate_username()
 
     # Server canonical timestamp: always use server UTC time for creation.
@@ -504,47 +445,31 @@ def _create_post_impl():
     post_kwargs["timestamp"] = _dt.utcnow()
 
     post = Post(**post_kwargs)
-    db.session.add(post)
-    try:
-        db.session.commit()
-    except Exception as e:
-        current_app.logger.error(f"DB commit failed: {e}")
-        db.session.rollback()
-        return jsonify({"error": "Database error. Please try again later."}), 500
-
-    # Prepare canonical response
-    def _iso_z(dt):
-        if dt is None:
-            return None
-        s = dt.isoformat()
-        if s.endswith("+00:00"):
-            return s.replace("+00:00", "Z")
-        if s.endswith("Z"):
-            return s
-        return s + "Z"
-
-    creation_ts_out = _iso_z(post.timestamp)
-    try:
-        from datetime import datetime as _dt
+    writer = get_post_writer(current_app)
+    if writer is not None:
+        # Group-commit mode: the writer thread inserts this post together with
+        # other pending posts and hands back the real id and timestamp.
+        future = writer.submit(**post_kwargs)
+        try:
+            post.id, post.timestamp = future.result(timeout=POST_WRITE_TIMEOUT)
+        except Exception as e:
+            # Drop the row if it is still queued, so a retry is not a duplicate
+            future.cancel()
+            current_app.logger.error(f"Group commit failed: {e}")
+            return jsonify({"error": "Database error. Please try again later."}), 500
+    else:
+        db.session.add(post)
+        try:
+            db.session.commit()
+        except Exception as e:
+            current_app.logger.error(f"DB commit failed: {e}")
+            db.session.rollback()
+            return (
+                jsonify({"error": "Database error. Please try again later."}),
+                500,
+            )
 
-        now = _dt.utcnow()
-        future_flag = bool(post.timestamp and post.timestamp > now)
-    except Exception:
-        future_flag = False
-
-    return (
-        jsonify(
-            {
-                "id": post.id,
-                "username": post.username,
-                "message": post.message,
-                "content": post.message,
-                "creation_timestamp": creation_ts_out,
-                "meta": {"display": creation_ts_out, "future": future_flag},
-            }
-        ),
-        201,
-    )
+    return schemas.respond(post_service.feed_item(post, _dt.utcnow()), 201)
 
 
 # Dynamically apply rate limiting if enabled
@@ -559,24 +484,66 @@ def create_post():
 def debug_flags():
     """Return a small set of non-secret runtime flags for local debugging.
     This endpoint is disabled in production or if `DISABLE_DEBUG_FLAGS` is set.
+    Values come from the startup settings snapshot, not the live environment.
+    """
+    settings = get_settings()
+    if not settings.debug_flags_enabled:
+        return jsonify({"error": "Not available"}), 404
+    return jsonify({"flags": settings.public_flags()}), 200
+
+
+def _admin_denied():
+    """Return an error response unless the request carries `ADMIN_TOKEN`.
+
+    Admin endpoints answer 404 when no token is configured, 403 on mismatch.
     """
-    if (
-        os.getenv("FLASK_ENV") == "production"
-        or os.getenv("DISABLE_DEBUG_FLAGS", "0") == "1"
-    ):
+    expected = get_settings().admin_token
+    if not expected:
         return jsonify({"error": "Not available"}), 404
-    keys = ["ENABLE_KINDNESS_POINTS", "RATE_LIMIT", "FLASK_ENV"]
-    flags = {k: os.getenv(k) for k in keys}
-    return jsonify({"flags": flags}), 200
+    supplied = request.headers.get("X-Admin-Token", "")
+    if not hmac.compare_digest(supplied.encode("utf-8"), expected.encode("utf-8")):
+        return jsonify({"error": "Forbidden"}), 403
+    return None
+
+
+@bp.route("/_admin/config/reload", methods=["POST"])
+def admin_reload_config():
+    """Re-read environment settings for this worker process.
+
+    Requires `ADMIN_TOKEN` to be configured and sent as `X-Admin-Token`;
+    the endpoint does not exist otherwise. Each gunicorn worker holds its own
+    snapshot, so a full rollout still needs a reload per worker (or a HUP).
+    """
+    denied = _admin_denied()
+    if denied is not None:
+        return denied
+    settings = reload_settings(current_app._get_current_object())
+    current_app.logger.info("Runtime settings reloaded via admin hook")
+    return jsonify({"flags": settings.public_flags()}), 200
+
+
+@bp.route("/_admin/pool", methods=["GET"])
+def admin_pool_stats():
+    """Connection pool gauges and checkout wait counters for this worker.
+
+    Same `X-Admin-Token` requirement as the config reload hook.
+    """
+    denied = _admin_denied()
+    if denied is not None:
+        return denied
+    return jsonify(db_pool.pool_stats(db.engine)), 200
+
 
+def _rate_limit():
+    # Callable limit so reloaded settings apply without re-registering routes
+    return get_settings().rate_limit
 
-RATE_LIMIT = os.environ.get("RATE_LIMIT", "1/minute")
 
 if limiter is not None:
     bp.add_url_rule(
         "/api/posts",
         view_func=limiter.shared_limit(
-            RATE_LIMIT,
+            _rate_limit,
             scope="post",
             deduct_when=lambda response: response.status_code == 201,
             error_message=(
@@ -0,0 +1,230 @@
+"""
+app/schemas.py
+
+Typed response schemas shared by the Flask views and the ASGI fast paths.
+
+Each schema is declared once with type annotations. With the optional
+``msgspec`` package installed (``pip install -e .[fast]``) the classes are
+`msgspec.Struct` types, encoded by msgspec's compiled JSON encoder and
+validated by its decoder. Without it they are plain dataclasses encoded
+through `app/json_provider.py` and validated by a small checker covering the
+annotations used here.
+
+Fields whose default is None are left out of the JSON when unset (compact
+feed items); a field without a default is always written, even as null.
+Timestamps are pre-rendered ISO 8601 UTC strings ending in ``Z`` so every
+codec writes them identically.
+"""
+
+import json
+import time
+import typing
+from dataclasses import MISSING, dataclass, fields
+from typing import Any, Dict, List, Optional, Union
+
+from app import metrics
+
+try:
+    import msgspec
+except ImportError:  # optional: dataclasses + app/json_provider.py
+    msgspec = None
+
+
+if msgspec is not None:
+    ValidationError = msgspec.ValidationError
+
+    class Schema(msgspec.Struct, omit_defaults=True):
+        """Base class for response schemas (a msgspec Struct)."""
+
+else:
+
+    class ValidationError(ValueError):
+        """A payload does not match its schema."""
+
+    class Schema:
+        """Base class for response schemas (a dataclass without msgspec)."""
+
+        def __init_subclass__(cls, **kwargs):
+            super().__init_subclass__(**kwargs)
+            dataclass(cls)
+            cls.__schema_fields__ = tuple(
+                (f.name, f.default is not MISSING, f.default) for f in fields(cls)
+            )
+
+
+class PostMeta(Schema):
+    # The ISO timestamp, or the display object computed for `tz`
+    display: Union[str, Dict[str, Any], None]
+    future: bool
+
+
+class Post(Schema):
+    id: int
+    username: str
+    message: str
+    timestamp: Optional[str]
+    kindness_points: int
+    # Legacy duplicates and meta, omitted in compact mode
+    content: Optional[str] = None
+    creation_timestamp: Optional[str] = None
+    meta: Optional[PostMeta] = None
+
+
+class PostPage(Schema):
+    """Offset-paged feed (`page`/`limit`/`since`)."""
+
+    posts: List[Post]
+    total_count: int
+    page: int
+    limit: int
+    has_more: bool
+
+
+class CursorPage(Schema):
+    """Keyset-paged feed (`cursor`)."""
+
+    posts: List[Post]
+    limit: int
+    has_more: bool
+    next_cursor: Optional[str]
+
+
+class KindnessToken(Schema):
+    token: str
+    expires_in: int
+
+
+class KindnessTokens(Schema):
+    tokens: Dict[str, str]
+    missing: List[int]
+    expires_in: int
+
+
+class KindnessResult(Schema):
+    success: bool
+    new_points: int
+
+
+class KindnessCount(Schema):
+    kindness_points: int
+
+
+# Encoding
+
+if msgspec is not None:
+    _encoder = msgspec.json.Encoder()
+
+
+def to_builtins(obj):
+    """Schemas (and lists/dicts of them) as plain dicts/lists."""
+    if msgspec is not None:
+        return msgspec.to_builtins(obj)
+    if isinstance(obj, Schema):
+        out = {}
+        for name, has_default, default in obj.__schema_fields__:
+            value = getattr(obj, name)
+            if has_default and value == default:
+                continue
+            if isinstance(value, (Schema, list, dict)):
+                value = to_builtins(value)
+            out[name] = value
+        return out
+    if isinstance(obj, list):
+        return [to_builtins(v) for v in obj]
+    if isinstance(obj, dict):
+        return {k: to_builtins(v) for k, v in obj.items()}
+    return obj
+
+
+def encode(obj, backend="auto"):
+    """JSON bytes for a schema, a list of schemas or plain JSON data."""
+    start = time.perf_counter()
+    if msgspec is not None:
+        body = _encoder.encode(obj)
+    else:
+        from app.json_provider import dumps
+
+        body = dumps(to_builtins(obj), backend)
+    metrics.observe_serialization(obj, time.perf_counter() - start)
+    return body
+
+
+def respond(obj, status=200):
+    """Flask response for `obj` (see `encode`)."""
+    from flask import current_app
+
+    body = encode(obj, current_app.json.backend)
+    return current_app.response_class(body, status, mimetype="application/json")
+
+
+# Validation
+
+
+def decode(data, type):
+    """Parse JSON `data` and validate it against `type` (e.g. ``List[Post]``)."""
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(data, type=type)
+        except ValidationError:
+            raise
+        except msgspec.DecodeError as exc:
+            # Malformed JSON; only schema mismatches are a ValidationError
+            raise ValidationError(f"Invalid JSON: {exc}") from None
+    try:
+        obj = json.loads(data)
+    except ValueError as exc:
+        raise ValidationError(f"Invalid JSON: {exc}") from None
+    return _convert(obj, type, "$")
+
+
+_SCALARS = {int: (int,), float: (int, float), str: (str,), bool: (bool,)}
+
+
+def _convert(value, tp, path):
+    if tp is Any:
+        return value
+    if tp is type(None):
+        if value is not None:
+            raise ValidationError(f"Expected `null`, got `{value!r}` - at `{path}`")
+        return None
+    origin = typing.get_origin(tp)
+    if origin is Union:
+        for option in typing.get_args(tp):
+            try:
+                return _convert(value, option, path)
+            except ValidationError:
+                continue
+        raise ValidationError(f"Expected `{tp}`, got `{value!r}` - at `{path}`")
+    if origin in (list, List):
+        (item,) = typing.get_args(tp) or (Any,)
+        if not isinstance(value, list):
+            raise ValidationError(f"Expected `array`, got `{value!r}` - at `{path}`")
+        return [_convert(v, item, f"{path}[{i}]") for i, v in enumerate(value)]
+    if origin in (dict, Dict):
+        key, item = typing.get_args(tp) or (str, Any)
+        if not isinstance(value, dict):
+            raise ValidationError(f"Expected `object`, got `{value!r}` - at `{path}`")
+        return {k: _convert(v, item, f"{path}[{k!r}]") for k, v in value.items()}
+    if isinstance(tp, type) and issubclass(tp, Schema):
+        if not isinstance(value, dict):
+            raise ValidationError(f"Expected `object`, got `{value!r}` - at `{path}`")
+        hints = typing.get_type_hints(tp)
+        kwargs = {}
+        for name, has_default, default in tp.__schema_fields__:
+            if name in value:
+                kwargs[name] = _convert(value[name], hints[name], f"{path}.{name}")
+            elif not has_default:
+                raise ValidationError(
+                    f"Object missing required field `{name}` - at `{path}`"
+                )
+        return tp(**kwargs)
+    allowed = _SCALARS.get(tp)
+    # bool is an int subclass; JSON true is not a valid integer
+    if (
+        allowed is None
+        or not isinstance(value, allowed)
+        or (tp is not bool and isinstance(value, bool))
+    ):
+        name = getattr(tp, "__name__", tp)
+        raise ValidationError(f"Expected `{name}`, got `{value!r}` - at `{path}`")
+    return value
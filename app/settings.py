@@ -0,0 +1,223 @@
+"""
+app/settings.py
+
+Typed, immutable runtime settings for jeetSocial.
+
+`create_app` builds a `Settings` snapshot from the environment (plus any
+`config_override`) once at startup and stores it on the app. Request
+handlers and helpers read flags through `get_settings()` instead of calling
+`os.getenv` per request. `reload_settings(app)` is the explicit hook for
+picking up environment changes without a restart (exposed to operators as
+`POST /_admin/config/reload`).
+"""
+
+import os
+from dataclasses import dataclass, field, replace
+from typing import Mapping, Optional, Tuple
+
+from app.token_codec import parse_keyring
+
+EXTENSION_KEY = "jeet.settings"
+_OVERRIDES_KEY = "jeet.settings_overrides"
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Snapshot of environment-driven flags; never mutated after creation."""
+
+    secret_key: str = "default-secret-key"
+    enable_rate_limiting: bool = True
+    enable_kindness_points: bool = False
+    rate_limit: str = "1/minute"
+    ratelimit_storage_uri: str = "memory://"
+    flask_env: Optional[str] = None
+    disable_debug_flags: bool = False
+    admin_token: Optional[str] = None
+    enable_post_batching: bool = False
+    post_batch_size: int = 64
+    post_batch_delay_ms: float = 5.0
+    enable_job_runner: bool = False
+    job_truncate_long_posts: bool = False
+    username_recent_window: int = 1000
+    username_adjectives_file: Optional[str] = None
+    username_animals_file: Optional[str] = None
+    sse_poll_interval: float = 2.0
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 10.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_pgbouncer: bool = False
+    database_replica_url: Optional[str] = field(default=None, repr=False)
+    read_your_writes_seconds: int = 5
+    static_dist: bool = False
+    static_dist_dir: Optional[str] = None
+    static_serve: str = "flask"
+    static_accel_prefix: str = "/_static/"
+    json_backend: str = "auto"
+    compress_responses: bool = True
+    compress_min_size: int = 1024
+    compress_level: int = 6
+    compress_cache_size: int = 256
+    enable_metrics: bool = False
+    enable_profiling: bool = False
+    profile_sample_rate: float = 0.0
+    profile_interval_ms: float = 5.0
+    profile_dir: str = "/tmp/jeet-profiles"
+    token_keys: Tuple[Tuple[str, str], ...] = field(
+        default=(("k0", "dev-secret"),), repr=False
+    )
+
+    @property
+    def debug_flags_enabled(self) -> bool:
+        return self.flask_env != "production" and not self.disable_debug_flags
+
+    def public_flags(self) -> dict:
+        """Non-secret flags safe to expose on `/_debug/flags`."""
+        return {
+            "ENABLE_KINDNESS_POINTS": "1" if self.enable_kindness_points else "0",
+            "RATE_LIMIT": self.rate_limit,
+            "FLASK_ENV": self.flask_env,
+        }
+
+
+# Mapping of app.config / config_override keys onto Settings fields
+CONFIG_FIELDS = {
+    "SECRET_KEY": "secret_key",
+    "ENABLE_RATE_LIMITING": "enable_rate_limiting",
+    "ENABLE_KINDNESS_POINTS": "enable_kindness_points",
+    "RATE_LIMIT": "rate_limit",
+    "RATELIMIT_STORAGE_URI": "ratelimit_storage_uri",
+    "FLASK_ENV": "flask_env",
+    "DISABLE_DEBUG_FLAGS": "disable_debug_flags",
+    "ADMIN_TOKEN": "admin_token",
+    "ENABLE_POST_BATCHING": "enable_post_batching",
+    "POST_BATCH_SIZE": "post_batch_size",
+    "POST_BATCH_DELAY_MS": "post_batch_delay_ms",
+    "ENABLE_JOB_RUNNER": "enable_job_runner",
+    "JOB_TRUNCATE_LONG_POSTS": "job_truncate_long_posts",
+    "USERNAME_RECENT_WINDOW": "username_recent_window",
+    "USERNAME_ADJECTIVES_FILE": "username_adjectives_file",
+    "USERNAME_ANIMALS_FILE": "username_animals_file",
+    "SSE_POLL_INTERVAL": "sse_poll_interval",
+    "DB_POOL_SIZE": "db_pool_size",
+    "DB_MAX_OVERFLOW": "db_max_overflow",
+    "DB_POOL_TIMEOUT": "db_pool_timeout",
+    "DB_POOL_RECYCLE": "db_pool_recycle",
+    "DB_POOL_PRE_PING": "db_pool_pre_ping",
+    "DB_PGBOUNCER": "db_pgbouncer",
+    "DATABASE_REPLICA_URL": "database_replica_url",
+    "READ_YOUR_WRITES_SECONDS": "read_your_writes_seconds",
+    "STATIC_DIST": "static_dist",
+    "STATIC_DIST_DIR": "static_dist_dir",
+    "STATIC_SERVE": "static_serve",
+    "STATIC_ACCEL_PREFIX": "static_accel_prefix",
+    "JSON_BACKEND": "json_backend",
+    "COMPRESS_RESPONSES": "compress_responses",
+    "COMPRESS_MIN_SIZE": "compress_min_size",
+    "COMPRESS_LEVEL": "compress_level",
+    "COMPRESS_CACHE_SIZE": "compress_cache_size",
+    "ENABLE_METRICS": "enable_metrics",
+    "ENABLE_PROFILING": "enable_profiling",
+    "PROFILE_SAMPLE_RATE": "profile_sample_rate",
+    "PROFILE_INTERVAL_MS": "profile_interval_ms",
+    "PROFILE_DIR": "profile_dir",
+}
+
+
+def load_settings(
+    environ: Optional[Mapping] = None, overrides: Optional[Mapping] = None
+) -> Settings:
+    """Build a `Settings` from `environ` with `overrides` applied on top.
+
+    `overrides` uses the upper-case config names from `CONFIG_FIELDS`; other
+    keys are ignored so a full Flask `config_override` dict can be passed.
+    """
+    env = os.environ if environ is None else environ
+    token_keys = parse_keyring(env.get("KINDNESS_TOKEN_KEYS"))
+    if not token_keys:
+        token_keys = [("k0", env.get("SECRET_KEY", "dev-secret"))]
+    settings = Settings(
+        secret_key=env.get("SECRET_KEY", "default-secret-key"),
+        enable_rate_limiting=env.get("ENABLE_RATE_LIMITING", "true").lower() == "true",
+        enable_kindness_points=env.get("ENABLE_KINDNESS_POINTS", "0") == "1",
+        rate_limit=env.get("RATE_LIMIT", "1/minute"),
+        ratelimit_storage_uri=env.get("RATELIMIT_STORAGE_URI", "memory://"),
+        flask_env=env.get("FLASK_ENV"),
+        disable_debug_flags=env.get("DISABLE_DEBUG_FLAGS", "0") == "1",
+        admin_token=env.get("ADMIN_TOKEN") or None,
+        enable_post_batching=env.get("ENABLE_POST_BATCHING", "0") == "1",
+        post_batch_size=int(env.get("POST_BATCH_SIZE", "64")),
+        post_batch_delay_ms=float(env.get("POST_BATCH_DELAY_MS", "5")),
+        enable_job_runner=env.get("ENABLE_JOB_RUNNER", "0") == "1",
+        job_truncate_long_posts=env.get("JOB_TRUNCATE_LONG_POSTS", "0") == "1",
+        username_recent_window=int(env.get("USERNAME_RECENT_WINDOW", "1000")),
+        username_adjectives_file=env.get("USERNAME_ADJECTIVES_FILE") or None,
+        username_animals_file=env.get("USERNAME_ANIMALS_FILE") or None,
+        sse_poll_interval=float(env.get("SSE_POLL_INTERVAL", "2")),
+        db_pool_size=int(env.get("DB_POOL_SIZE", "10")),
+        db_max_overflow=int(env.get("DB_MAX_OVERFLOW", "20")),
+        db_pool_timeout=float(env.get("DB_POOL_TIMEOUT", "10")),
+        db_pool_recycle=int(env.get("DB_POOL_RECYCLE", "1800")),
+        db_pool_pre_ping=env.get("DB_POOL_PRE_PING", "1") == "1",
+        db_pgbouncer=env.get("DB_PGBOUNCER", "0") == "1",
+        database_replica_url=env.get("DATABASE_REPLICA_URL") or None,
+        read_your_writes_seconds=int(env.get("READ_YOUR_WRITES_SECONDS", "5")),
+        static_dist=env.get("STATIC_DIST", "0") == "1",
+        static_dist_dir=env.get("STATIC_DIST_DIR") or None,
+        static_serve=env.get("STATIC_SERVE", "flask").lower(),
+        static_accel_prefix=env.get("STATIC_ACCEL_PREFIX", "/_static/"),
+        json_backend=env.get("JSON_BACKEND", "auto").lower(),
+        compress_responses=env.get("COMPRESS_RESPONSES", "1") == "1",
+        compress_min_size=int(env.get("COMPRESS_MIN_SIZE", "1024")),
+        compress_level=int(env.get("COMPRESS_LEVEL", "6")),
+        compress_cache_size=int(env.get("COMPRESS_CACHE_SIZE", "256")),
+        enable_metrics=env.get("ENABLE_METRICS", "0") == "1",
+        enable_profiling=env.get("ENABLE_PROFILING", "0") == "1",
+        profile_sample_rate=float(env.get("PROFILE_SAMPLE_RATE", "0")),
+        profile_interval_ms=float(env.get("PROFILE_INTERVAL_MS", "5")),
+        profile_dir=env.get("PROFILE_DIR") or "/tmp/jeet-profiles",
+        token_keys=tuple(token_keys),
+    )
+    if overrides:
+        changes = {
+            CONFIG_FIELDS[k]: v for k, v in overrides.items() if k in CONFIG_FIELDS
+        }
+        if changes:
+            settings = replace(settings, **changes)
+    return settings
+
+
+def install_settings(app, settings: Settings, overrides: Optional[Mapping] = None):
+    """Attach `settings` to `app` and mirror its flags into `app.config`."""
+    from app import token_codec, usernames
+
+    app.extensions[EXTENSION_KEY] = settings
+    if overrides is not None:
+        app.extensions[_OVERRIDES_KEY] = dict(overrides)
+    for config_key, attr in CONFIG_FIELDS.items():
+        app.config[config_key] = getattr(settings, attr)
+    token_codec.reset_codec(token_codec.TokenCodec(list(settings.token_keys)))
+    usernames.configure_allocator(settings)
+    return settings
+
+
+def reload_settings(app, **overrides) -> Settings:
+    """Re-read the environment and swap in a fresh snapshot for `app`.
+
+    The `config_override` given to `create_app` is re-applied, followed by
+    any keyword `overrides` (upper-case config names).
+    """
+    merged = dict(app.extensions.get(_OVERRIDES_KEY) or {})
+    merged.update(overrides)
+    settings = load_settings(overrides=merged)
+    return install_settings(app, settings, merged)
+
+
+def get_settings(app=None) -> Settings:
+    """Return the snapshot for `app` (defaults to `current_app`)."""
+    if app is None:
+        from flask import current_app
+
+        app = current_app
+    return app.extensions[EXTENSION_KEY]
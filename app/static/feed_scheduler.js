@@ -0,0 +1,230 @@
+/*
+feed_scheduler.js
+
+Adaptive live-feed polling for jeetSocial (used by main.js):
+- Pauses while the tab is hidden and catches up when it becomes visible
+- Backs off exponentially while polls return nothing new; resets on change
+- Speeds up to the minimum interval after user activity
+- Elects one leader tab over BroadcastChannel; only the leader polls and
+  shares each result with the other tabs
+
+Clock, timers and channel are injectable so the scheduler can run in Node
+(see benchmarks/bench_polling_scheduler.js).
+*/
+
+class FeedPollScheduler {
+  /**
+   * @param {object} options
+   * @param {function(): Promise<{changed: boolean, payload: *}>} options.poll
+   *   Fetch the feed; report whether anything changed since the last poll.
+   * @param {function(*)} [options.onShared] Apply a payload polled by the leader tab.
+   * @param {function(): string} [options.getKey] Identifies what this tab shows
+   *   (e.g. the feed view); shared payloads only count for tabs with the same key.
+   * @param {BroadcastChannel|null} [options.channel] Channel shared by all tabs.
+   */
+  constructor(options) {
+    this.poll = options.poll;
+    this.onShared = options.onShared || (() => {});
+    this.getKey = options.getKey || (() => '');
+    this.channel = options.channel || null;
+    this.now = options.now || (() => Date.now());
+    this.setTimer = options.setTimeout || ((fn, ms) => setTimeout(fn, ms));
+    this.clearTimer = options.clearTimeout || (id => clearTimeout(id));
+    this.baseInterval = options.baseInterval || 15000;
+    this.minInterval = options.minInterval || 5000;
+    this.maxInterval = options.maxInterval || 120000;
+    this.backoff = options.backoff || 2;
+    this.heartbeatInterval = options.heartbeatInterval || 5000;
+
+    this.id = options.id || `${this.now()}-${Math.random().toString(36).slice(2)}`;
+    this.visible = options.visible !== undefined ? options.visible : true;
+    this.running = false;
+    this.isLeader = false;
+    this.leaderSeenAt = -Infinity;
+    this.lastPollAt = -Infinity;
+    this.lastSharedAt = -Infinity;
+    this.lastActivitySentAt = -Infinity;
+    this.interval = this.baseInterval;
+    this.requests = 0;
+    this._pollTimer = null;
+    this._heartbeatTimer = null;
+    this._polling = false;
+
+    if (this.channel) {
+      this._onMessage = event => this._handleMessage(event.data);
+      this.channel.addEventListener('message', this._onMessage);
+    }
+  }
+
+  start() {
+    if (this.running) return;
+    this.running = true;
+    if (!this.channel) this.isLeader = true;
+    // The page has just loaded the feed itself; first poll one interval later
+    this.lastPollAt = this.now();
+    this._heartbeat();
+    this._schedule(this.interval);
+  }
+
+  stop() {
+    if (!this.running) return;
+    this.running = false;
+    this._resign();
+    this.clearTimer(this._pollTimer);
+    this.clearTimer(this._heartbeatTimer);
+    this._pollTimer = null;
+    this._heartbeatTimer = null;
+  }
+
+  /** Called on scroll/keyboard/pointer activity: poll sooner. */
+  noteActivity() {
+    if (!this.running || !this.visible) return;
+    const now = this.now();
+    if (this.channel && !this.isLeader) {
+      // Let the leader know someone is looking (at most once per minInterval)
+      if (now - this.lastActivitySentAt >= this.minInterval) {
+        this.lastActivitySentAt = now;
+        this._post({ type: 'activity', id: this.id });
+      }
+      return;
+    }
+    this._speedUp();
+  }
+
+  setVisible(visible) {
+    if (this.visible === visible) return;
+    this.visible = visible;
+    if (!this.running) return;
+    if (!visible) {
+      this._resign();
+      this.clearTimer(this._pollTimer);
+      this._pollTimer = null;
+      return;
+    }
+    this._heartbeat();
+    // Catch up right away if a poll came due while hidden
+    const due = this.lastPollAt + this.interval - this.now();
+    this._schedule(Math.max(0, due));
+  }
+
+  // Polling
+
+  _schedule(delay) {
+    this.clearTimer(this._pollTimer);
+    this._pollTimer = this.setTimer(() => this._tick(), delay);
+  }
+
+  _speedUp() {
+    if (this.interval === this.minInterval && this._pollTimer !== null) return;
+    this.interval = this.minInterval;
+    const due = this.lastPollAt + this.minInterval - this.now();
+    this._schedule(Math.max(0, due));
+  }
+
+  async _tick() {
+    this._pollTimer = null;
+    if (!this.running || !this.visible) return;
+    const now = this.now();
+    // Followers rely on the leader while its results keep arriving
+    const covered = this.channel && !this.isLeader && now - this.lastSharedAt < 2 * this.interval;
+    if (!covered && !this._polling) {
+      this._polling = true;
+      this.lastPollAt = now;
+      this.requests += 1;
+      let result = null;
+      try {
+        result = await this.poll();
+      } catch (err) {
+        console.debug('[FeedScheduler] poll failed', err);
+      } finally {
+        this._polling = false;
+      }
+      this._adjust(!!(result && result.changed));
+      if (this.isLeader && this.channel && result && result.payload != null) {
+        this._post({ type: 'feed', id: this.id, key: this.getKey(), interval: this.interval, payload: result.payload });
+      }
+    }
+    if (this.running && this.visible && this._pollTimer === null) this._schedule(this.interval);
+  }
+
+  _adjust(changed) {
+    if (changed) {
+      this.interval = this.baseInterval;
+    } else {
+      this.interval = Math.min(this.maxInterval, this.interval * this.backoff);
+    }
+  }
+
+  // Leader election
+
+  _heartbeat() {
+    this.clearTimer(this._heartbeatTimer);
+    this._heartbeatTimer = null;
+    if (!this.running || !this.channel) return;
+    if (this.visible) {
+      const leaderGone = this.now() - this.leaderSeenAt > 3 * this.heartbeatInterval;
+      if (!this.isLeader && leaderGone) {
+        this.isLeader = true;
+        // Take over polling from where the previous leader's results stopped
+        this._schedule(Math.max(0, Math.max(this.lastPollAt, this.lastSharedAt) + this.interval - this.now()));
+      }
+      if (this.isLeader) this._post({ type: 'heartbeat', id: this.id });
+    }
+    this._heartbeatTimer = this.setTimer(() => this._heartbeat(), this.heartbeatInterval);
+  }
+
+  _resign() {
+    if (!this.isLeader || !this.channel) return;
+    this.isLeader = false;
+    this._post({ type: 'resign', id: this.id });
+  }
+
+  _handleMessage(message) {
+    if (!message || message.id === this.id || !this.running) return;
+    const now = this.now();
+    switch (message.type) {
+      case 'heartbeat':
+        // Two leaders (e.g. simultaneous claims): the lower id wins
+        if (this.isLeader && this.id < message.id) return;
+        this.isLeader = false;
+        this.leaderSeenAt = now;
+        break;
+      case 'resign':
+        this.leaderSeenAt = -Infinity;
+        // Claim soon, with jitter so visible tabs don't all claim at once
+        this.clearTimer(this._heartbeatTimer);
+        this._heartbeatTimer = this.setTimer(() => this._heartbeat(), Math.random() * 250);
+        break;
+      case 'activity':
+        if (this.isLeader) this._speedUp();
+        break;
+      case 'feed':
+        this.leaderSeenAt = now;
+        if (message.key !== this.getKey()) return;
+        this.lastSharedAt = now;
+        this.interval = message.interval;
+        try {
+          this.onShared(message.payload);
+        } catch (err) {
+          console.debug('[FeedScheduler] shared update failed', err);
+        }
+        break;
+      default:
+        break;
+    }
+  }
+
+  _post(message) {
+    try {
+      this.channel.postMessage(message);
+    } catch (err) {
+      console.debug('[FeedScheduler] broadcast failed', err);
+    }
+  }
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { FeedPollScheduler };
+} else {
+  window.FeedPollScheduler = FeedPollScheduler;
+}
@@ -2,17 +2,15 @@
 main.js
 
 Frontend logic for jeetSocial:
-- Live feed polling and updates
-- Paging controls
+- Live feed polling and keyed, rAF-batched feed updates
+- Infinite scroll with a virtualized (windowed) feed
 - Post submission and moderation
 - Kindness mission UI/UX
 - Emoji picker integration
 */
 
 
-// Paging state
-let currentPage = 1;
-let totalPages = 1;
+// Feed state
 let pageLimit = 20;
 let currentView = 'latest';
 
@@ -24,94 +22,362 @@ window.addEventListener('DOMContentLoaded', () => {
   startLiveFeedPolling();
 });
 
-let liveFeedInterval = null;
+// Virtualized, keyed feed
+// feedItems holds every loaded post (newest first) as plain data; only the
+// posts in and around the viewport have DOM nodes. Spacer divs above and
+// below stand in for the rest, using measured (or estimated) heights.
+// feedNodes maps post id -> { node, badge, points } for rendered posts;
+// nodes scrolled out of the window are recycled for the next posts shown.
+const ACCENT_COLORS = ["#ff4b5c", "#ffb26b", "#ffe347", "#43e97b", "#3fa7d6", "#7c4dff", "#c86dd7"];
+const ESTIMATED_POST_HEIGHT = 140; // px, until a post has been measured
+const OVERSCAN_PX = 800; // rendered above and below the viewport
+const PREFETCH_PX = 2000; // load the next page when this close to the end
+let feedItems = [];
+const feedById = new Map(); // post id -> post data
+const feedHeights = new Map(); // post id -> measured height incl. margin
+const feedNodes = new Map(); // post id -> rendered record
+const recycledRecords = [];
+let nextCursor = null;
+let hasMoreItems = false;
+let loadingMore = false;
+let feedSpacers = null;
+let postGap = null;
+let pendingFeedWrites = [];
+let feedWriteFrame = null;
+let renderRequested = false;
+
+function normalizeKindnessPoints(post) {
+  if (typeof post.kindness_points !== 'number' || !Number.isFinite(post.kindness_points)) {
+    const coerced = Number(post.kindness_points);
+    post.kindness_points = Number.isFinite(coerced) ? coerced : 0;
+  }
+  return post;
+}
+
+// Queue a DOM write; all writes queued in one frame run together in
+// requestAnimationFrame. Each flush is recorded as a 'jeet:feed-write'
+// performance measure (read by the e2e render timing spec).
+function scheduleFeedWrite(write) {
+  pendingFeedWrites.push(write);
+  if (feedWriteFrame !== null) return;
+  const raf = window.requestAnimationFrame ? window.requestAnimationFrame.bind(window) : (cb => setTimeout(cb, 16));
+  feedWriteFrame = raf(() => {
+    feedWriteFrame = null;
+    const writes = pendingFeedWrites;
+    pendingFeedWrites = [];
+    const start = performance.now();
+    writes.forEach(write => {
+      try {
+        write();
+      } catch (err) {
+        console.debug('[LiveFeed] feed write failed', err);
+      }
+    });
+    try {
+      performance.measure('jeet:feed-write', { start, end: performance.now() });
+    } catch { /* performance.measure options unsupported */ }
+  });
+}
+
+function createPostRecord() {
+  const div = document.createElement('div');
+  div.innerHTML = `
+    <span class="username"></span>
+    <span class="timestamp"></span>
+    <div class="post-content"></div>
+    <div class="kindness-row">
+<span class="kindness-badge kindness-count" aria-live="polite"></span>
+<button class="kindness-btn kindness-icon-btn" aria-label="Award kindness to this post" aria-pressed="false" data-tooltip="Award kindness (gives 1 kindness point)"><span class="icon" aria-hidden="true">❤️</span></button>
+    </div>
+  `;
+  return {
+    node: div,
+    username: div.querySelector('.username'),
+    timestamp: div.querySelector('.timestamp'),
+    content: div.querySelector('.post-content'),
+    badge: div.querySelector('.kindness-count'),
+    button: div.querySelector('.kindness-btn'),
+    points: null,
+  };
+}
+
+// Point a (new or recycled) record at `post`
+function bindPostRecord(record, post) {
+  const color = ACCENT_COLORS[post.id % ACCENT_COLORS.length];
+  const node = record.node;
+  node.className = post._isNew ? 'post new-post' : 'post';
+  node.style.animation = post._isNew ? 'fadeIn 1s' : '';
+  node.style.borderLeft = `6px solid ${color}`;
+  node.setAttribute('data-id', post.id);
+  record.username.style.color = color;
+  record.username.textContent = post.username;
+  record.timestamp.textContent = new Date(post.timestamp).toLocaleString();
+  record.content.innerHTML = escapeHtml(post.message);
+  record.badge.setAttribute('data-kindness-count', post.id);
+  record.badge.textContent = `🌈 ${post.kindness_points}`;
+  record.button.setAttribute('data-post-id', post.id);
+  record.button.disabled = !!post._awarded;
+  record.button.setAttribute('aria-pressed', post._awarded ? 'true' : 'false');
+  record.points = post.kindness_points;
+  return record;
+}
+
+// Update a rendered post's badge; returns a DOM write, or null if unchanged
+function patchPostRecord(record, post) {
+  if (record.points === post.kindness_points) return null;
+  record.points = post.kindness_points;
+  const badge = record.badge;
+  return () => {
+    // The record may have been recycled for another post meanwhile
+    if (badge.getAttribute('data-kindness-count') !== String(post.id)) return;
+    badge.textContent = `🌈 ${post.kindness_points}`;
+    // Small visual feedback for change
+    badge.classList.add('bump');
+    setTimeout(() => badge.classList.remove('bump'), 350);
+  };
+}
+
+// Kindness badge for a post: keyed lookup, DOM query only as a fallback
+function kindnessBadge(postId) {
+  const record = feedNodes.get(String(postId));
+  if (record) return record.badge;
+  return document.querySelector(`[data-kindness-count="${postId}"]`);
+}
+
+function itemHeight(post) {
+  return feedHeights.get(String(post.id)) || ESTIMATED_POST_HEIGHT;
+}
+
+// Render the posts around the viewport on the next frame
+function requestFeedRender() {
+  if (renderRequested) return;
+  renderRequested = true;
+  scheduleFeedWrite(renderFeedWindow);
+}
+
+function renderFeedWindow() {
+  renderRequested = false;
+  const feed = document.getElementById('feed');
+  if (!feed) return;
+  if (!feedSpacers || feedSpacers.top.parentNode !== feed) {
+    // First render, or the feed was replaced (skeleton / error message)
+    feedNodes.forEach(record => recycledRecords.push(record));
+    feedNodes.clear();
+    feedSpacers = { top: document.createElement('div'), bottom: document.createElement('div') };
+    feed.textContent = '';
+    feed.append(feedSpacers.top, feedSpacers.bottom);
+  }
+
+  // Reads: measure rendered posts, then the viewport
+  let remeasured = false;
+  feedNodes.forEach((record, key) => {
+    if (postGap === null) postGap = parseFloat(getComputedStyle(record.node).marginBottom) || 0;
+    const height = record.node.offsetHeight + postGap;
+    if (height > postGap && feedHeights.get(key) !== height) {
+      feedHeights.set(key, height);
+      remeasured = true;
+    }
+  });
+  const feedTop = feed.getBoundingClientRect().top + window.scrollY;
+  const viewTop = window.scrollY - feedTop - OVERSCAN_PX;
+  const viewBottom = window.scrollY - feedTop + window.innerHeight + OVERSCAN_PX;
+
+  let offset = 0;
+  let first = feedItems.length;
+  let last = -1;
+  let topHeight = 0;
+  for (let i = 0; i < feedItems.length; i++) {
+    const height = itemHeight(feedItems[i]);
+    if (offset + height > viewTop && offset < viewBottom) {
+      if (first > i) {
+        first = i;
+        topHeight = offset;
+      }
+      last = i;
+    }
+    offset += height;
+  }
+  const visible = last >= first ? feedItems.slice(first, last + 1) : [];
+  let bottomHeight = offset - topHeight;
+  visible.forEach(post => { bottomHeight -= itemHeight(post); });
+
+  // Writes: recycle posts that left the window, then place the rest in order
+  const keep = new Set(visible.map(post => String(post.id)));
+  feedNodes.forEach((record, key) => {
+    if (keep.has(key)) return;
+    record.node.remove();
+    feedNodes.delete(key);
+    recycledRecords.push(record);
+  });
+  let cursor = feedSpacers.top.nextSibling;
+  visible.forEach(post => {
+    const key = String(post.id);
+    let record = feedNodes.get(key);
+    if (!record) {
+      record = bindPostRecord(recycledRecords.pop() || createPostRecord(), post);
+      feedNodes.set(key, record);
+    }
+    if (record.node === cursor) {
+      cursor = cursor.nextSibling;
+    } else {
+      feed.insertBefore(record.node, cursor);
+    }
+  });
+  feedSpacers.top.style.height = `${topHeight}px`;
+  feedSpacers.bottom.style.height = `${Math.max(0, bottomHeight)}px`;
+
+  // Newly bound posts get measured on the next frame
+  if (remeasured || visible.some(post => !feedHeights.has(String(post.id)))) requestFeedRender();
+  if (hasMoreItems && !loadingMore && offset - (window.scrollY - feedTop + window.innerHeight) < PREFETCH_PX) {
+    loadMorePosts();
+  }
+}
+
+function addFeedItems(posts, { prepend = false } = {}) {
+  const fresh = posts.filter(post => !feedById.has(String(post.id)));
+  fresh.forEach(post => feedById.set(String(post.id), post));
+  feedItems = prepend ? fresh.concat(feedItems) : feedItems.concat(fresh);
+  return fresh;
+}
+
+// Make the feed show exactly `posts` (a fresh first page), reusing nodes by id
+function reconcileFeedPage(feed, posts) {
+  feedItems = [];
+  feedById.clear();
+  addFeedItems(posts);
+  // Heights of posts no longer loaded are not needed again
+  feedHeights.forEach((_, key) => {
+    if (!feedById.has(key)) feedHeights.delete(key);
+  });
+  feedNodes.forEach((record, key) => {
+    const post = feedById.get(key);
+    if (!post) return;
+    const patch = patchPostRecord(record, post);
+    if (patch) scheduleFeedWrite(patch);
+  });
+  requestFeedRender();
+}
+
+// Merge a fresh first page into the feed: prepend unseen posts and patch
+// badges of known ones. Returns true if new posts were added.
+function mergeLivePosts(feed, posts) {
+  posts.forEach(post => {
+    const known = feedById.get(String(post.id));
+    if (!known || known.kindness_points === post.kindness_points) return;
+    known.kindness_points = post.kindness_points;
+    const record = feedNodes.get(String(post.id));
+    const patch = record && patchPostRecord(record, post);
+    if (patch) scheduleFeedWrite(patch);
+  });
+  const added = addFeedItems(posts, { prepend: true });
+  added.forEach(post => { post._isNew = true; });
+  if (added.length) requestFeedRender();
+  return added.length > 0;
+}
+
+// Next page of the latest feed, fetched in the background before the user
+// reaches the end of what is loaded
+async function loadMorePosts() {
+  if (loadingMore || !hasMoreItems || !nextCursor) return;
+  loadingMore = true;
+  const cursor = nextCursor;
+  try {
+    const resp = await fetch(`/api/posts?limit=${pageLimit}&cursor=${encodeURIComponent(cursor)}&compact=1`);
+    const data = await resp.json();
+    // Ignore the result if the feed was reloaded meanwhile
+    if (cursor !== nextCursor) return;
+    addFeedItems((data.posts || []).map(normalizeKindnessPoints));
+    nextCursor = data.next_cursor;
+    hasMoreItems = !!data.has_more;
+    requestFeedRender();
+  } catch (err) {
+    console.log('[FetchFeed] Error loading more posts', err);
+  } finally {
+    loadingMore = false;
+  }
+}
+
+window.addEventListener('scroll', requestFeedRender, { passive: true });
+window.addEventListener('resize', () => {
+  // Post heights depend on the width
+  feedHeights.clear();
+  requestFeedRender();
+});
+
+// Live feed polling: FeedPollScheduler (feed_scheduler.js) pauses hidden
+// tabs, backs off while nothing changes and lets one leader tab poll for all
+let liveFeedScheduler = null;
+let lastLiveSignature = '';
+
+function liveSignature(posts) {
+  return posts.map(p => `${p.id}:${p.kindness_points}`).join(',');
+}
+
+async function pollLiveFeed() {
+  const posts = await butterSmoothLiveUpdate();
+  if (!posts) return { changed: false, payload: null };
+  const signature = liveSignature(posts);
+  const changed = signature !== lastLiveSignature;
+  lastLiveSignature = signature;
+  return { changed, payload: posts };
+}
+
+function applySharedLivePosts(posts) {
+  if (!Array.isArray(posts)) return;
+  lastLiveSignature = liveSignature(posts);
+  applyLivePosts(posts);
+}
+
 function startLiveFeedPolling() {
-  if (liveFeedInterval) clearInterval(liveFeedInterval);
-  liveFeedInterval = setInterval(() => {
-    console.log('[LiveFeed] Polling interval fired. currentPage:', currentPage);
-    if (currentPage === 1) butterSmoothLiveUpdate();
-  }, 15000); // 15 seconds
+  if (!liveFeedScheduler) {
+    let channel = null;
+    try {
+      if (typeof BroadcastChannel !== 'undefined') channel = new BroadcastChannel('jeet_feed');
+    } catch (err) {
+      console.debug('[LiveFeed] BroadcastChannel init error', err);
+    }
+    liveFeedScheduler = new FeedPollScheduler({
+      poll: pollLiveFeed,
+      onShared: applySharedLivePosts,
+      getKey: () => currentView,
+      channel,
+      visible: !document.hidden,
+    });
+    document.addEventListener('visibilitychange', () => liveFeedScheduler.setVisible(!document.hidden));
+    ['pointerdown', 'keydown', 'scroll', 'focus'].forEach(type => {
+      window.addEventListener(type, () => liveFeedScheduler.noteActivity(), { passive: true });
+    });
+  }
+  liveFeedScheduler.start();
 }
 
 // Butter-smooth live update function
+// Returns the fetched first page (or null on error) for the scheduler.
 async function butterSmoothLiveUpdate() {
   try {
     const viewParam = currentView !== 'latest' ? `&view=${currentView}` : '';
-    const resp = await fetch(`/api/posts?page=1&limit=${pageLimit}${viewParam}`);
+    const resp = await fetch(`/api/posts?page=1&limit=${pageLimit}${viewParam}&compact=1`);
     const data = await resp.json();
     const newPosts = Array.isArray(data.posts) ? data.posts : [];
      // Debug: log incoming posts payload for E2E visibility
      try { console.debug('[LiveFeed] /api/posts payload', newPosts); } catch { /* ignore */ }
-    const feed = document.getElementById('feed');
-    if (!feed) return;
-    const accentColors = ["#ff4b5c", "#ffb26b", "#ffe347", "#43e97b", "#3fa7d6", "#7c4dff", "#c86dd7"];
-    // Get existing post IDs in DOM
-    const existingIds = Array.from(feed.children).map(node => node.dataset && node.dataset.id);
-    let inserted = false;
-
-    newPosts.forEach((post, i) => {
-      const postIdStr = String(post.id);
-
-      // Defensive normalization of incoming post object
-      if (typeof post.kindness_points !== 'number' || !Number.isFinite(post.kindness_points)) {
-        const coerced = Number(post.kindness_points);
-        post.kindness_points = Number.isFinite(coerced) ? coerced : 0;
-      }
-
-      const displayKp = Number.isFinite(Number(post.kindness_points)) ? Number(post.kindness_points) : 0;
-
-      if (!existingIds.includes(postIdStr)) {
-        // Create post node
-        const div = document.createElement('div');
-        div.className = 'post new-post';
-        div.style.animation = 'fadeIn 1s';
-        div.style.borderLeft = `6px solid ${accentColors[i % accentColors.length]}`;
-        div.setAttribute('data-id', post.id);
-
-        div.innerHTML = `
-          <span class="username" style="color:${accentColors[i % accentColors.length]}">${post.username}</span>
-          <span class="timestamp">${new Date(post.timestamp).toLocaleString()}</span>
-          <div class="post-content">${escapeHtml(post.message)}</div>
-          <div class="kindness-row">
-<span class="kindness-badge kindness-count" data-kindness-count="${post.id}" aria-live="polite">🌈 ${displayKp}</span>
-<button class="kindness-btn kindness-icon-btn" data-post-id="${post.id}" aria-label="Award kindness to this post" aria-pressed="false" data-tooltip="Award kindness (gives 1 kindness point)"><span class="icon" aria-hidden="true">❤️</span></button>
-          </div>
-        `;
-
-        // Prepend newest posts to top of feed
-        try {
-          feed.insertBefore(div, feed.firstChild);
-        } catch {
-          feed.appendChild(div);
-        }
-
-        inserted = true;
-      } else {
-        // Update existing post kindness badge so cross-device updates become visible
-        try {
-          const countEl = document.querySelector(`[data-kindness-count="${post.id}"]`);
-          if (countEl) {
-            countEl.textContent = `🌈 ${displayKp}`;
-            // Small visual feedback for change
-            countEl.classList.add('bump');
-            setTimeout(() => countEl.classList.remove('bump'), 350);
-          }
-        } catch (err) {
-          console.debug('[LiveFeed] failed to update existing kindness badge', err);
-        }
-      }
-    });
-
-    // Animate new posts
-    if (inserted) {
-      // Optionally, preserve scroll position if user is not at top
-      if (window.scrollY > 0) {
-        // Show "New posts available" banner
-        showNewPostsBanner();
-      }
-    }
+    const posts = newPosts.map(normalizeKindnessPoints);
+    applyLivePosts(posts);
+    return posts;
    } catch (err) {
      console.log('[LiveFeed] Butter-smooth update error', err);
+     return null;
+  }
+}
+
+function applyLivePosts(posts) {
+  const feed = document.getElementById('feed');
+  if (!feed) return;
+  const inserted = mergeLivePosts(feed, posts);
+  // Preserve scroll position if user is not at top
+  if (inserted && window.scrollY > 0) {
+    // Show "New posts available" banner
+    showNewPostsBanner();
   }
 }
 
@@ -142,101 +408,44 @@ function showNewPostsBanner() {
 }
 
 function stopLiveFeedPolling() {
-  if (liveFeedInterval) clearInterval(liveFeedInterval);
-  liveFeedInterval = null;
+  if (liveFeedScheduler) liveFeedScheduler.stop();
 }
 
-
-// Paging controls
-function renderPagingControls() {
-  // Pause live polling if not on page 1
-  if (currentPage === 1) {
-    startLiveFeedPolling();
-  } else {
-    stopLiveFeedPolling();
-  }
-
+// (Re)load the feed from the top: the latest view pages by cursor as the
+// user scrolls; the top view is a single ranked page. Older callers still
+// pass a page number, which is ignored.
+async function fetchFeedPage() {
   const feed = document.getElementById('feed');
-  let pagingDiv = document.getElementById('paging-controls');
-  if (!pagingDiv) {
-    pagingDiv = document.createElement('div');
-    pagingDiv.id = 'paging-controls';
-    pagingDiv.style.display = 'flex';
-    pagingDiv.style.justifyContent = 'center';
-    pagingDiv.style.alignItems = 'center';
-    pagingDiv.style.gap = '1em';
-    pagingDiv.style.margin = '1em 0';
-    feed.parentNode.insertBefore(pagingDiv, feed.nextSibling);
+  // Show skeleton loader on first load; reloads patch the existing posts
+  if (!feedItems.length) {
+    feed.innerHTML = `
+      <div class="skeleton-loader" id="skeleton-loader">
+        <div class="skeleton-post"><div class="skeleton-animate"></div></div>
+        <div class="skeleton-post"><div class="skeleton-animate"></div></div>
+        <div class="skeleton-post"><div class="skeleton-animate"></div></div>
+      </div>
+    `;
   }
-  pagingDiv.innerHTML = `
-    <button id="prev-page" class="rainbow-btn" ${currentPage === 1 ? 'disabled' : ''}>Previous</button>
-    <span style="color:#ffe347;font-weight:bold;">Page ${currentPage} of ${totalPages}</span>
-    <button id="next-page" class="rainbow-btn" ${currentPage === totalPages ? 'disabled' : ''}>Next</button>
-  `;
-  document.getElementById('prev-page').onclick = () => {
-    if (currentPage > 1) fetchFeedPage(currentPage - 1);
-  };
-  document.getElementById('next-page').onclick = () => {
-    if (currentPage < totalPages) fetchFeedPage(currentPage + 1);
-  };
-}
-
-async function fetchFeedPage(page) {
-  const feed = document.getElementById('feed');
-  // Show skeleton loader while loading
-  feed.innerHTML = `
-    <div class="skeleton-loader" id="skeleton-loader">
-      <div class="skeleton-post"><div class="skeleton-animate"></div></div>
-      <div class="skeleton-post"><div class="skeleton-animate"></div></div>
-      <div class="skeleton-post"><div class="skeleton-animate"></div></div>
-    </div>
-  `;
+  nextCursor = null;
+  hasMoreItems = false;
    try {
-     const viewParam = currentView !== 'latest' ? `&view=${currentView}` : '';
-     const resp = await fetch(`/api/posts?page=${page}&limit=${pageLimit}${viewParam}`);
+     const query = currentView === 'top' ? `page=1&limit=${pageLimit}&view=top` : `limit=${pageLimit}&cursor=`;
+     const resp = await fetch(`/api/posts?${query}&compact=1`);
      const data = await resp.json();
     const posts = data.posts;
      // Debug: log incoming posts payload for E2E visibility
      try { console.debug('[FetchFeed] /api/posts payload', posts); } catch { /* ignore */ }
-    const accentColors = ["#ff4b5c", "#ffb26b", "#ffe347", "#43e97b", "#3fa7d6", "#7c4dff", "#c86dd7"];
-    // Remove skeleton loader and show posts
-    // Defensive normalization of posts array to ensure kindness_points is numeric
-    const normalizedPosts = posts.map(p => {
-      try {
-        if (typeof p.kindness_points !== 'number' || !Number.isFinite(p.kindness_points)) {
-          const coerced = Number(p.kindness_points);
-          p.kindness_points = Number.isFinite(coerced) ? coerced : 0;
-        }
-             } catch {
-                 console.debug('[KINDNESS-CLIENT] storage handler error');
-             }
-      return p;
-    });
-
-    feed.innerHTML = normalizedPosts.map((post, index) => {
-      const color = accentColors[index % accentColors.length];
-      // Explicit numeric display value for kindness points
-      const displayKp = Number.isFinite(Number(post.kindness_points)) ? Number(post.kindness_points) : 0;
-    return `
-        <div class="post" style="border-left: 6px solid ${color};" data-id="${post.id}">
-          <span class="username" style="color:${color}">${post.username}</span>
-          <span class="timestamp">${new Date(post.timestamp).toLocaleString()}</span>
-            <div class="post-content">${escapeHtml(post.message)}</div>
-           <div class="kindness-row">
-<span class="kindness-badge kindness-count" data-kindness-count="${post.id}" aria-live="polite">🌈 ${displayKp}</span>
-<button class="kindness-btn kindness-icon-btn" data-post-id="${post.id}" aria-label="Award kindness to this post" aria-pressed="false" data-tooltip="Award kindness (gives 1 kindness point)"><span class="icon" aria-hidden="true">❤️</span></button>
-           </div>
-         </div>
-       `;
-     }).join('');
+    reconcileFeedPage(feed, posts.map(normalizeKindnessPoints));
+    nextCursor = data.next_cursor || null;
+    hasMoreItems = !!(data.has_more && nextCursor);
 // After full reload, remove new-post banner if present
 const banner = document.getElementById('new-posts-banner');
 if (banner) banner.remove();
-    currentPage = data.page;
-    totalPages = Math.max(1, Math.ceil(data.total_count / pageLimit));
-    renderPagingControls();
+    startLiveFeedPolling();
    } catch (err) {
      console.log('[FetchFeed] Error loading feed', err);
+    feedItems = [];
+    feedById.clear();
     feed.innerHTML = '<em>Error loading feed.</em>';
   }
 }
@@ -297,7 +506,7 @@ async function postMessage(e) {
       // Reset character counter after post
       const counter = document.getElementById('char-count');
       if (counter) counter.textContent = '0/280';
-      fetchFeedPage(currentPage);
+      // Merge the new post in at the top, keeping what is already loaded
       butterSmoothLiveUpdate();
     } else {
       try {
@@ -535,7 +744,7 @@ class KindnessManager {
  */
     async awardKindness(postId, buttonElement) {
     // Optimistic UI: increment count, animate, disable button
-    const countElement = document.querySelector(`[data-kindness-count="${postId}"]`);
+    const countElement = kindnessBadge(postId);
     let originalCount = 0;
     if (countElement) {
         const text = (countElement.textContent || '').trim();
@@ -605,6 +814,9 @@ class KindnessManager {
                 buttonElement.disabled = true;
                 buttonElement.setAttribute('aria-pressed', 'true');
             }
+            // Remember the award so a recycled node for this post stays pressed
+            const awardedPost = feedById.get(String(postId));
+            if (awardedPost) awardedPost._awarded = true;
             sessionStorage.removeItem('kindness_token');
             sessionStorage.removeItem('kindness_token_expiry');
             this.token = null;
@@ -633,10 +845,15 @@ class KindnessManager {
 
     
     updateKindnessDisplay(postId, newCount) {
-        const countElement = document.querySelector(`[data-kindness-count="${postId}"]`);
+        const countElement = kindnessBadge(postId);
         if (countElement) {
             // Coerce to explicit numeric value and avoid 'undefined' or non-numeric strings
             const displayKp = Number.isFinite(Number(newCount)) ? Number(newCount) : 0;
+            // Keep the keyed record in sync so the next live update doesn't re-patch it
+            const record = feedNodes.get(String(postId));
+            if (record) record.points = displayKp;
+            const post = feedById.get(String(postId));
+            if (post) post.kindness_points = displayKp;
             // Keep display format consistent with initial render: emoji + number
             countElement.textContent = `🌈 ${displayKp}`;
             // Announce change to offscreen live region for screen readers
@@ -824,7 +1041,7 @@ window.addEventListener('DOMContentLoaded', function() {
        url.searchParams.delete('view');
        window.history.pushState({}, '', url);
        // Refetch feed
-       fetchFeedPage(currentPage);
+       fetchFeedPage(1);
      }
    });
 
@@ -837,7 +1054,7 @@ window.addEventListener('DOMContentLoaded', function() {
        url.searchParams.set('view', 'top');
        window.history.pushState({}, '', url);
        // Refetch feed
-       fetchFeedPage(currentPage);
+       fetchFeedPage(1);
      }
    });
 
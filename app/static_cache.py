@@ -0,0 +1,200 @@
+"""
+app/static_cache.py
+
+Static file serving that keeps static requests out of Flask.
+
+`STATIC_SERVE` picks how `/static/...` (and `/`) are served:
+
+- ``flask`` (default): `app/assets.py:send_asset` through the Flask view
+- ``memory``: `StaticFileCache`, a WSGI middleware in front of Flask that
+  loads every static file (the hashed build with `STATIC_DIST=1`, else
+  `app/static/`) into memory at startup, with precomputed headers, ETags and
+  gzip/brotli variants. Hits never reach Flask routing, request hooks or the
+  database.
+- ``x-accel``: the Flask view answers with an empty body and an
+  ``X-Accel-Redirect`` to `STATIC_ACCEL_PREFIX`; nginx sends the file itself
+  (an ``internal`` location aliased to the served directory)
+- ``x-sendfile``: Flask's ``USE_X_SENDFILE``, for Apache/lighttpd
+
+With ``x-accel``/``x-sendfile`` the worker only builds headers. For offloading
+everything, let the front proxy serve `app/static/dist/` directly.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from werkzeug.http import parse_accept_header
+
+from app.assets import (
+    COMPRESSIBLE,
+    DIST_DIR,
+    EXTENSION_KEY as ASSETS_KEY,
+    IMMUTABLE,
+    MANIFEST,
+    MIN_COMPRESS_BYTES,
+    STATIC_DIR,
+)
+
+STATIC_SERVE_MODES = ("flask", "memory", "x-accel", "x-sendfile")
+# Larger files are left to the Flask view
+MAX_CACHED_FILE = 10 << 20
+
+try:
+    import brotli
+except ImportError:  # optional: gzip variants only
+    brotli = None
+
+
+class _CachedFile:
+    __slots__ = ("headers", "variants", "etags")
+
+    def __init__(self, data, mimetype, cache_control, variants):
+        self.headers = [("Content-Type", mimetype), ("Cache-Control", cache_control)]
+        if variants:
+            self.headers.append(("Vary", "Accept-Encoding"))
+        digest = hashlib.sha256(data).hexdigest()[:20]
+        # Variants in preference order; identity last
+        self.variants = [*variants, (None, data)]
+        self.etags = {
+            encoding: f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+            for encoding, _ in self.variants
+        }
+
+
+class StaticFileCache:
+    """WSGI middleware serving static files from memory.
+
+    `root` is either a `jeet assets build` output (has ``manifest.json``) or
+    a plain static directory. URLs not in the cache, and methods other than
+    GET/HEAD, go to `app`.
+    """
+
+    def __init__(self, app, root=STATIC_DIR, url_prefix="/static/"):
+        self.app = app
+        self.files = {}
+        self.bytes = 0
+        manifest = os.path.join(root, MANIFEST)
+        if os.path.isfile(manifest):
+            self._load_build(root, url_prefix)
+        else:
+            self._load_dir(root, url_prefix)
+
+    def _load_build(self, root, url_prefix):
+        from app.assets import AssetDist
+
+        dist = AssetDist(root)
+        for logical, name in dist.assets.items():
+            variants = []
+            for encoding in ("br", "gzip"):
+                if encoding in dist.encodings.get(name, ()):
+                    suffix = ".br" if encoding == "br" else ".gz"
+                    variants.append(
+                        (encoding, _read(os.path.join(root, name + suffix)))
+                    )
+            cache_control = IMMUTABLE if name in dist.hashed else "no-cache"
+            self._add(
+                url_prefix + name, os.path.join(root, name), cache_control, variants
+            )
+        if "index.html" in dist.assets:
+            self.files["/"] = self.files[url_prefix + dist.assets["index.html"]]
+
+    def _load_dir(self, root, url_prefix):
+        dist = os.path.abspath(DIST_DIR)
+        for dirpath, dirs, names in os.walk(root):
+            dirs[:] = [
+                d for d in dirs if os.path.abspath(os.path.join(dirpath, d)) != dist
+            ]
+            for name in names:
+                path = os.path.join(dirpath, name)
+                rel = os.path.relpath(path, root).replace(os.sep, "/")
+                self._add(url_prefix + rel, path, "no-cache", None)
+        if url_prefix + "index.html" in self.files:
+            self.files["/"] = self.files[url_prefix + "index.html"]
+
+    def _add(self, url, path, cache_control, variants):
+        if os.path.getsize(path) > MAX_CACHED_FILE:
+            return
+        data = _read(path)
+        if variants is None:
+            variants = _compress(path, data)
+        mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if mimetype.startswith("text/") or mimetype in (
+            "application/javascript",
+            "application/json",
+            "image/svg+xml",
+        ):
+            mimetype += "; charset=utf-8"
+        self.files[url] = _CachedFile(data, mimetype, cache_control, variants)
+        self.bytes += len(data) + sum(len(body) for _, body in variants)
+
+    def __call__(self, environ, start_response):
+        method = environ.get("REQUEST_METHOD")
+        cached = None
+        if method in ("GET", "HEAD"):
+            cached = self.files.get(environ.get("PATH_INFO", ""))
+        if cached is None:
+            return self.app(environ, start_response)
+
+        accept = environ.get("HTTP_ACCEPT_ENCODING", "")
+        encoding, body = _choose(cached.variants, accept)
+        etag = cached.etags[encoding]
+        headers = [*cached.headers, ("ETag", etag)]
+        if _etag_matches(environ.get("HTTP_IF_NONE_MATCH"), etag):
+            start_response("304 Not Modified", headers)
+            return [b""]
+        if encoding:
+            headers.append(("Content-Encoding", encoding))
+        headers.append(("Content-Length", str(len(body))))
+        start_response("200 OK", headers)
+        return [b"" if method == "HEAD" else body]
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _compress(path, data):
+    if os.path.splitext(path)[1] not in COMPRESSIBLE or len(data) < MIN_COMPRESS_BYTES:
+        return []
+    variants = []
+    if brotli is not None:
+        variants.append(("br", brotli.compress(data, quality=11)))
+    variants.append(("gzip", gzip.compress(data, 9, mtime=0)))
+    return variants
+
+
+def _choose(variants, accept_encoding):
+    """First variant the client accepts (q > 0); identity as the fallback."""
+    accept = parse_accept_header(accept_encoding)
+    for encoding, body in variants:
+        if encoding is None or accept[encoding] > 0:
+            return encoding, body
+    return variants[-1]
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def init_static_serving(app, settings):
+    """Apply `STATIC_SERVE`; returns the `StaticFileCache` in memory mode."""
+    mode = settings.static_serve
+    if mode not in STATIC_SERVE_MODES:
+        raise ValueError(f"STATIC_SERVE must be one of {', '.join(STATIC_SERVE_MODES)}")
+    if mode == "x-sendfile":
+        app.config["USE_X_SENDFILE"] = True
+    if mode != "memory":
+        return None
+    dist = app.extensions.get(ASSETS_KEY)
+    cache = StaticFileCache(app.wsgi_app, dist.root if dist else app.static_folder)
+    app.wsgi_app = cache
+    app.logger.info(
+        f"Static file cache: {len(cache.files)} files, {cache.bytes / 1024:.0f}KB"
+    )
+    return cache
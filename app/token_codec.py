@@ -0,0 +1,160 @@
+"""
+app/token_codec.py
+
+Compact, signed kindness tokens.
+
+Token format (v2)::
+
+    <kid>.<base64url(post_id:u64 | expiry:u32 | nonce:16 bytes | hmac_sha256)>
+
+`kid` names the signing key so secrets can be rotated: the first configured
+key signs new tokens and every configured key is accepted on verification.
+Legacy tokens (``<hexsig>|<expiry>|<nonce>|<post_id>``) are still verified
+against every configured key until they expire.
+
+The keyed HMAC state for each key is prepared once and cloned per token, so
+the secret is neither re-read from the environment nor re-encoded per call.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import struct
+import time
+
+TOKEN_TTL_SECONDS = 300
+
+_BODY = struct.Struct(">QI16s")
+_SIG_LEN = hashlib.sha256().digest_size
+_TOKEN_LEN = _BODY.size + _SIG_LEN
+
+
+def _encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+class TokenCodec:
+    """Sign and verify kindness tokens for a keyring of ``{kid: secret}``."""
+
+    def __init__(self, keys, ttl=TOKEN_TTL_SECONDS):
+        """
+        Args:
+            keys: ordered list of ``(kid, secret)`` pairs; the first signs.
+            ttl: token lifetime in seconds.
+        """
+        if not keys:
+            raise ValueError("TokenCodec requires at least one key")
+        self.ttl = ttl
+        self._macs = {}
+        for kid, secret in keys:
+            if not kid or "." in kid or "|" in kid:
+                raise ValueError(f"Invalid token key id: {kid!r}")
+            if isinstance(secret, str):
+                secret = secret.encode("utf-8")
+            self._macs[kid] = hmac.new(secret, digestmod=hashlib.sha256)
+        self.active_kid = keys[0][0]
+        self._active_mac = self._macs[self.active_kid]
+
+    def _sign(self, mac, payload):
+        h = mac.copy()
+        h.update(payload)
+        return h.digest()
+
+    def issue(self, post_id, now=None):
+        """Return a new token string for `post_id`."""
+        now = int(time.time()) if now is None else int(now)
+        body = _BODY.pack(int(post_id), now + self.ttl, secrets.token_bytes(16))
+        return f"{self.active_kid}.{_encode(body + self._sign(self._active_mac, body))}"
+
+    def decode(self, token, now=None):
+        """Verify `token` and return ``(post_id, nonce)``, or None if invalid.
+
+        `post_id` is an int for v2 tokens and the original string for legacy
+        tokens; `nonce` is always a string.
+        """
+        if not isinstance(token, str):
+            return None
+        now = int(time.time()) if now is None else int(now)
+        if "|" in token:
+            return self._decode_legacy(token, now)
+        kid, sep, data = token.partition(".")
+        mac = self._macs.get(kid)
+        if not sep or mac is None:
+            return None
+        try:
+            raw = base64.b64decode(
+                data + "=" * (-len(data) % 4), altchars=b"-_", validate=True
+            )
+        except (ValueError, TypeError):
+            return None
+        # Redemptions are deduplicated on the token string, so only the one
+        # canonical spelling of a token may verify
+        if len(raw) != _TOKEN_LEN or _encode(raw) != data:
+            return None
+        body, sig = raw[: _BODY.size], raw[-_SIG_LEN:]
+        if not hmac.compare_digest(self._sign(mac, body), sig):
+            return None
+        post_id, expiry, nonce = _BODY.unpack(body)
+        if expiry < now:
+            return None
+        return post_id, _encode(nonce)
+
+    def _decode_legacy(self, token, now):
+        try:
+            sig, expiry_s, nonce, post_id = token.split("|")
+            expiry = int(expiry_s)
+        except ValueError:
+            return None
+        # Reject other spellings of a signed payload (" 2000", "+2000", a
+        # post id carrying part of the nonce after a ":")
+        if str(expiry) != expiry_s or not post_id.isdigit() or ":" in nonce:
+            return None
+        if expiry < now:
+            return None
+        payload = f"{post_id}:{nonce}:{expiry}".encode("utf-8")
+        for mac in self._macs.values():
+            expected = self._sign(mac, payload).hex()
+            if hmac.compare_digest(expected, sig):
+                return post_id, nonce
+        return None
+
+
+def parse_keyring(spec):
+    """Parse ``"kid:secret,kid2:secret2"`` into a list of ``(kid, secret)``."""
+    keys = []
+    for entry in (spec or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        kid, sep, secret = entry.partition(":")
+        if not sep or not secret:
+            raise ValueError("KINDNESS_TOKEN_KEYS entries must look like kid:secret")
+        keys.append((kid.strip(), secret))
+    return keys
+
+
+def build_codec_from_env():
+    """Build a codec from `KINDNESS_TOKEN_KEYS`, falling back to `SECRET_KEY`."""
+    keys = parse_keyring(os.getenv("KINDNESS_TOKEN_KEYS"))
+    if not keys:
+        keys = [("k0", os.getenv("SECRET_KEY", "dev-secret"))]
+    return TokenCodec(keys)
+
+
+_codec = None
+
+
+def get_codec():
+    """Return the process-wide codec, building it on first use."""
+    global _codec
+    if _codec is None:
+        _codec = build_codec_from_env()
+    return _codec
+
+
+def reset_codec(codec=None):
+    """Replace the process-wide codec (None rebuilds it lazily from env)."""
+    global _codec
+    _codec = codec
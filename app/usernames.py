@@ -0,0 +1,224 @@
+"""
+app/usernames.py
+
+Anonymous username allocation (`<Adjective><Animal><NN>`).
+
+`UsernameAllocator` builds its pool on first use: a shuffled array of
+indices into the adjective × animal × number space, capped at `max_pool`
+entries for large word lists. Decoding an index is two `divmod`s, so each
+`allocate()` is O(1) no matter how long the lists are. Each worker process
+starts at its own random offset into the shared, deterministically
+shuffled pool and walks forward, so it hands out a contiguous slice that
+rarely overlaps other workers. Names issued within the last
+`recent_window` allocations are never reused.
+
+Custom word lists (one word per line, `#` comments allowed) are configured
+with `USERNAME_ADJECTIVES_FILE` / `USERNAME_ANIMALS_FILE`.
+"""
+
+import hashlib
+import os
+import random
+import threading
+import weakref
+from array import array
+from collections import deque
+
+MAX_USERNAME_LENGTH = 32
+DEFAULT_MAX_POOL = 1 << 18
+MAX_PREFIXES = 1 << 16
+
+# Forked workers re-pick their slice (threads' locks do not survive fork)
+_live_allocators = weakref.WeakSet()
+
+
+def _reseat_after_fork():
+    for allocator in list(_live_allocators):
+        allocator._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseat_after_fork)
+
+
+def load_words(path):
+    """Read a word list file, skipping blanks, comments and duplicates."""
+    words = []
+    seen = set()
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            word = line.split("#", 1)[0].strip()
+            if word and word not in seen:
+                seen.add(word)
+                words.append(word)
+    return words
+
+
+class UsernameAllocator:
+    """Hand out usernames from a precomputed shuffled pool."""
+
+    def __init__(
+        self,
+        adjectives,
+        animals,
+        numbers=range(10, 100),
+        recent_window=1000,
+        max_pool=DEFAULT_MAX_POOL,
+        seed=0,
+    ):
+        self.adjectives = list(adjectives)
+        self.animals = list(animals)
+        self.numbers = [str(n) for n in numbers]
+        if not (self.adjectives and self.animals and self.numbers):
+            raise ValueError("Username word lists must not be empty")
+        longest = (
+            max(map(len, self.adjectives))
+            + max(map(len, self.animals))
+            + max(map(len, self.numbers))
+        )
+        if longest > MAX_USERNAME_LENGTH:
+            raise ValueError(
+                f"Word lists can produce {longest}-character usernames "
+                f"(max {MAX_USERNAME_LENGTH})"
+            )
+        self.size = len(self.adjectives) * len(self.animals) * len(self.numbers)
+        self.max_pool = max_pool
+        self.seed = seed
+        pool_size = min(self.size, max_pool)
+        self.recent_window = max(0, min(int(recent_window), pool_size - 1))
+        self._pool = None
+        self._prefixes = None
+        self._cursor = None
+        self._lock = threading.Lock()
+        self._recent = deque()
+        self._recent_set = set()
+        _live_allocators.add(self)
+
+    def warm(self):
+        """Build the pool now (e.g. in a preloading master before fork)."""
+        if self._pool is None:
+            rng = random.Random(self.seed)
+            if self.size <= self.max_pool:
+                pool = array("L", range(self.size))
+                rng.shuffle(pool)
+            else:
+                pool = array("L", rng.sample(range(self.size), self.max_pool))
+            self._pool = pool
+            if len(self.adjectives) * len(self.animals) <= MAX_PREFIXES:
+                # Small lists: cache "<Adjective><Animal>" to save a concat
+                self._prefixes = [a + b for a in self.adjectives for b in self.animals]
+        return self
+
+    def _decode(self, index):
+        prefix, c = divmod(index, len(self.numbers))
+        if self._prefixes is not None:
+            return self._prefixes[prefix] + self.numbers[c]
+        a, b = divmod(prefix, len(self.animals))
+        return self.adjectives[a] + self.animals[b] + self.numbers[c]
+
+    def _reseat(self):
+        # New process (or first use): pick this worker's starting slice
+        self.warm()
+        self._cursor = random.SystemRandom().randrange(len(self._pool))
+        self._recent.clear()
+        self._recent_set.clear()
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._cursor = None
+
+    def allocate(self):
+        """Return the next username not issued within the recent window."""
+        with self._lock:
+            if self._cursor is None:
+                self._reseat()
+            pool = self._pool
+            n = len(pool)
+            recent = self._recent_set
+            for _ in range(n):
+                name = self._decode(pool[self._cursor])
+                self._cursor += 1
+                if self._cursor == n:
+                    self._cursor = 0
+                if name not in recent:
+                    break
+            if self.recent_window:
+                if len(self._recent) >= self.recent_window:
+                    recent.discard(self._recent.popleft())
+                self._recent.append(name)
+                recent.add(name)
+            return name
+
+    def remember(self, names):
+        """Mark externally issued names (e.g. from the database) as recent."""
+        with self._lock:
+            for name in names:
+                if name not in self._recent_set:
+                    self._remember(name)
+
+    def _remember(self, name):
+        if not self.recent_window:
+            return
+        if len(self._recent) >= self.recent_window:
+            self._recent_set.discard(self._recent.popleft())
+        self._recent.append(name)
+        self._recent_set.add(name)
+
+
+def build_allocator(settings):
+    """Create an allocator from `Settings` (word lists default to app.utils)."""
+    from app.utils import ADJECTIVES, ANIMALS
+
+    adjectives = ADJECTIVES
+    animals = ANIMALS
+    if settings.username_adjectives_file:
+        adjectives = load_words(settings.username_adjectives_file)
+    if settings.username_animals_file:
+        animals = load_words(settings.username_animals_file)
+    # Same seed in every worker so slices index one shared permutation
+    seed = int.from_bytes(
+        hashlib.sha256(settings.secret_key.encode("utf-8")).digest()[:8], "big"
+    )
+    return UsernameAllocator(
+        adjectives,
+        animals,
+        recent_window=settings.username_recent_window,
+        seed=seed,
+    )
+
+
+_allocator = None
+_configured_from = None
+
+
+def configure_allocator(settings):
+    """Install an allocator for `settings`, keeping the current pool if the
+    username settings are unchanged (settings reloads do not reshuffle)."""
+    global _allocator, _configured_from
+    key = (
+        settings.username_adjectives_file,
+        settings.username_animals_file,
+        settings.username_recent_window,
+        settings.secret_key,
+    )
+    if _allocator is None or key != _configured_from:
+        _allocator = build_allocator(settings)
+        _configured_from = key
+    return _allocator
+
+
+def get_allocator():
+    """Return the process-wide allocator, building a default one if unset."""
+    global _allocator
+    if _allocator is None:
+        from app.utils import ADJECTIVES, ANIMALS
+
+        _allocator = UsernameAllocator(ADJECTIVES, ANIMALS)
+    return _allocator
+
+
+def reset_allocator(allocator=None):
+    """Replace the process-wide allocator (None restores the default lazily)."""
+    global _allocator, _configured_from
+    _allocator = allocator
+    _configured_from = None
@@ -9,17 +9,15 @@ Utility functions for jeetSocial.
 - Timestamp display helpers
 """
 
-import random
 import re
 import logging
 import codecs
-import os
-import hmac
 import hashlib
-import time
-from secrets import token_urlsafe
 from datetime import datetime, timezone
 
+from app.token_codec import get_codec
+from app.usernames import get_allocator
+
 try:
     import pytz
 except Exception:
@@ -291,12 +289,9 @@ def generate_username():
     """
     Generates a random, anonymous username for posts.
     Format: <Adjective><Animal><2-digit number>
+    Names come from the process-wide allocator (see app/usernames.py).
     """
-    return (
-        f"{random.choice(ADJECTIVES)}"
-        f"{random.choice(ANIMALS)}"
-        f"{random.randint(10,99)}"
-    )
+    return get_allocator().allocate()
 
 
 def normalize_text(text):
@@ -356,31 +351,19 @@ def normalize_text_for_filter(text):
 
 
 def generate_kindness_token(post_id):
-    secret = os.getenv("SECRET_KEY", "dev-secret")
-    expiry = int(time.time()) + 300
-    nonce = token_urlsafe(16)
-    payload = f"{post_id}:{nonce}:{expiry}".encode("utf-8")
-    sig = hmac.new(secret.encode("utf-8"), payload, hashlib.sha256).hexdigest()
-    return f"{sig}|{expiry}|{nonce}|{post_id}"
+    """Issue a signed kindness token for `post_id` (see app/token_codec.py)."""
+    return get_codec().issue(post_id)
 
 
 def verify_kindness_token(token_string):
-    try:
-        sig, expiry_s, nonce, post_id = token_string.split("|")
-    except Exception:
-        return False
-    try:
-        expiry = int(expiry_s)
-    except Exception:
-        return False
-    if expiry < int(time.time()):
+    """Return the token nonce if `token_string` is valid and unexpired, else False.
+
+    Accepts both the compact key-id prefixed format and legacy hex tokens.
+    """
+    decoded = get_codec().decode(token_string)
+    if decoded is None:
         return False
-    secret = os.getenv("SECRET_KEY", "dev-secret")
-    payload = f"{post_id}:{nonce}:{expiry}".encode("utf-8")
-    expected = hmac.new(secret.encode("utf-8"), payload, hashlib.sha256).hexdigest()
-    if hmac.compare_digest(expected, sig):
-        return nonce
-    return False
+    return decoded[1]
 
 
 def hash_token_for_storage(token_string):
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_asgi_concurrency.py
+
+How many slow or long-lived clients can a server hold before the feed
+stalls? For each server, `--held` connections are opened first:
+
+- ``slow``: connections that send a partial request and then idle (the
+  cost a long-polling or slow mobile client imposes)
+- ``sse``: open ``GET /api/posts/stream`` event streams (ASGI only)
+
+`--clients` keep-alive pollers then hit ``GET /api/posts`` for
+`--seconds`. The script reports completed requests/s, the share of requests
+that timed out (5s), and p99 latency.
+
+Servers: ``sync`` and ``gthread`` (gunicorn with app/gunicorn_conf.py)
+versus ``asgi`` (``uvicorn --factory app.asgi:create_asgi_app``; needs
+``pip install -e .[asgi]``).
+
+Usage:
+    python benchmarks/bench_asgi_concurrency.py --held 50 --clients 16
+"""
+
+import argparse
+import http.client
+import importlib.util
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from bench_server_configs import ROOT, _free_port, _wait_ready, seed
+
+REQUEST_TIMEOUT = 5.0
+
+SERVERS = {
+    "sync": (
+        ["gunicorn", "-c", "python:app.gunicorn_conf", "app:create_app()"],
+        {"WEB_WORKER_CLASS": "sync"},
+    ),
+    "gthread": (
+        ["gunicorn", "-c", "python:app.gunicorn_conf", "app:create_app()"],
+        {"WEB_WORKER_CLASS": "gthread"},
+    ),
+    "asgi": (
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "--factory",
+            "app.asgi:create_asgi_app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            "{port}",
+            "--no-access-log",
+        ],
+        {},
+    ),
+}
+
+
+def hold(port, count, mode):
+    socks = []
+    for _ in range(count):
+        s = socket.create_connection(("127.0.0.1", port))
+        if mode == "sse":
+            s.sendall(b"GET /api/posts/stream HTTP/1.1\r\nHost: bench\r\n\r\n")
+        else:
+            s.sendall(b"GET /api/posts HTTP/1.1\r\nHost: bench\r\n")
+        socks.append(s)
+    return socks
+
+
+def poll(port, clients, seconds):
+    latencies, timeouts = [], [0]
+    lock = threading.Lock()
+    stop = time.monotonic() + seconds
+
+    def client():
+        local = []
+        conn = None
+        while time.monotonic() < stop:
+            if conn is None:
+                conn = http.client.HTTPConnection(
+                    "127.0.0.1", port, timeout=REQUEST_TIMEOUT
+                )
+            start = time.perf_counter()
+            try:
+                conn.request("GET", "/api/posts")
+                conn.getresponse().read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = None
+                with lock:
+                    timeouts[0] += 1
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sorted(latencies), timeouts[0]
+
+
+def run_server(name, database_url, held, mode, clients, seconds):
+    cmd, extra_env = SERVERS[name]
+    port = _free_port()
+    env = dict(os.environ)
+    env.update(extra_env)
+    env.update(
+        {
+            "DATABASE_URL": database_url,
+            "ENABLE_RATE_LIMITING": "false",
+            "WEB_BIND": f"127.0.0.1:{port}",
+            "WEB_TIMEOUT": "60",
+        }
+    )
+    cmd = [part.format(port=port) for part in cmd]
+    proc = subprocess.Popen(
+        cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    socks = []
+    try:
+        if not _wait_ready(port):
+            return None
+        socks = hold(port, held, mode)
+        time.sleep(0.5)
+        latencies, timeouts = poll(port, clients, seconds)
+    finally:
+        for s in socks:
+            s.close()
+        proc.terminate()
+        proc.wait(10)
+    total = len(latencies) + timeouts
+    return {
+        "rps": len(latencies) / seconds,
+        "timeout_pct": 100.0 * timeouts / total if total else 100.0,
+        "p99_ms": (
+            latencies[int(len(latencies) * 0.99) - 1] * 1000
+            if latencies
+            else float("nan")
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--held", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--servers", default=",".join(SERVERS))
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="jeet-bench-")
+    database_url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    seed(database_url, 200)
+
+    print(f"{'server':<9}{'held':>12}{'req/s':>10}{'timeouts':>10}{'p99':>11}")
+    for name in args.servers.split(","):
+        if name == "asgi" and importlib.util.find_spec("uvicorn") is None:
+            print(f"{name:<9} skipped (pip install -e .[asgi])")
+            continue
+        if name != "asgi" and shutil.which("gunicorn") is None:
+            print(f"{name:<9} skipped (gunicorn not installed)")
+            continue
+        modes = ["slow", "sse"] if name == "asgi" else ["slow"]
+        for mode in modes:
+            r = run_server(
+                name, database_url, args.held, mode, args.clients, args.seconds
+            )
+            if r is None:
+                print(f"{name:<9} failed to start")
+                continue
+            print(
+                f"{name:<9}{f'{args.held} {mode}':>12}{r['rps']:>10,.0f}"
+                f"{r['timeout_pct']:>9.1f}%{r['p99_ms']:>9.1f}ms"
+            )
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_feed_compression.py
+
+Bytes on the wire and server time for one live-feed poll (`GET /api/posts`
+with `limit` posts) in the full and compact (`compact=1`) shapes, uncompressed
+and gzip-compressed. Compressed requests are timed with the compressed-body
+cache cold (every poll compresses; `COMPRESS_CACHE_SIZE=0`) and warm (an
+unchanged feed is compressed once).
+
+Usage:
+    python benchmarks/bench_feed_compression.py --limit 50 --requests 500
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app, db  # noqa: E402
+from app.models import Post  # noqa: E402
+
+MESSAGE = "Sharing a little kindness today: thank you to whoever left the note "
+
+
+def make_app(limit, cache_size):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "ENABLE_RATE_LIMITING": False,
+            "COMPRESS_CACHE_SIZE": cache_size,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+        for i in range(limit):
+            db.session.add(
+                Post(username=f"GentleHeron{i % 90 + 10}", message=MESSAGE + str(i))
+            )
+        db.session.commit()
+    return app
+
+
+def measure(app, query, encoding, count):
+    client = app.test_client()
+    headers = {"Accept-Encoding": encoding} if encoding else {}
+    size = len(client.get(f"/api/posts?{query}", headers=headers).data)
+    start = time.perf_counter()
+    for _ in range(count):
+        client.get(f"/api/posts?{query}", headers=headers)
+    elapsed = time.perf_counter() - start
+    return size, elapsed / count * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    cold = make_app(args.limit, 0)
+    warm = make_app(args.limit, 256)
+    full = f"limit={args.limit}&cursor="
+    rows = [
+        ("full", cold, full, None),
+        ("full + gzip (cold)", cold, full, "gzip"),
+        ("full + gzip (cached)", warm, full, "gzip"),
+        ("compact", cold, full + "&compact=1", None),
+        ("compact + gzip (cold)", cold, full + "&compact=1", "gzip"),
+        ("compact + gzip (cached)", warm, full + "&compact=1", "gzip"),
+    ]
+    print(f"{'response':26}{'bytes':>9}{'vs full':>9}{'ms/req':>9}")
+    baseline = None
+    for label, app, query, encoding in rows:
+        size, ms = measure(app, query, encoding, args.requests)
+        baseline = baseline or size
+        print(f"{label:26}{size:>9}{size / baseline:>9.1%}{ms:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_json_provider.py
+
+`GET /api/posts` throughput and raw encode speed per JSON backend:
+
+- ``flask-default``: Flask's stock `DefaultJSONProvider` (the old behaviour)
+- ``stdlib``: `FastJSONProvider` without orjson
+- ``orjson``: `FastJSONProvider` with orjson (skipped when not installed)
+
+Requests go through the Flask test client against an in-memory SQLite feed,
+so the numbers include routing and the query; the encode column is just the
+serialisation of the same 50-post payload.
+
+Usage:
+    python benchmarks/bench_json_provider.py --requests 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from app import create_app, db, post_service, schemas  # noqa: E402
+from app.json_provider import orjson  # noqa: E402
+from app.models import Post  # noqa: E402
+
+
+def make_app(backend, posts):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "ENABLE_RATE_LIMITING": False,
+            "COMPRESS_RESPONSES": False,
+            "JSON_BACKEND": "stdlib" if backend == "flask-default" else backend,
+        }
+    )
+    if backend == "flask-default":
+        app.json = DefaultJSONProvider(app)
+    with app.app_context():
+        db.create_all()
+        for i in range(posts):
+            db.session.add(
+                Post(username=f"SwiftLark{i % 90 + 10}", message=f"kind words {i} ✨")
+            )
+        db.session.commit()
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--posts", type=int, default=50)
+    args = parser.parse_args()
+
+    backends = ["flask-default", "stdlib"] + (["orjson"] if orjson else [])
+    print(f"{'backend':<15}{'req/s':>10}{'encode µs':>12}")
+    for backend in backends:
+        app = make_app(backend, args.posts)
+        client = app.test_client()
+        url = f"/api/posts?limit={args.posts}&cursor="
+        client.get(url)
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            client.get(url)
+        rps = args.requests / (time.perf_counter() - start)
+
+        with app.app_context():
+            now = datetime.utcnow()
+            payload = schemas.to_builtins(
+                {
+                    "posts": [
+                        post_service.feed_item(p, now)
+                        for p in Post.query.limit(args.posts).all()
+                    ],
+                    "next_cursor": None,
+                }
+            )
+            count = args.requests * 5
+            start = time.perf_counter()
+            for _ in range(count):
+                app.json.dumps(payload)
+            encode_us = (time.perf_counter() - start) / count * 1e6
+        print(f"{backend:<15}{rps:>10,.0f}{encode_us:>12.1f}")
+    if orjson is None:
+        print("orjson        skipped (pip install -e .[fast])")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_kindness_batch.py
+
+Compare per-post kindness token issuance (`POST /api/kindness/token`, one
+request per post) against batch issuance (`POST /api/kindness/tokens`).
+Reports HTTP round trips, wall time and CPU time per token using the Flask
+test client against an in-memory SQLite database.
+
+Usage:
+    python benchmarks/bench_kindness_batch.py --posts 50 --repeat 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("ENABLE_KINDNESS_POINTS", "1")
+
+from app import create_app, db  # noqa: E402
+from app.models import Post  # noqa: E402
+
+
+def _setup(n_posts):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "ENABLE_RATE_LIMITING": False,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(
+            Post(username="BenchFox10", message=f"bench {i}") for i in range(n_posts)
+        )
+        db.session.commit()
+        ids = [row[0] for row in db.session.query(Post.id).all()]
+    return app, ids
+
+
+def _measure(fn, repeat):
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    trips = 0
+    for _ in range(repeat):
+        trips += fn()
+    return time.perf_counter() - wall, time.process_time() - cpu, trips
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--posts", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app, ids = _setup(args.posts)
+    client = app.test_client()
+
+    def single():
+        for pid in ids:
+            resp = client.post(f"/api/kindness/token?post_id={pid}")
+            assert resp.status_code == 200
+        return len(ids)
+
+    def batch():
+        resp = client.post("/api/kindness/tokens", json={"post_ids": ids})
+        assert resp.status_code == 200
+        assert len(resp.get_json()["tokens"]) == len(ids)
+        return 1
+
+    tokens = len(ids) * args.repeat
+    print(f"{'mode':<8}{'round trips':>14}{'wall us/token':>16}{'cpu us/token':>15}")
+    for name, fn in (("single", single), ("batch", batch)):
+        wall, cpu, trips = _measure(fn, args.repeat)
+        print(
+            f"{name:<8}{trips:>14}{wall / tokens * 1e6:>16.1f}"
+            f"{cpu / tokens * 1e6:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_kindness_parsing.py
+
+Before/after latency of kindness request parsing. "before" replays the
+original redeem parsing path (header/body debug dumps, JSON -> form ->
+json.loads fallbacks, per-request os.getenv flag checks); "after" is the
+shared single-pass `_kindness_params` extractor with the config-cached flag.
+Each is timed inside a request context with the logger at INFO and at DEBUG,
+net of the cost of pushing the request context itself.
+
+Usage:
+    python benchmarks/bench_kindness_parsing.py --count 20000
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("ENABLE_KINDNESS_POINTS", "1")
+
+from flask import current_app, request  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.routes import _kindness_enabled, _kindness_params  # noqa: E402
+
+
+def before():
+    log = current_app.logger
+    try:
+        log.debug(f"[KINDNESS] Headers: {dict(request.headers)}")
+        raw_body = request.get_data(as_text=True)
+        if raw_body:
+            log.debug(f"[KINDNESS] Raw body: {raw_body}")
+    except Exception:
+        pass
+    if not os.getenv("ENABLE_KINDNESS_POINTS", "0") == "1":
+        val = os.getenv("ENABLE_KINDNESS_POINTS", "0")
+        log.debug(f"[KINDNESS-SERVER] ENABLE_KINDNESS_POINTS={val}")
+        return None
+    try:
+        data = request.get_json(silent=True)
+    except Exception:
+        data = None
+    if not data:
+        if request.form:
+            data = request.form.to_dict()
+        else:
+            raw = request.get_data(as_text=True)
+            try:
+                data = json.loads(raw) if raw else None
+            except Exception:
+                data = None
+    log.debug(f"[KINDNESS-SERVER] request.args: {dict(request.args)}")
+    log.debug(f"[KINDNESS-SERVER] parsed data before fallback: {data}")
+    if not data or "post_id" not in data or "token" not in data:
+        post_id_arg = request.args.get("post_id")
+        token_arg = request.args.get("token")
+        log.debug(
+            f"[KINDNESS-SERVER] fallback args - post_id_arg: {post_id_arg} "
+            f"token_arg present? {bool(token_arg)}"
+        )
+        data = {"post_id": post_id_arg, "token": token_arg}
+    log.debug(f"[KINDNESS-SERVER] final redeem data: {data}")
+    return data
+
+
+def after():
+    if not _kindness_enabled():
+        return None
+    return _kindness_params("post_id", "token")
+
+
+REQUESTS = {
+    "json": dict(json={"post_id": 1, "token": "k0.abc"}),
+    "form": dict(data={"post_id": "1", "token": "k0.abc"}),
+    "query": dict(query_string={"post_id": "1", "token": "k0.abc"}),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite://"})
+    # Swallow DEBUG output so the benchmark measures formatting, not I/O
+    app.logger.handlers[:] = [logging.NullHandler()]
+    app.logger.propagate = False
+
+    def baseline():
+        return {"post_id": 1}
+
+    # Request-context setup dominates; report parsing cost net of a no-op run
+    print(f"{'encoding':<10}{'log level':<11}{'before us':>11}{'after us':>10}")
+    for level in (logging.INFO, logging.DEBUG):
+        app.logger.setLevel(level)
+        for name, kwargs in REQUESTS.items():
+            row = []
+            for fn in (baseline, before, after):
+                # Untimed warm-up so the first function is not penalised
+                for _ in range(args.count // 10):
+                    with app.test_request_context(
+                        "/api/kindness/redeem", method="POST", **kwargs
+                    ):
+                        fn()
+                start = time.perf_counter()
+                for _ in range(args.count):
+                    with app.test_request_context(
+                        "/api/kindness/redeem", method="POST", **kwargs
+                    ):
+                        assert fn()["post_id"] is not None
+                row.append((time.perf_counter() - start) / args.count * 1e6)
+            print(
+                f"{name:<10}{logging.getLevelName(level):<11}"
+                f"{row[1] - row[0]:>11.1f}{row[2] - row[0]:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env node
+/*
+benchmarks/bench_polling_scheduler.js
+
+Feed polling request rate for the old fixed 15s interval (every open tab polls,
+visible or not) versus FeedPollScheduler (app/static/feed_scheduler.js) in
+simulated multi-tab sessions. The simulation runs on a virtual clock:
+
+- posts arrive at random (mean gap --post-gap seconds)
+- the user alternates between active stretches (one visible tab, which
+  changes every couple of minutes, input every ~20s) and away stretches
+  (all tabs hidden)
+- tabs talk over a simulated BroadcastChannel
+
+Reported per tab count: GET /api/posts per hour, the reduction, and how long
+a new post takes to reach the visible tab (counted from when it was posted
+or when the user came back, whichever is later).
+
+Usage:
+    node benchmarks/bench_polling_scheduler.js --hours 4 --tabs 1,3,5,10
+*/
+
+const path = require('path');
+const { FeedPollScheduler } = require(path.join(__dirname, '..', 'app', 'static', 'feed_scheduler.js'));
+
+function parseArgs(argv) {
+  const args = { hours: 4, tabs: '1,3,5,10', postGap: 120, seed: 1 };
+  for (let i = 2; i < argv.length; i += 2) {
+    const key = argv[i].replace(/^--/, '').replace(/-(.)/g, (_, c) => c.toUpperCase());
+    args[key] = key === 'tabs' ? argv[i + 1] : Number(argv[i + 1]);
+  }
+  return args;
+}
+
+// Small seeded PRNG (mulberry32) so runs are repeatable
+function prng(seed) {
+  let a = seed >>> 0;
+  return () => {
+    a = (a + 0x6d2b79f5) >>> 0;
+    let t = a;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+class VirtualClock {
+  constructor() {
+    this.time = 0;
+    this.queue = [];
+    this.seq = 0;
+    this.cancelled = new Set();
+  }
+
+  setTimeout(fn, ms) {
+    const id = ++this.seq;
+    const event = { at: this.time + Math.max(0, ms || 0), id, fn };
+    let lo = 0;
+    let hi = this.queue.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (this.queue[mid].at <= event.at) lo = mid + 1;
+      else hi = mid;
+    }
+    this.queue.splice(lo, 0, event);
+    return id;
+  }
+
+  clearTimeout(id) {
+    if (id !== null && id !== undefined) this.cancelled.add(id);
+  }
+
+  async run(until) {
+    while (this.queue.length && this.queue[0].at <= until) {
+      const event = this.queue.shift();
+      if (this.cancelled.delete(event.id)) continue;
+      this.time = event.at;
+      event.fn();
+      // Let awaited polls resolve before the next timer fires
+      await new Promise(resolve => setImmediate(resolve));
+    }
+    this.time = until;
+  }
+}
+
+class Bus {
+  constructor(clock) {
+    this.clock = clock;
+    this.members = [];
+  }
+
+  channel() {
+    const bus = this;
+    const member = {
+      listeners: [],
+      addEventListener(_type, fn) { this.listeners.push(fn); },
+      postMessage(data) {
+        bus.members.forEach(other => {
+          if (other === member) return;
+          bus.clock.setTimeout(() => other.listeners.forEach(fn => fn({ data })), 1);
+        });
+      },
+    };
+    this.members.push(member);
+    return member;
+  }
+}
+
+function simulate(tabCount, mode, args) {
+  const rand = prng(args.seed * 7919 + tabCount);
+  const clock = new VirtualClock();
+  const bus = new Bus(clock);
+  const duration = args.hours * 3600 * 1000;
+  const posts = []; // creation times
+  let requests = 0;
+  let visibleTab = -1;
+  let activeSince = 0;
+  let seenCount = 0;
+  const lags = [];
+  const exp = mean => -Math.log(1 - rand()) * mean;
+
+  function markSeen(tab, count) {
+    if (tab !== visibleTab) return;
+    for (; seenCount < count; seenCount++) {
+      lags.push(clock.time - Math.max(posts[seenCount], activeSince));
+    }
+  }
+
+  // Feed: new posts arrive over time
+  (function schedulePost() {
+    clock.setTimeout(() => {
+      posts.push(clock.time);
+      schedulePost();
+    }, exp(args.postGap * 1000));
+  })();
+
+  const tabs = [];
+  for (let i = 0; i < tabCount; i++) {
+    const tab = { index: i, lastCount: 0 };
+    if (mode === 'fixed') {
+      // Old behaviour: setInterval(15s) in every tab, visible or not
+      (function tick() {
+        clock.setTimeout(() => {
+          requests += 1;
+          markSeen(i, posts.length);
+          tick();
+        }, 15000);
+      })();
+    } else {
+      tab.scheduler = new FeedPollScheduler({
+        id: `tab-${i}`,
+        channel: bus.channel(),
+        now: () => clock.time,
+        setTimeout: (fn, ms) => clock.setTimeout(fn, ms),
+        clearTimeout: id => clock.clearTimeout(id),
+        visible: false,
+        poll: async () => {
+          requests += 1;
+          const count = posts.length;
+          const changed = count !== tab.lastCount;
+          tab.lastCount = count;
+          markSeen(i, count);
+          return { changed, payload: count };
+        },
+        onShared: count => {
+          tab.lastCount = count;
+          markSeen(i, count);
+        },
+      });
+      tab.scheduler.start();
+    }
+    tabs.push(tab);
+  }
+
+  function show(index) {
+    visibleTab = index;
+    tabs.forEach(tab => tab.scheduler && tab.scheduler.setVisible(tab.index === index));
+  }
+
+  // User: active stretches (mean 5 min) alternate with away stretches (mean 10 min)
+  function activeStretch() {
+    const end = clock.time + exp(5 * 60 * 1000);
+    activeSince = clock.time;
+    show(Math.floor(rand() * tabCount));
+    (function switchTab() {
+      clock.setTimeout(() => {
+        if (clock.time >= end) return;
+        show(Math.floor(rand() * tabCount));
+        switchTab();
+      }, exp(2 * 60 * 1000));
+    })();
+    (function interact() {
+      clock.setTimeout(() => {
+        if (clock.time >= end) return;
+        const tab = tabs[visibleTab];
+        if (tab && tab.scheduler) tab.scheduler.noteActivity();
+        interact();
+      }, exp(20 * 1000));
+    })();
+    clock.setTimeout(() => {
+      show(-1);
+      clock.setTimeout(activeStretch, exp(10 * 60 * 1000));
+    }, end - clock.time);
+  }
+  activeStretch();
+
+  return clock.run(duration).then(() => {
+    lags.sort((a, b) => a - b);
+    const mean = lags.length ? lags.reduce((a, b) => a + b, 0) / lags.length : NaN;
+    return {
+      perHour: requests / args.hours,
+      lagMean: mean / 1000,
+      lagP95: lags.length ? lags[Math.floor(lags.length * 0.95)] / 1000 : NaN,
+    };
+  });
+}
+
+async function main() {
+  const args = parseArgs(process.argv);
+  console.log(`${'tabs'.padEnd(6)}${'mode'.padEnd(11)}${'req/hour'.padStart(10)}${'reduction'.padStart(11)}${'lag mean'.padStart(10)}${'lag p95'.padStart(10)}`);
+  for (const tabCount of args.tabs.split(',').map(Number)) {
+    const fixed = await simulate(tabCount, 'fixed', args);
+    const adaptive = await simulate(tabCount, 'adaptive', args);
+    for (const [mode, r] of [['fixed', fixed], ['adaptive', adaptive]]) {
+      const reduction = mode === 'fixed' ? '' : `${(100 * (1 - r.perHour / fixed.perHour)).toFixed(1)}%`;
+      console.log(
+        `${String(tabCount).padEnd(6)}${mode.padEnd(11)}${r.perHour.toFixed(0).padStart(10)}` +
+        `${reduction.padStart(11)}${`${r.lagMean.toFixed(1)}s`.padStart(10)}${`${r.lagP95.toFixed(1)}s`.padStart(10)}`
+      );
+    }
+  }
+}
+
+main();
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_post_batching.py
+
+Load test for `POST /api/posts`: per-request commits versus the group-commit
+writer (ENABLE_POST_BATCHING). Concurrent client threads post through the
+Flask test client; reports posts per second and p50/p99 latency.
+
+Defaults to a throwaway on-disk SQLite database (so commits really sync);
+pass --database-url to run against Postgres, where each avoided commit is an
+avoided WAL fsync.
+
+Usage:
+    python benchmarks/bench_post_batching.py --posts 2000 --concurrency 32
+    python benchmarks/bench_post_batching.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app, db  # noqa: E402
+from app.post_writer import get_post_writer  # noqa: E402
+
+
+def run(database_url, batching, posts, concurrency, batch_size, delay_ms):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": database_url,
+            "ENABLE_RATE_LIMITING": False,
+            "ENABLE_POST_BATCHING": batching,
+            "POST_BATCH_SIZE": batch_size,
+            "POST_BATCH_DELAY_MS": delay_ms,
+        }
+    )
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+    latencies = []
+    lock = threading.Lock()
+    per_thread = posts // concurrency
+
+    def worker(n):
+        client = app.test_client()
+        local = []
+        for i in range(per_thread):
+            start = time.perf_counter()
+            resp = client.post("/api/posts", json={"message": f"load {n}-{i}"})
+            local.append(time.perf_counter() - start)
+            assert resp.status_code == 201, resp.get_json()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    writer = get_post_writer(app)
+    if writer is not None:
+        writer.close()
+    with app.app_context():
+        db.drop_all()
+        db.session.remove()
+        db.engine.dispose()
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return len(latencies) / elapsed, statistics.median(latencies), p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--delay-ms", type=float, default=5.0)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    print(f"{'mode':<14}{'posts/s':>10}{'p50 ms':>9}{'p99 ms':>9}")
+    for batching in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            url = args.database_url or f"sqlite:///{tmp}/bench.db"
+            rate, p50, p99 = run(
+                url,
+                batching,
+                args.posts,
+                args.concurrency,
+                args.batch_size,
+                args.delay_ms,
+            )
+        name = "group-commit" if batching else "per-request"
+        print(f"{name:<14}{rate:>10.0f}{p50 * 1e3:>9.2f}{p99 * 1e3:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
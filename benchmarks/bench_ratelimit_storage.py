@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_ratelimit_storage.py
+
+Per-request overhead of rate limiting on the `POST /api/posts` path for:
+no limiter, Flask-Limiter's default in-memory storage, and the shared
+SQLite storage (on /dev/shm when available). Each mode runs in a fresh
+interpreter because the limiter is bound when the routes module loads.
+
+Usage:
+    python benchmarks/bench_ratelimit_storage.py --count 2000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+
+def _shared_path():
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, f"jeet-bench-ratelimit-{os.getpid()}.db")
+
+
+def run_mode(mode, count):
+    import warnings
+
+    warnings.simplefilter("ignore")
+    from app import create_app, db
+
+    config = {
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "ENABLE_RATE_LIMITING": mode != "none",
+        # High enough that no request is rejected; we measure bookkeeping only
+        "RATE_LIMIT": "1000000/minute",
+    }
+    if mode == "sqlite":
+        config["RATELIMIT_STORAGE_URI"] = f"sqlite:///{_shared_path()}"
+    app = create_app(config)
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+    for i in range(50):
+        client.post("/api/posts", json={"message": f"warm up {i}"})
+    start = time.perf_counter()
+    for i in range(count):
+        resp = client.post("/api/posts", json={"message": f"bench post {i}"})
+        assert resp.status_code == 201, resp.status_code
+    elapsed = time.perf_counter() - start
+    if mode == "sqlite":
+        os.unlink(_shared_path())
+    print(f"{elapsed / count * 1e6:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--mode", choices=["none", "memory", "sqlite"])
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.count)
+        return
+
+    results = {}
+    for mode in ("none", "memory", "sqlite"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--count", str(args.count)],
+            check=True,
+            capture_output=True,
+            text=True,
+            cwd=ROOT,
+        )
+        results[mode] = float(out.stdout.strip().splitlines()[-1])
+    print(f"{'storage':<10}{'us/request':>12}{'limiter overhead us':>22}")
+    for mode, us in results.items():
+        print(f"{mode:<10}{us:>12.1f}{us - results['none']:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
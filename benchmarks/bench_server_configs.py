@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_server_configs.py
+
+Compare gunicorn configurations for the polling feed (`GET /api/posts`):
+
+- ``bare``: the old ``gunicorn --bind`` (one sync worker, no preload)
+- ``sync``: app/gunicorn_conf.py with sync workers
+- ``gthread``: app/gunicorn_conf.py defaults (workers × threads, preload)
+- ``gevent``: app/gunicorn_conf.py with WEB_WORKER_CLASS=gevent (skipped
+  when gevent is not installed)
+
+Each configuration is started against the same seeded on-disk SQLite
+database. Keep-alive HTTP clients then poll the feed for a fixed time, and
+the script reports time to first response, requests/s, p50/p99 latency and
+the total RSS of the server processes.
+
+Usage:
+    python benchmarks/bench_server_configs.py --seconds 10 --clients 32
+"""
+
+import argparse
+import http.client
+import importlib.util
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+CONFIGS = {
+    "bare": (["--bind", "{bind}"], {}),
+    "sync": (["-c", "python:app.gunicorn_conf"], {"WEB_WORKER_CLASS": "sync"}),
+    "gthread": (["-c", "python:app.gunicorn_conf"], {"WEB_WORKER_CLASS": "gthread"}),
+    "gevent": (["-c", "python:app.gunicorn_conf"], {"WEB_WORKER_CLASS": "gevent"}),
+}
+
+
+def seed(database_url, posts):
+    from app import create_app, db
+    from app.models import Post
+
+    app = create_app({"SQLALCHEMY_DATABASE_URI": database_url})
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(
+            Post(username=f"BenchOwl{i % 90 + 10}", message=f"post {i}")
+            for i in range(posts)
+        )
+        db.session.commit()
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rss_kb(pid):
+    total = 0
+    pids = [pid]
+    try:
+        children = subprocess.run(
+            ["pgrep", "-P", str(pid)], capture_output=True, text=True
+        ).stdout.split()
+        pids += [int(p) for p in children]
+    except FileNotFoundError:
+        pass
+    for p in pids:
+        try:
+            with open(f"/proc/{p}/status") as fh:
+                for line in fh:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+        except OSError:
+            pass
+    return total
+
+
+def _wait_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/posts")
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+def load(port, clients, seconds):
+    latencies = []
+    lock = threading.Lock()
+    stop = time.monotonic() + seconds
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        local = []
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            try:
+                conn.request("GET", "/api/posts")
+                resp = conn.getresponse()
+                resp.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies
+
+
+def run_config(name, database_url, clients, seconds):
+    args, extra_env = CONFIGS[name]
+    port = _free_port()
+    bind = f"127.0.0.1:{port}"
+    env = dict(os.environ)
+    env.update(extra_env)
+    env.update(
+        {
+            "DATABASE_URL": database_url,
+            "ENABLE_RATE_LIMITING": "false",
+            "WEB_BIND": bind,
+            "WEB_ACCESS_LOG": "",
+        }
+    )
+    cmd = [shutil.which("gunicorn") or "gunicorn"]
+    cmd += [a.format(bind=bind) for a in args] + ["app:create_app()"]
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        if not _wait_ready(port):
+            return None
+        ready = time.perf_counter() - started
+        latencies = load(port, clients, seconds)
+        rss = _rss_kb(proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait(10)
+    latencies.sort()
+    return {
+        "ready_s": ready,
+        "rps": len(latencies) / seconds,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "rss_mb": rss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--configs", default=",".join(CONFIGS))
+    args = parser.parse_args()
+
+    if shutil.which("gunicorn") is None:
+        sys.exit("gunicorn is not installed (pip install -r requirements-runtime.txt)")
+    tmpdir = tempfile.mkdtemp(prefix="jeet-bench-")
+    database_url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    seed(database_url, args.posts)
+
+    print(f"{'config':<9}{'ready':>8}{'req/s':>10}{'p50':>10}{'p99':>10}{'RSS':>10}")
+    for name in args.configs.split(","):
+        if name == "gevent" and importlib.util.find_spec("gevent") is None:
+            print(f"{name:<9} skipped (gevent not installed)")
+            continue
+        result = run_config(name, database_url, args.clients, args.seconds)
+        if result is None:
+            print(f"{name:<9} failed to start")
+            continue
+        print(
+            f"{name:<9}{result['ready_s']:>7.2f}s{result['rps']:>10,.0f}"
+            f"{result['p50_ms']:>8.1f}ms{result['p99_ms']:>8.1f}ms"
+            f"{result['rss_mb']:>8.0f}MB"
+        )
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_static_serving.py
+
+Static requests per second through gunicorn for each `STATIC_SERVE` mode:
+
+- ``flask``: the Flask view (`send_asset` -> `send_static_file`)
+- ``flask+dist``: the Flask view serving the hashed, precompressed build
+- ``memory`` / ``memory+dist``: `StaticFileCache` in front of Flask
+- ``x-accel``: what the worker still does when nginx sends the file (an
+  empty response with ``X-Accel-Redirect``); nginx's own cost is not included
+
+Keep-alive clients fetch `/`, the stylesheet, both scripts and the favicon in
+turn with ``Accept-Encoding: gzip``, revalidating with ``If-None-Match``
+every fourth request like a browser reloading the page.
+
+Usage:
+    python benchmarks/bench_static_serving.py --seconds 5 --clients 16
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+MODES = {
+    "flask": {"STATIC_SERVE": "flask"},
+    "flask+dist": {"STATIC_SERVE": "flask", "STATIC_DIST": "1"},
+    "memory": {"STATIC_SERVE": "memory"},
+    "memory+dist": {"STATIC_SERVE": "memory", "STATIC_DIST": "1"},
+    "x-accel": {"STATIC_SERVE": "x-accel", "STATIC_DIST": "1"},
+}
+SOURCES = ["styles.css", "main.js", "feed_scheduler.js", "favicon.svg"]
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _urls(dist_dir, use_dist):
+    names = SOURCES
+    if use_dist:
+        with open(os.path.join(dist_dir, "manifest.json")) as f:
+            assets = json.load(f)["assets"]
+        names = [assets[n] for n in SOURCES]
+    return ["/"] + [f"/static/{n}" for n in names]
+
+
+def _wait_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/static/favicon.svg")
+            conn.getresponse().read()
+            return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+def load(port, urls, clients, seconds):
+    latencies = []
+    lock = threading.Lock()
+    stop = time.monotonic() + seconds
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        etags = {}
+        local = []
+        i = 0
+        while time.monotonic() < stop:
+            url = urls[i % len(urls)]
+            headers = {"Accept-Encoding": "gzip"}
+            if i % 4 == 3 and url in etags:
+                headers["If-None-Match"] = etags[url]
+            i += 1
+            start = time.perf_counter()
+            try:
+                conn.request("GET", url, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+                continue
+            if resp.getheader("ETag"):
+                etags[url] = resp.getheader("ETag")
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies
+
+
+def run_mode(name, dist_dir, database_url, args):
+    port = _free_port()
+    env = dict(os.environ)
+    env.update(MODES[name])
+    env.update(
+        {
+            "DATABASE_URL": database_url,
+            "STATIC_DIST_DIR": dist_dir,
+            "ENABLE_RATE_LIMITING": "false",
+            "WEB_BIND": f"127.0.0.1:{port}",
+            "WEB_WORKERS": str(args.workers),
+            "WEB_ACCESS_LOG": "",
+        }
+    )
+    cmd = [
+        shutil.which("gunicorn"),
+        "-c",
+        "python:app.gunicorn_conf",
+        "app:create_app()",
+    ]
+    proc = subprocess.Popen(
+        cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        if not _wait_ready(port):
+            return None
+        urls = _urls(dist_dir, "STATIC_DIST" in MODES[name])
+        latencies = load(port, urls, args.clients, args.seconds)
+    finally:
+        proc.terminate()
+        proc.wait(10)
+    latencies.sort()
+    return {
+        "rps": len(latencies) / args.seconds,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--modes", default=",".join(MODES))
+    args = parser.parse_args()
+
+    if shutil.which("gunicorn") is None:
+        sys.exit("gunicorn is not installed (pip install -r requirements-runtime.txt)")
+    from app import assets, create_app, db
+
+    tmpdir = tempfile.mkdtemp(prefix="jeet-bench-")
+    dist_dir = os.path.join(tmpdir, "dist")
+    assets.build(out=dist_dir)
+    database_url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    app = create_app({"SQLALCHEMY_DATABASE_URI": database_url})
+    with app.app_context():
+        db.create_all()
+
+    print(f"{'mode':<13}{'req/s':>10}{'p50':>10}{'p99':>10}")
+    for name in args.modes.split(","):
+        result = run_mode(name, dist_dir, database_url, args)
+        if result is None:
+            print(f"{name:<13} failed to start")
+            continue
+        print(
+            f"{name:<13}{result['rps']:>10,.0f}"
+            f"{result['p50_ms']:>8.2f}ms{result['p99_ms']:>8.2f}ms"
+        )
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
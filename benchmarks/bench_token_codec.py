@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_token_codec.py
+
+Kindness token throughput (tokens per second) for the original hex/`os.getenv`
+implementation versus `app.token_codec.TokenCodec`.
+
+Usage:
+    python benchmarks/bench_token_codec.py --count 50000
+"""
+
+import argparse
+import hashlib
+import hmac
+import os
+import sys
+import time
+from secrets import token_urlsafe
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.token_codec import TokenCodec  # noqa: E402
+
+
+def legacy_generate(post_id):
+    secret = os.getenv("SECRET_KEY", "dev-secret")
+    expiry = int(time.time()) + 300
+    nonce = token_urlsafe(16)
+    payload = f"{post_id}:{nonce}:{expiry}".encode("utf-8")
+    sig = hmac.new(secret.encode("utf-8"), payload, hashlib.sha256).hexdigest()
+    return f"{sig}|{expiry}|{nonce}|{post_id}"
+
+
+def legacy_verify(token_string):
+    sig, expiry_s, nonce, post_id = token_string.split("|")
+    expiry = int(expiry_s)
+    if expiry < int(time.time()):
+        return False
+    secret = os.getenv("SECRET_KEY", "dev-secret")
+    payload = f"{post_id}:{nonce}:{expiry}".encode("utf-8")
+    expected = hmac.new(secret.encode("utf-8"), payload, hashlib.sha256).hexdigest()
+    return nonce if hmac.compare_digest(expected, sig) else False
+
+
+def _rate(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=50000)
+    args = parser.parse_args()
+
+    codec = TokenCodec([("k0", os.getenv("SECRET_KEY", "dev-secret"))])
+    ids = list(range(1, args.count + 1))
+    legacy_tokens = [legacy_generate(i) for i in ids]
+    codec_tokens = [codec.issue(i) for i in ids]
+
+    print(f"{'codec':<8}{'issue tok/s':>14}{'verify tok/s':>15}{'bytes':>8}")
+    print(
+        f"{'legacy':<8}{_rate(legacy_generate, ids):>14,.0f}"
+        f"{_rate(legacy_verify, legacy_tokens):>15,.0f}{len(legacy_tokens[0]):>8}"
+    )
+    print(
+        f"{'v2':<8}{_rate(codec.issue, ids):>14,.0f}"
+        f"{_rate(codec.decode, codec_tokens):>15,.0f}{len(codec_tokens[0]):>8}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+benchmarks/bench_usernames.py
+
+Username generation throughput (names per second) for the original three
+`random` calls per name versus `app.usernames.UsernameAllocator`, and how
+many duplicates each produces within a window of recent names.
+
+Usage:
+    python benchmarks/bench_usernames.py --count 200000 --window 1000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.usernames import UsernameAllocator  # noqa: E402
+from app.utils import ADJECTIVES, ANIMALS  # noqa: E402
+
+
+def legacy_generate():
+    return (
+        f"{random.choice(ADJECTIVES)}"
+        f"{random.choice(ANIMALS)}"
+        f"{random.randint(10,99)}"
+    )
+
+
+def _run(fn, count, window):
+    recent = deque(maxlen=window)
+    seen = set()
+    dupes = 0
+    start = time.perf_counter()
+    names = [fn() for _ in range(count)]
+    elapsed = time.perf_counter() - start
+    for name in names:
+        if name in seen:
+            dupes += 1
+        if len(recent) == window:
+            seen.discard(recent[0])
+        recent.append(name)
+        seen.add(name)
+    return count / elapsed, dupes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--window", type=int, default=1000)
+    args = parser.parse_args()
+
+    allocator = UsernameAllocator(ADJECTIVES, ANIMALS, recent_window=args.window)
+    start = time.perf_counter()
+    allocator.warm()
+    warm_ms = (time.perf_counter() - start) * 1000
+
+    for label, fn in (("legacy", legacy_generate), ("allocator", allocator.allocate)):
+        rate, dupes = _run(fn, args.count, args.window)
+        print(f"{label:<10} {rate:>12,.0f} names/s  {dupes} repeats in window")
+    print(f"pool build: {warm_ms:.1f} ms ({allocator.size:,} combinations)")
+
+
+if __name__ == "__main__":
+    main()
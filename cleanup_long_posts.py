@@ -2,11 +2,14 @@
 """
 cleanup_long_posts.py
 
-One-time script to clean up existing posts that exceed the 280 character limit.
-This script can either delete or truncate posts that are too long.
+Clean up existing posts that exceed the 280 character limit, either by
+deleting or truncating them. Work is done by the chunked maintenance engine
+in `app/maintenance.py`: set-based UPDATE/DELETE statements over bounded id
+ranges, one short transaction per range, with a resumable checkpoint.
+Equivalent to `jeet maintain truncate-long-posts` / `delete-long-posts`.
 
 Usage:
-    python cleanup_long_posts.py --dry-run          # Preview changes (default)
+    python cleanup_long_posts.py --dry-run          # Count affected posts (default)
     python cleanup_long_posts.py --delete           # Delete long posts
     python cleanup_long_posts.py --truncate         # Truncate long posts to 280 chars
     python cleanup_long_posts.py --help             # Show help
@@ -15,6 +18,7 @@ Safety:
 - Always backup your database before running with --delete or --truncate
 - Run with --dry-run first to see what will be affected
 - The script will ask for confirmation before making changes
+- An interrupted run resumes from its checkpoint when re-run
 
 Author: jeetSocial Team
 """
@@ -29,46 +33,22 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
 
 try:
     from app import create_app, db
-    from app.models import Post
+    from app.maintenance import TASKS, run_task
 except ImportError as e:
     print(f"Error importing app modules: {e}")
     print("Make sure you're running this from the project root directory.")
     sys.exit(1)
 
+ACTION_TASKS = {
+    "truncate": "truncate-long-posts",
+    "delete": "delete-long-posts",
+}
 
-def get_long_posts():
-    """Query for posts that exceed 280 characters."""
-    return Post.query.filter(db.func.length(Post.message) > 280).all()
 
-
-def preview_changes(long_posts, action):
-    """Show what changes will be made without executing them."""
-    print(f"\n{'='*60}")
-    print(f"DRY RUN: Preview of {action} action")
-    print(f"{'='*60}")
-
-    if not long_posts:
-        print("✅ No posts found that exceed 280 characters.")
-        return
-
-    print(f"Found {len(long_posts)} posts that exceed 280 characters:")
-    print()
-
-    for i, post in enumerate(long_posts, 1):
-        print(f"{i}. Post ID: {post.id}")
-        print(f"   Username: {post.username}")
-        print(f"   Created: {post.timestamp}")
-        print(f"   Current length: {len(post.message)} characters")
-        preview = f"{post.message[:100]}{'...' if len(post.message) > 100 else ''}"
-        print(f"   Message preview: {preview}")
-
-        if action == "truncate":
-            print(f"   → Will truncate to: {post.message[:280]}")
-        elif action == "delete":
-            print("   → Will be DELETED")
-        print()
-
-    print(f"Total posts to {action}: {len(long_posts)}")
+def count_long_posts(batch_size):
+    """Stream per-range counts of posts over 280 characters; return the total."""
+    task = TASKS["truncate-long-posts"]
+    return run_task(db.engine, task, batch_size=batch_size, dry_run=True)["matched"]
 
 
 def confirm_action(action, count):
@@ -92,56 +72,16 @@ def confirm_action(action, count):
             print("Please type 'yes' to confirm or 'no' to cancel.")
 
 
-def truncate_posts(long_posts):
-    """Truncate posts to 280 characters."""
-    truncated_count = 0
-
-    for post in long_posts:
-        original_length = len(post.message)
-        post.message = post.message[:280]
-        truncated_count += 1
-        print(f"Truncated post {post.id}: {original_length} → 280 characters")
-
-    try:
-        db.session.commit()
-        print(f"\n✅ Successfully truncated {truncated_count} posts.")
-    except Exception as e:
-        db.session.rollback()
-        print(f"\n❌ Error during truncation: {e}")
-        return False
-
-    return True
-
-
-def delete_posts(long_posts):
-    """Delete posts that are too long."""
-    deleted_count = 0
-
-    for post in long_posts:
-        print(f"Deleting post {post.id} ({len(post.message)} characters)")
-        db.session.delete(post)
-        deleted_count += 1
-
-    try:
-        db.session.commit()
-        print(f"\n✅ Successfully deleted {deleted_count} posts.")
-    except Exception as e:
-        db.session.rollback()
-        print(f"\n❌ Error during deletion: {e}")
-        return False
-
-    return True
-
-
 def main():
     parser = argparse.ArgumentParser(
         description="Clean up posts that exceed 280 characters",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  python cleanup_long_posts.py              # Dry run (preview)
+  python cleanup_long_posts.py              # Dry run (count only)
   python cleanup_long_posts.py --delete     # Delete long posts
   python cleanup_long_posts.py --truncate   # Truncate long posts
+  python cleanup_long_posts.py --truncate --batch-size 1000 --sleep 0.5
 
 ⚠️  Always backup your database before using --delete or --truncate!
         """,
@@ -158,13 +98,30 @@ Examples:
         "--dry-run",
         action="store_true",
         default=True,
-        help="Preview changes without making them (default)",
+        help="Count affected posts without making changes (default)",
     )
     parser.add_argument(
         "--force",
         action="store_true",
         help="Skip confirmation prompts (use with caution!)",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5000,
+        help="Post ids per transaction (default: 5000)",
+    )
+    parser.add_argument(
+        "--sleep",
+        type=float,
+        default=0.0,
+        help="Seconds to pause between batches to throttle load",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignore an existing checkpoint and start from the lowest id",
+    )
 
     args = parser.parse_args()
 
@@ -195,45 +152,35 @@ Examples:
 
     with app.app_context():
         try:
-            # Get posts that are too long
-            long_posts = get_long_posts()
+            total = count_long_posts(args.batch_size)
+            print(f"\nFound {total} posts that exceed 280 characters.")
 
             if dry_run:
-                preview_changes(long_posts, action)
                 print("\n💡 To make actual changes, run with --delete or --truncate")
-            else:
-                # Show preview first
-                preview_changes(long_posts, action)
-
-                if not long_posts:
-                    print("\n✅ No posts need cleanup.")
-                    return
-
-                # Confirm action
-                if not args.force and not confirm_action(action, len(long_posts)):
-                    return
-
-                # Execute action
-                print(f"\n🔄 Starting {action} operation...")
-                success = False
-                if action == "truncate":
-                    success = truncate_posts(long_posts)
-                elif action == "delete":
-                    success = delete_posts(long_posts)
-                else:
-                    print(f"❌ Unknown action: {action}")
-                    sys.exit(1)
-
-                if success:
-                    print(
-                        f"\n🎉 {action.capitalize()} operation completed successfully!"
-                    )
-                else:
-                    print(f"\n❌ {action.capitalize()} operation failed!")
-                    sys.exit(1)
+                return
+
+            if not total:
+                print("\n✅ No posts need cleanup.")
+                return
+
+            # Confirm action
+            if not args.force and not confirm_action(action, total):
+                return
+
+            print(f"\n🔄 Starting {action} operation...")
+            stats = run_task(
+                db.engine,
+                TASKS[ACTION_TASKS[action]],
+                batch_size=args.batch_size,
+                resume=not args.no_resume,
+                sleep=args.sleep,
+            )
+            print(f"\n✅ {action.capitalize()}d {stats['affected']} posts.")
+            print(f"\n🎉 {action.capitalize()} operation completed successfully!")
 
         except Exception as e:
             print(f"❌ Unexpected error: {e}")
+            print("Re-run the same command to resume from the last checkpoint.")
             sys.exit(1)
 
 
@@ -0,0 +1,114 @@
+// E2E: keyed, virtualized feed — DOM work and render timings
+// Timings are attached as test annotations ('feed-write ms') so runs before
+// and after a rendering change can be compared from the Playwright report.
+const { test, expect } = require('@playwright/test');
+
+const BASE_URL = 'http://localhost:5000';
+
+function makePosts(fromId, count, points = 0) {
+  const posts = [];
+  for (let id = fromId; id > fromId - count; id--) {
+    posts.push({
+      id,
+      username: `TimingOwl${id % 90 + 10}`,
+      message: `timing post ${id}`,
+      timestamp: new Date(Date.now() - (fromId - id) * 1000).toISOString(),
+      kindness_points: points,
+    });
+  }
+  return posts;
+}
+
+test.describe('Feed reconciliation', () => {
+  test('live updates patch only changed posts', async ({ page }) => {
+    let payload = makePosts(100, 20);
+    await page.route(/\/api\/posts\?/, route => route.fulfill({
+      contentType: 'application/json',
+      body: JSON.stringify({ posts: payload, total_count: 20, page: 1, limit: 20, has_more: false }),
+    }));
+    await page.goto(BASE_URL);
+    await expect(page.locator('#feed .post').first()).toHaveAttribute('data-id', '100');
+
+    // Count DOM mutations caused by each live update
+    await page.evaluate(() => {
+      window.__feedMutations = 0;
+      new MutationObserver(records => { window.__feedMutations += records.length; })
+        .observe(document.getElementById('feed'), { childList: true, subtree: true, characterData: true });
+    });
+
+    // Unchanged payload: nothing to write
+    await page.evaluate(() => butterSmoothLiveUpdate());
+    await page.waitForTimeout(100);
+    expect(await page.evaluate(() => window.__feedMutations)).toBe(0);
+
+    // One new post and one changed badge: one insert, one badge update and at
+    // most one post recycled off the bottom of the rendered window
+    payload = [...makePosts(101, 1), ...makePosts(100, 19)];
+    payload[5].kindness_points = 3;
+    await page.evaluate(() => butterSmoothLiveUpdate());
+    await expect(page.locator('#feed .post').first()).toHaveAttribute('data-id', '101');
+    await expect(page.locator(`[data-kindness-count="${payload[5].id}"]`)).toContainText('3');
+    expect(await page.evaluate(() => window.__feedMutations)).toBeLessThanOrEqual(3);
+
+    const timings = await page.evaluate(() => performance.getEntriesByName('jeet:feed-write').map(e => e.duration));
+    test.info().annotations.push({ type: 'feed-write ms', description: timings.map(t => t.toFixed(2)).join(', ') });
+  });
+
+  test('rendered feed nodes stay bounded during long sessions', async ({ page }) => {
+    let nextId = 1000;
+    await page.route(/\/api\/posts\?/, route => {
+      const posts = makePosts(nextId, 20);
+      nextId += 20;
+      route.fulfill({
+        contentType: 'application/json',
+        body: JSON.stringify({ posts, total_count: 20, page: 1, limit: 20, has_more: false }),
+      });
+    });
+    await page.goto(BASE_URL);
+    await expect(page.locator('#feed .post').first()).toBeVisible();
+    for (let i = 0; i < 15; i++) {
+      await page.evaluate(() => butterSmoothLiveUpdate());
+    }
+    await page.waitForTimeout(100);
+    // 320 posts loaded, but only the viewport plus overscan is rendered
+    const count = await page.locator('#feed .post').count();
+    expect(count).toBeLessThanOrEqual(40);
+
+    const timings = await page.evaluate(() => performance.getEntriesByName('jeet:feed-write').map(e => e.duration));
+    const worst = Math.max(...timings);
+    test.info().annotations.push({ type: 'feed-write ms (max over session)', description: worst.toFixed(2) });
+  });
+
+  test('infinite scroll pages by cursor and keeps the DOM flat', async ({ page }) => {
+    const cursors = [];
+    await page.route(/\/api\/posts\?/, route => {
+      const url = new URL(route.request().url());
+      const cursor = url.searchParams.get('cursor');
+      if (cursor !== null) cursors.push(cursor);
+      const from = cursor ? Number(cursor) : 5000;
+      const posts = makePosts(from, 20);
+      route.fulfill({
+        contentType: 'application/json',
+        body: JSON.stringify({ posts, limit: 20, has_more: from > 20, next_cursor: String(from - 20) }),
+      });
+    });
+    await page.goto(BASE_URL);
+    await expect(page.locator('#feed .post').first()).toHaveAttribute('data-id', '5000');
+
+    const nodeCounts = [];
+    for (let i = 0; i < 30; i++) {
+      await page.mouse.wheel(0, 2000);
+      await page.waitForTimeout(50);
+      nodeCounts.push(await page.locator('#feed .post').count());
+    }
+    // Next pages were fetched by cursor ahead of the scroll position
+    expect(cursors.length).toBeGreaterThan(5);
+    expect(cursors[0]).toBe('');
+    expect(cursors[1]).toBe('4980');
+    // Rendered nodes stay flat however deep the user scrolls
+    expect(Math.max(...nodeCounts)).toBeLessThanOrEqual(40);
+    const firstRendered = Number(await page.locator('#feed .post').first().getAttribute('data-id'));
+    expect(firstRendered).toBeLessThan(4900);
+    test.info().annotations.push({ type: 'rendered nodes per step', description: nodeCounts.join(', ') });
+  });
+});
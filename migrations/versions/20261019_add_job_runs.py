@@ -0,0 +1,35 @@
+"""
+Add job_runs table for background maintenance job history
+
+Revision ID: 20261019_add_job_runs
+Revises: 20251002_rename_posts_to_post
+Create Date: 2026-10-19 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_add_job_runs"
+down_revision = "20251002_rename_posts_to_post"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "job_runs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job", sa.String(64), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("duration_ms", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("status", sa.String(16), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("worker", sa.String(128), nullable=True),
+    )
+    op.create_index("ix_job_runs_job_started_at", "job_runs", ["job", "started_at"])
+
+
+def downgrade():
+    op.drop_index("ix_job_runs_job_started_at", table_name="job_runs")
+    op.drop_table("job_runs")
@@ -4,5 +4,6 @@ import sys
 # Run flask db upgrade
 subprocess.run([sys.executable, "-m", "flask", "db", "upgrade"])
 
-# Run gunicorn
-subprocess.run(["gunicorn", "--bind", "0.0.0.0:5000", "app:create_app()"])
+# Run gunicorn with the production profile (workers, threads, preload);
+# see app/gunicorn_conf.py for the WEB_* environment overrides
+subprocess.run(["gunicorn", "-c", "python:app.gunicorn_conf", "app:create_app()"])
@@ -4,4 +4,14 @@ setup(
     name="jeet",
     version="0.0.0",
     packages=find_packages(exclude=("tests", "e2e", "node_modules")),
+    entry_points={"console_scripts": ["jeet=app.cli:main"]},
+    extras_require={
+        # ASGI serving mode (app/asgi.py): server plus async database drivers
+        "asgi": ["uvicorn>=0.30", "asyncpg>=0.29", "aiosqlite>=0.20"],
+        # Faster JSON encoding for API responses (app/json_provider.py) and
+        # compiled schema codecs (app/schemas.py)
+        "fast": ["orjson>=3.9", "msgspec>=0.18"],
+        # Prometheus metrics and GET /metrics (app/metrics.py)
+        "metrics": ["prometheus_client>=0.17"],
+    },
 )
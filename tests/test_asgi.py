@@ -0,0 +1,249 @@
+"""
+test_asgi.py
+Tests for the ASGI serving mode (app/asgi.py).
+"""
+
+import asyncio
+import gzip
+import json
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.asgi import AsyncJeetApp, async_database_url  # noqa: E402
+from app.models import Post  # noqa: E402
+
+
+@pytest.fixture
+def asgi(tmp_path):
+    url = f"sqlite:///{tmp_path / 'asgi.db'}"
+    flask_app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": url,
+            "ENABLE_RATE_LIMITING": False,
+            "ENABLE_KINDNESS_POINTS": True,
+            "SSE_POLL_INTERVAL": 0.01,
+        }
+    )
+    with flask_app.app_context():
+        db.create_all()
+        for i in range(3):
+            db.session.add(Post(username=f"AsyncFox{i}0", message=f"hello {i}"))
+        db.session.commit()
+    # NullPool: each asyncio.run() below uses a fresh event loop
+    engine = create_async_engine(async_database_url(url), poolclass=NullPool)
+    yield AsyncJeetApp(flask_app, engine)
+    with flask_app.app_context():
+        db.drop_all()
+
+
+def call(app, method, path, body=b"", query=b"", headers=(), disconnect_after=None):
+    """Drive one ASGI request; return (status, headers, body bytes)."""
+
+    async def run():
+        sent = []
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            if disconnect_after is not None:
+                await asyncio.sleep(disconnect_after)
+                return {"type": "http.disconnect"}
+            await asyncio.sleep(3600)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "method": method,
+            "path": path,
+            "query_string": query,
+            "headers": [(k.encode(), v.encode()) for k, v in headers],
+            "server": ("testserver", 80),
+            "client": ("127.0.0.1", 1234),
+        }
+        await app(scope, receive, send)
+        return sent
+
+    sent = asyncio.run(run())
+    start = sent[0]
+    payload = b"".join(m.get("body", b"") for m in sent[1:])
+    return start["status"], dict(start["headers"]), payload
+
+
+def test_feed_matches_flask_view(asgi):
+    flask_body = asgi.flask_app.test_client().get("/api/posts?limit=2").get_json()
+    status, headers, body = call(asgi, "GET", "/api/posts", query=b"limit=2")
+    assert status == 200
+    assert json.loads(body) == flask_body
+    status, _, body = call(asgi, "GET", "/api/posts")
+    assert [p["id"] for p in json.loads(body)] == [3, 2, 1]
+    flask_page = asgi.flask_app.test_client().get("/api/posts?limit=2&cursor=")
+    _, _, body = call(asgi, "GET", "/api/posts", query=b"limit=2&cursor=")
+    assert json.loads(body) == flask_page.get_json()
+    cursor = json.loads(body)["next_cursor"].encode()
+    _, _, body = call(asgi, "GET", "/api/posts", query=b"limit=2&cursor=" + cursor)
+    assert [p["id"] for p in json.loads(body)["posts"]] == [1]
+
+
+@pytest.mark.parametrize("query", [b"cursor=&limit=0", b"cursor=&limit=-1"])
+def test_feed_rejects_limits_below_one(asgi, query):
+    status, _, body = call(asgi, "GET", "/api/posts", query=query)
+    assert status == 400
+    assert json.loads(body) == {"error": "limit must be at least 1"}
+    _, _, body = call(asgi, "GET", "/api/posts", query=b"cursor=&limit=100000")
+    assert json.loads(body)["limit"] == 200
+
+
+def test_top_view_ignores_since_like_flask(asgi):
+    query = "view=top&since=2999-01-01T00:00:00"
+    flask_body = asgi.flask_app.test_client().get(f"/api/posts?{query}").get_json()
+    status, _, body = call(asgi, "GET", "/api/posts", query=query.encode())
+    assert status == 200
+    assert json.loads(body) == flask_body
+    assert len(flask_body["posts"]) == 3
+
+
+def test_feed_is_compressed_like_flask(asgi):
+    with asgi.flask_app.app_context():
+        for i in range(20):
+            db.session.add(Post(username=f"ZipHare{i}", message=f"more {i}"))
+        db.session.commit()
+    flask_body = asgi.flask_app.test_client().get("/api/posts?compact=1").data
+    status, headers, body = call(
+        asgi,
+        "GET",
+        "/api/posts",
+        query=b"compact=1",
+        headers=[("Accept-Encoding", "gzip")],
+    )
+    assert status == 200
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"vary"] == b"Accept-Encoding"
+    assert json.loads(gzip.decompress(body)) == json.loads(flask_body)
+    assert "content" not in json.loads(flask_body)[0]
+    _, headers, body = call(asgi, "GET", "/api/posts")
+    assert b"content-encoding" not in headers and json.loads(body)[0]["content"]
+
+
+def test_fast_paths_record_metrics(asgi):
+    prometheus_client = pytest.importorskip("prometheus_client")
+    # Recording is process-wide once any app enables metrics
+    create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://", "ENABLE_METRICS": True})
+    route = "/api/posts/<int:post_id>/kindness"
+
+    def sample(name, **labels):
+        value = prometheus_client.REGISTRY.get_sample_value(name, labels)
+        return value or 0.0
+
+    requests = sample(
+        "jeet_http_requests_total", method="GET", route=route, status="200"
+    )
+    queries = sample("jeet_db_queries_total", route=route)
+    status, _, _ = call(asgi, "GET", "/api/posts/1/kindness")
+    assert status == 200
+    assert sample(
+        "jeet_http_requests_total", method="GET", route=route, status="200"
+    ) == (requests + 1)
+    # Async engine queries are attributed to the request's route
+    assert sample("jeet_db_queries_total", route=route) == queries + 1
+
+
+def test_token_issue_and_redeem(asgi):
+    status, _, body = call(
+        asgi, "POST", "/api/kindness/tokens", body=b'{"post_ids": [1, 99]}'
+    )
+    assert status == 200
+    data = json.loads(body)
+    assert data["missing"] == [99]
+    token = data["tokens"]["1"]
+    redeem = json.dumps({"post_id": 1, "token": token}).encode()
+    status, _, body = call(asgi, "POST", "/api/kindness/redeem", body=redeem)
+    assert status == 200 and json.loads(body)["new_points"] == 1
+    status, _, _ = call(asgi, "POST", "/api/kindness/redeem", body=redeem)
+    assert status == 409
+    status, _, body = call(asgi, "GET", "/api/posts/1/kindness")
+    assert json.loads(body) == {"kindness_points": 1}
+
+
+def test_stream_sends_posts_after_cursor(asgi):
+    status, headers, body = call(
+        asgi,
+        "GET",
+        "/api/posts/stream",
+        headers=[("Last-Event-ID", "1")],
+        disconnect_after=0.05,
+    )
+    assert status == 200
+    assert headers[b"content-type"] == b"text/event-stream"
+    events = [e for e in body.decode().split("\n\n") if e.startswith("id:")]
+    assert [e.splitlines()[0] for e in events] == ["id: 2", "id: 3"]
+    data = json.loads(events[0].splitlines()[2].split(": ", 1)[1])
+    assert data["message"] == "hello 1"
+
+
+def test_stream_failure_after_start_closes_the_body(asgi, monkeypatch):
+    class BrokenReader:
+        def connect(self):
+            raise RuntimeError("database is gone")
+
+    monkeypatch.setattr(asgi, "_reader", lambda request: BrokenReader())
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        await asyncio.sleep(3600)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/posts/stream",
+        "query_string": b"",
+        "headers": [(b"last-event-id", b"1")],
+    }
+    asyncio.run(asgi(scope, receive, send))
+    starts = [m for m in sent if m["type"] == "http.response.start"]
+    assert [m["status"] for m in starts] == [200]
+    assert sent[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
+
+
+def test_other_routes_fall_back_to_flask(asgi):
+    status, _, body = call(
+        asgi,
+        "POST",
+        "/api/posts",
+        body=b'{"message": "via wsgi"}',
+        headers=[("Content-Type", "application/json")],
+    )
+    assert status == 201
+    assert json.loads(body)["message"] == "via wsgi"
+    status, _, body = call(asgi, "GET", "/api/posts/4")
+    assert status == 200 and json.loads(body)["id"] == 4
+
+
+def test_reads_use_replica_until_client_writes(asgi, tmp_path):
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    replica = create_async_engine(async_database_url(replica_url), poolclass=NullPool)
+    with asgi.flask_app.app_context():
+        db.metadata.create_all(db.create_engine(replica_url))
+    app = AsyncJeetApp(asgi.flask_app, asgi.engine, read_engine=replica)
+    status, _, body = call(app, "GET", "/api/posts")
+    assert status == 200 and json.loads(body) == []
+    _, _, body = call(app, "POST", "/api/kindness/token", body=b'{"post_id": 1}')
+    redeem = json.dumps({"post_id": 1, "token": json.loads(body)["token"]})
+    _, headers, _ = call(app, "POST", "/api/kindness/redeem", body=redeem.encode())
+    cookie = headers[b"set-cookie"].decode().split(";")[0]
+    status, _, body = call(
+        app, "GET", "/api/posts/1/kindness", headers=[("Cookie", cookie)]
+    )
+    assert status == 200 and json.loads(body) == {"kindness_points": 1}
@@ -0,0 +1,164 @@
+"""
+test_assets.py
+Tests for the static asset build and serving (app/assets.py).
+"""
+
+import gzip
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from app import create_app
+from app.assets import IMMUTABLE, build, minify_css, minify_js
+
+MAIN_JS = """\
+import { helper } from './helper.js';
+// leading comment
+const url = "http://example.com/a // not a comment";
+const re = /\\/+$/g; /* block */
+function total(a, b) {
+  console.debug('total', a, (b || 0));
+  return a / 2 + b / 2;
+}
+const tpl = `keep   ${url}   spacing`;
+"""
+
+INDEX_HTML = """\
+<!-- page comment -->
+<html><head><style> body {  color : red ; } </style>
+<link rel="icon" href="/static/icon.svg">
+<script type="module" src="{cdn}/emoji-picker-element@^1/index.js"></script>
+</head><body><emoji-picker class="light"></emoji-picker>
+<script src="/static/main.js"></script></body></html>
+""".replace(
+    "{cdn}", "https://cdn.jsdelivr.net/npm"
+)
+
+
+@pytest.fixture
+def src(tmp_path):
+    src = tmp_path / "static"
+    src.mkdir()
+    (src / "main.js").write_text(MAIN_JS)
+    (src / "helper.js").write_text("export function helper() { return 1; }\n")
+    (src / "styles.css").write_text("a { color: blue; }\n" * 40)
+    (src / "icon.svg").write_text("<svg></svg>")
+    (src / "index.html").write_text(INDEX_HTML)
+    (src / "test_helper.js").write_text("// browser-side test, not shipped\n")
+    return src
+
+
+def test_minify_js_keeps_strings_and_regexes():
+    out = minify_js(MAIN_JS)
+    assert "// leading comment" not in out and "block" not in out
+    assert '"http://example.com/a // not a comment"' in out
+    assert "/\\/+$/g" in out
+    assert "`keep   ${url}   spacing`" in out
+    assert "console.debug" not in out and "void 0;" in out
+    # Operators that could merge into comments or ++/-- keep their spaces
+    assert "function total(a,b){\nvoid 0;\nreturn a / 2 + b / 2;\n}" in out
+    assert "console.debug" in minify_js(MAIN_JS, strip_debug=False)
+
+
+@pytest.mark.parametrize(
+    "src, expected",
+    [
+        ("console.debug(err);\nfoo();\n", "void 0;\nfoo();\n"),
+        ("if (a) console.debug(x)\nbar()\n", "if(a)void 0\nbar()\n"),
+        ("console.debug(f(x), ')'); console.debug(y);\n", "void 0;void 0;\n"),
+        ("log.console.debug(x);\n", "log.console.debug(x);\n"),
+    ],
+)
+def test_minify_js_strips_debug_calls_with_any_arguments(src, expected):
+    assert minify_js(src) == expected
+
+
+def test_minify_css():
+    assert minify_css("a , b {  color : red ; }/* x */") == "a,b{color : red}"
+
+
+def test_build_hashes_rewrites_and_precompresses(src, tmp_path):
+    out = tmp_path / "dist"
+    manifest = build(str(src), str(out))
+    assert "test_helper.js" not in manifest
+    assert manifest["index.html"] == "index.html"
+    main, helper = manifest["main.js"], manifest["helper.js"]
+    assert main.startswith("main.") and main.endswith(".js") and main != "main.js"
+
+    html = (out / "index.html").read_text()
+    assert f'src="/static/{main}"' in html and "/static/icon." in html
+    assert "page comment" not in html and "body{color : red}" in html
+    # Not vendored here: the CDN reference stays
+    assert "cdn.jsdelivr.net" in html
+    js = (out / main).read_text()
+    assert f"'./{helper}'" in js
+
+    data = json.loads((out / "manifest.json").read_text())
+    assert data["assets"] == manifest
+    css = manifest["styles.css"]
+    assert "gzip" in data["encodings"][css]
+    assert (
+        gzip.decompress((out / (css + ".gz")).read_bytes()) == (out / css).read_bytes()
+    )
+    # Same input, same names
+    assert build(str(src), str(tmp_path / "again")) == manifest
+
+    if shutil.which("node"):
+        subprocess.run(["node", "--check", str(out / helper)], check=True)
+
+
+def test_build_uses_vendored_emoji_picker(src, tmp_path):
+    picker = src / "vendor" / "emoji-picker-element"
+    picker.mkdir(parents=True)
+    (picker / "index.js").write_text("export default 1;\n")
+    data = src / "vendor" / "emoji-picker-element-data" / "en" / "emojibase"
+    data.mkdir(parents=True)
+    (data / "data.json").write_text("[]")
+    manifest = build(str(src), str(tmp_path / "dist"))
+    html = (tmp_path / "dist" / "index.html").read_text()
+    assert "cdn.jsdelivr.net" not in html
+    assert f"/static/{manifest['vendor/emoji-picker-element/index.js']}" in html
+    assert 'data-source="/static/vendor/emoji-picker-element-data/' in html
+
+
+def test_serves_hashed_build(src, tmp_path):
+    out = tmp_path / "dist"
+    manifest = build(str(src), str(out))
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "STATIC_DIST": True,
+            "STATIC_DIST_DIR": str(out),
+        }
+    )
+    client = app.test_client()
+    css = manifest["styles.css"]
+
+    resp = client.get(f"/static/{css}", headers={"Accept-Encoding": "gzip, br;q=0"})
+    assert resp.status_code == 200
+    assert resp.headers["Cache-Control"] == IMMUTABLE
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.mimetype == "text/css"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert gzip.decompress(resp.data) == (out / css).read_bytes()
+
+    resp = client.get(f"/static/{css}", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in resp.headers
+    assert resp.data == (out / css).read_bytes()
+
+    resp = client.get("/")
+    assert resp.headers["Cache-Control"] == "no-cache"
+    assert f"/static/{manifest['main.js']}".encode() in resp.data
+    resp.close()
+
+
+def test_without_build_serves_source_files():
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"})
+    client = app.test_client()
+    resp = client.get("/static/main.js")
+    assert resp.status_code == 200
+    assert "immutable" not in resp.headers.get("Cache-Control", "")
+    resp.close()
@@ -0,0 +1,103 @@
+"""
+test_compression.py
+Tests for API response compression (app/compression.py) and compact feed items.
+"""
+
+import gzip
+import json
+
+import pytest
+
+from app import create_app, db
+from app.compression import get_compressor, negotiate
+from app.models import Post
+
+
+@pytest.fixture
+def app():
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "ENABLE_RATE_LIMITING": False,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+        for i in range(30):
+            db.session.add(Post(username=f"SquishyOtter{i}", message=f"hello {i}"))
+        db.session.commit()
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+
+def test_large_feed_is_gzipped_and_cached(app):
+    client = app.test_client()
+    plain = client.get("/api/posts")
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    resp = client.get("/api/posts", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(resp.data) == plain.data
+    assert len(resp.data) < len(plain.data) / 3
+
+    # An unchanged feed is compressed once and served from the cache after that
+    again = client.get("/api/posts", headers={"Accept-Encoding": "gzip"})
+    assert again.data == resp.data
+    assert get_compressor(app).stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def test_small_and_error_responses_are_not_compressed(app):
+    client = app.test_client()
+    resp = client.get("/api/posts/1", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert "Content-Encoding" not in resp.headers
+    resp = client.get("/api/posts?cursor=bogus", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 400
+    assert "Content-Encoding" not in resp.headers
+
+
+def test_compression_settings(app):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "COMPRESS_RESPONSES": False,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+        db.session.add(Post(username="QuietMoth10", message="x" * 2000))
+        db.session.commit()
+    resp = app.test_client().get("/api/posts", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in resp.headers
+
+
+def test_negotiate():
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0") is None
+    assert negotiate("identity") is None and negotiate(None) is None
+
+
+def test_compact_feed_items(app):
+    client = app.test_client()
+    full = client.get("/api/posts?limit=5").get_json()["posts"][0]
+    assert {"content", "creation_timestamp", "meta"} <= set(full)
+    compact = client.get("/api/posts?limit=5&compact=1").get_json()["posts"][0]
+    assert set(compact) == {"id", "username", "message", "timestamp", "kindness_points"}
+    assert all(compact[k] == full[k] for k in compact)
+
+    # A server-computed display object is not a duplicate; it stays
+    item = client.get("/api/posts?limit=5&compact=1&tz=UTC").get_json()["posts"][0]
+    assert isinstance(item["meta"]["display"], dict)
+    assert "content" not in item
+
+
+def test_compact_reduces_feed_bytes(app):
+    client = app.test_client()
+    full = client.get("/api/posts?limit=30").data
+    compact = client.get("/api/posts?limit=30&compact=1").data
+    assert len(compact) < len(full) * 0.6
+    assert len(json.loads(compact)["posts"]) == 30
@@ -0,0 +1,74 @@
+"""
+test_db_pool.py
+Tests for pool configuration and checkout metrics (app/db_pool.py).
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool
+
+from app import create_app, db
+from app.db_pool import InstrumentedQueuePool, engine_options, pool_stats
+from app.settings import load_settings
+
+
+def test_engine_options_for_postgres():
+    settings = load_settings({"DB_POOL_SIZE": "7", "DB_POOL_TIMEOUT": "2.5"})
+    options = engine_options(settings, "postgresql://u:p@db/jeet")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 7 and options["max_overflow"] == 20
+    assert options["pool_timeout"] == 2.5 and options["pool_pre_ping"] is True
+
+
+def test_engine_options_memory_sqlite_and_pgbouncer():
+    settings = load_settings({})
+    assert engine_options(settings, "sqlite:///:memory:") == {"pool_pre_ping": True}
+    bouncer = load_settings({"DB_PGBOUNCER": "1"})
+    options = engine_options(bouncer, "postgresql+asyncpg://u@localhost/j", True)
+    assert options["poolclass"] is NullPool
+    assert options["connect_args"]["statement_cache_size"] == 0
+
+
+def test_checkout_wait_and_timeouts_are_counted(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert pool_stats(engine)["checked_out"] == 1
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+    engine.dispose()
+    with engine.connect():
+        pass
+    stats = pool_stats(engine)
+    assert stats["checkouts"] == 2 and stats["timeouts"] == 1
+    assert stats["wait_seconds_max"] >= 0.05
+    assert stats["checked_out"] == 0
+
+
+def test_admin_pool_endpoint(tmp_path):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'app.db'}",
+            "ENABLE_RATE_LIMITING": False,
+            "ADMIN_TOKEN": "s3cret",
+            "DB_POOL_SIZE": 3,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    client.get("/api/posts")
+    assert client.get("/_admin/pool").status_code == 403
+    resp = client.get("/_admin/pool", headers={"X-Admin-Token": "s3cret"})
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["pool"] == "InstrumentedQueuePool" and data["size"] == 3
+    assert data["checkouts"] >= 1
@@ -0,0 +1,125 @@
+"""
+test_export.py
+Tests for the streaming NDJSON export endpoint and `jeet export`.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.cli import main as cli_main
+from app.models import Post
+from app.settings import reload_settings
+
+
+@pytest.fixture
+def client(client):
+    """The shared client, with `ADMIN_TOKEN` configured and sent by default."""
+    reload_settings(client.application, ADMIN_TOKEN="s3cret")
+    client.environ_base["HTTP_X_ADMIN_TOKEN"] = "s3cret"
+    return client
+
+
+def _seed(client, count):
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    with client.application.app_context():
+        db.session.add_all(
+            Post(
+                username=f"KindFox{i:02d}",
+                message=f"Post {i}",
+                timestamp=base + timedelta(hours=i),
+                kindness_points=i,
+            )
+            for i in range(count)
+        )
+        db.session.commit()
+
+
+def _lines(resp):
+    return [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+
+
+def test_export_streams_all_posts_in_id_order(client, monkeypatch):
+    monkeypatch.setattr("app.exporter.EXPORT_CHUNK_SIZE", 3)
+    _seed(client, 10)
+    resp = client.get("/api/posts/export")
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    rows = _lines(resp)
+    assert [r["id"] for r in rows] == list(range(1, 11))
+    assert rows[0] == {
+        "id": 1,
+        "username": "KindFox00",
+        "message": "Post 0",
+        "timestamp": "2025-01-01T12:00:00Z",
+        "kindness_points": 0,
+    }
+
+
+def test_export_since_until_and_after_id(client):
+    _seed(client, 10)
+    resp = client.get(
+        "/api/posts/export?since=2025-01-01T14:00:00Z&until=2025-01-01T18:00:00Z"
+    )
+    assert [r["message"] for r in _lines(resp)] == [f"Post {i}" for i in range(2, 6)]
+
+    resp = client.get("/api/posts/export?after_id=8")
+    assert [r["id"] for r in _lines(resp)] == [9, 10]
+
+
+def test_export_rejects_bad_bounds(client):
+    assert client.get("/api/posts/export?since=yesterday").status_code == 400
+    assert client.get("/api/posts/export?after_id=x").status_code == 400
+
+
+def test_export_requires_admin_token(client):
+    _seed(client, 2)
+    assert (
+        client.get("/api/posts/export", headers={"X-Admin-Token": ""}).status_code
+        == 403
+    )
+    resp = client.get("/api/posts/export", headers={"X-Admin-Token": "nope"})
+    assert resp.status_code == 403
+    reload_settings(client.application, ADMIN_TOKEN=None)
+    assert client.get("/api/posts/export").status_code == 404
+
+
+def test_export_empty_table(client):
+    resp = client.get("/api/posts/export")
+    assert resp.status_code == 200
+    assert resp.get_data() == b""
+
+
+def test_cli_export(client, monkeypatch, tmp_path):
+    _seed(client, 4)
+    monkeypatch.setattr("app.cli._app", lambda: client.application)
+    out = tmp_path / "posts.ndjson"
+    assert cli_main(["export", "--since", "2025-01-01T13:00:00", "-o", str(out)]) == 0
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["id"] for r in rows] == [2, 3, 4]
+
+
+def test_export_returns_connection_before_yielding(client):
+    from sqlalchemy import event
+
+    from app.exporter import iter_post_rows
+
+    _seed(client, 5)
+    with client.application.app_context():
+        engine = db.engine
+    held = []
+    event.listen(engine, "checkout", lambda *args: held.append(1))
+    event.listen(engine, "checkin", lambda *args: held.pop())
+    rows = iter_post_rows(engine, chunk_size=2)
+    assert next(rows)[0] == 1 and held == []
+    assert [row[0] for row in rows] == [2, 3, 4, 5] and held == []
+
+
+def test_cli_export_rejects_bad_bounds(client, monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr("app.cli._app", lambda: client.application)
+    out = tmp_path / "posts.ndjson"
+    assert cli_main(["export", "--since", "yesterday", "-o", str(out)]) == 2
+    assert "Invalid --since or --until" in capsys.readouterr().err
+    assert not out.exists()
@@ -0,0 +1,130 @@
+"""
+test_importer.py
+Tests for the bulk post importer (`jeet import`).
+"""
+
+import io
+import json
+
+import pytest
+
+from app import create_app, db
+from app.cli import main as cli_main
+from app.importer import import_posts, read_checkpoint
+from app.models import Post
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path}/import.db",
+            "ENABLE_RATE_LIMITING": False,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+
+def _write_ndjson(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write((record if isinstance(record, str) else json.dumps(record)) + "\n")
+    return str(path)
+
+
+def test_import_ndjson_validates_and_loads(app, tmp_path):
+    source = _write_ndjson(
+        tmp_path / "posts.ndjson",
+        [
+            {"message": "Be kind", "username": "KindOtter42"},
+            {"content": "You are wonderful", "timestamp": "2025-01-01T12:00:00Z"},
+            {"message": "you are stupid"},
+            {"message": "a" * 281},
+            "{not json",
+            {"message": "Keep going", "kindness_points": 3},
+        ],
+    )
+    rejects = io.StringIO()
+    with app.app_context():
+        stats = import_posts(db.engine, source, batch_size=2, rejects=rejects, out=None)
+        posts = Post.query.order_by(Post.id).all()
+
+    assert stats["inserted"] == 3
+    assert stats["rejected"] == 3
+    assert stats["offset"] == 6
+    assert [p.message for p in posts] == ["Be kind", "You are wonderful", "Keep going"]
+    assert posts[0].username == "KindOtter42"
+    assert posts[1].username  # generated
+    assert posts[1].timestamp.isoformat() == "2025-01-01T12:00:00"
+    assert posts[2].kindness_points == 3
+    reasons = [json.loads(line)["error"] for line in rejects.getvalue().splitlines()]
+    assert len(reasons) == 3
+    assert any(r.startswith("Hateful content") for r in reasons)
+
+
+def test_non_string_usernames_are_rejected_not_fatal(app, tmp_path):
+    source = _write_ndjson(
+        tmp_path / "posts.ndjson",
+        [
+            {"message": "Numeric name", "username": 42},
+            {"message": "List name", "username": ["KindOtter42"]},
+            {"message": "Still imported", "username": "KindOtter42"},
+        ],
+    )
+    rejects = io.StringIO()
+    with app.app_context():
+        stats = import_posts(db.engine, source, rejects=rejects, out=None)
+        messages = [p.message for p in Post.query.all()]
+
+    assert stats["inserted"] == 1 and stats["rejected"] == 2
+    assert messages == ["Still imported"]
+    reasons = [json.loads(line)["error"] for line in rejects.getvalue().splitlines()]
+    assert reasons == ["Username must be a string"] * 2
+
+
+def test_import_csv(app, tmp_path):
+    source = tmp_path / "posts.csv"
+    source.write_text('username,message\nSunnyFox10,"Hello, friend"\n,Smile\n')
+    with app.app_context():
+        stats = import_posts(db.engine, str(source), out=None)
+        assert Post.query.count() == 2
+    assert stats["inserted"] == 2
+
+
+def test_import_resumes_from_checkpoint(app, tmp_path):
+    source = _write_ndjson(
+        tmp_path / "posts.ndjson", [{"message": f"Post {i}"} for i in range(5)]
+    )
+    checkpoint = f"{source}.checkpoint"
+    with app.app_context():
+        import_posts(db.engine, source, batch_size=2, out=None)
+        assert read_checkpoint(checkpoint)["offset"] == 5
+        # Append more records and re-run: only the new ones are loaded
+        with open(source, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"message": "Post 5"}) + "\n")
+        stats = import_posts(db.engine, source, out=None)
+        assert Post.query.count() == 6
+    assert stats["inserted"] == 6
+    assert stats["offset"] == 6
+
+
+def test_dry_run_writes_nothing(app, tmp_path):
+    source = _write_ndjson(tmp_path / "posts.ndjson", [{"message": "Hi"}])
+    with app.app_context():
+        stats = import_posts(db.engine, source, dry_run=True, out=None)
+        assert Post.query.count() == 0
+    assert stats["inserted"] == 1
+    assert read_checkpoint(f"{source}.checkpoint") is None
+
+
+def test_cli_import(app, tmp_path, monkeypatch, capsys):
+    source = _write_ndjson(tmp_path / "posts.ndjson", [{"message": "From the CLI"}])
+    monkeypatch.setattr("app.cli._app", lambda: app)
+    assert cli_main(["import", source, "--quiet"]) == 0
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["inserted"] == 1
@@ -0,0 +1,139 @@
+"""
+test_jobs.py
+Tests for the background job runner (app/jobs.py).
+"""
+
+from datetime import datetime, timedelta
+
+import time
+
+import pytest
+
+from app import db
+from app.jobs import Job, JobRunner, default_jobs, leader_lock, prune_kindness_votes
+from app.models import JobRun, KindnessVote, Post
+
+
+@pytest.fixture
+def runner(client, tmp_path):
+    calls = []
+
+    def work(app):
+        calls.append(app)
+
+    def boom(app):
+        raise RuntimeError("kaput")
+
+    jobs = [
+        Job("work", work, interval=3600),
+        Job("boom", boom),
+    ]
+    runner = JobRunner(client.application, jobs, lock_dir=str(tmp_path))
+    runner.calls = calls
+    return runner
+
+
+def _runs(app, name):
+    with app.app_context():
+        return JobRun.query.filter_by(job=name).all()
+
+
+def test_run_records_history_and_metrics(runner):
+    assert runner.run("work") == "ok"
+    assert len(runner.calls) == 1
+    rows = _runs(runner.app, "work")
+    assert len(rows) == 1
+    assert rows[0].status == "ok" and rows[0].duration_ms >= 0
+    metrics = runner.metrics()["work"]
+    assert metrics["runs"] == 1 and metrics["failures"] == 0
+
+
+def test_recent_run_is_skipped_unless_forced(runner):
+    runner.run("work")
+    assert runner.run("work") == "skipped"
+    assert runner.run("work", force=True) == "ok"
+    assert len(runner.calls) == 2
+    assert runner.metrics()["work"]["skipped"] == 1
+
+
+def test_failure_is_recorded(runner):
+    assert runner.run("boom") == "error"
+    (row,) = _runs(runner.app, "boom")
+    assert row.status == "error" and row.error == "kaput"
+    assert runner.metrics()["boom"]["failures"] == 1
+
+
+def test_held_lock_skips_run(runner, tmp_path):
+    with runner.app.app_context():
+        with leader_lock(db.engine, "work", str(tmp_path)) as leader:
+            assert leader
+            # flock locks are per open file description, so a second
+            # acquisition in the same process still contends
+            assert runner.run("work") == "skipped"
+    assert runner.calls == []
+
+
+def test_loop_survives_a_failing_run_and_dead_thread_restarts(runner, monkeypatch):
+    attempts = []
+
+    def broken_run(name, force=False):
+        attempts.append(name)
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(runner, "run", broken_run)
+    runner.tick = 0.01
+    runner.ensure_started()
+    try:
+        deadline = time.monotonic() + 5
+        while len(attempts) < 2 and time.monotonic() < deadline:
+            runner._next["boom"] = 0
+            time.sleep(0.01)
+        assert len(attempts) >= 2 and runner._thread.is_alive()
+
+        # A thread that exited without `stop()` is replaced on the next request
+        dead = runner._thread
+        runner._stop.set()
+        dead.join(5)
+        runner.ensure_started()
+        assert runner._thread is not dead and runner._thread.is_alive()
+    finally:
+        runner.stop()
+
+
+def test_truncate_long_posts_is_opt_in(client):
+    from app.settings import get_settings, reload_settings
+
+    def jobs():
+        with client.application.app_context():
+            return {job.name: job for job in default_jobs(get_settings())}
+
+    assert jobs()["truncate-long-posts"].interval is None
+    assert jobs()["prune-kindness-votes"].interval
+    reload_settings(client.application, JOB_TRUNCATE_LONG_POSTS=True)
+    assert jobs()["truncate-long-posts"].interval == 24 * 3600
+
+
+def test_prune_kindness_votes(client):
+    app = client.application
+    with app.app_context():
+        db.session.add(Post(username="PruneFox01", message="hi"))
+        db.session.commit()
+        old = datetime.utcnow() - timedelta(days=30)
+        db.session.add(KindnessVote(post_id=1, token_hash="a" * 64, created_at=old))
+        db.session.add(KindnessVote(post_id=1, token_hash="b" * 64))
+        db.session.commit()
+        assert prune_kindness_votes(app) == 1
+        assert [v.token_hash[0] for v in KindnessVote.query.all()] == ["b"]
+
+
+def test_cli_jobs_run_and_history(client, monkeypatch, capsys):
+    from app.cli import main as cli_main
+
+    monkeypatch.setattr("app.cli._app", lambda: client.application)
+    assert cli_main(["jobs", "list"]) == 0
+    assert "prune-kindness-votes" in capsys.readouterr().out
+    assert cli_main(["jobs", "run", "prune-job-runs"]) == 0
+    assert '"status": "ok"' in capsys.readouterr().out
+    assert cli_main(["jobs", "history"]) == 0
+    assert "prune-job-runs" in capsys.readouterr().out
+    assert cli_main(["jobs", "run", "nope"]) == 2
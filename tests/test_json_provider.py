@@ -0,0 +1,72 @@
+"""
+test_json_provider.py
+Tests for the JSON provider (app/json_provider.py).
+"""
+
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app import create_app, db
+from app.json_provider import FastJSONProvider, backend_name, dumps, orjson
+from app.models import Post
+from app.post_service import iso_z
+
+BACKENDS = ["stdlib"] + (["orjson"] if orjson is not None else [])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_datetimes_are_iso_z(backend):
+    naive = datetime(2025, 8, 20, 12, 34, 56, 789000)
+    aware = datetime(2025, 8, 20, 12, 34, 56, tzinfo=timezone.utc)
+    out = json.loads(dumps({"a": naive, "b": aware, "d": date(2025, 8, 20)}, backend))
+    assert out == {
+        "a": "2025-08-20T12:34:56.789000Z",
+        "b": "2025-08-20T12:34:56Z",
+        "d": "2025-08-20",
+    }
+    assert out["a"] == iso_z(naive) and out["b"] == iso_z(aware)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_dumps_is_compact_and_sorts_on_request(backend):
+    assert dumps({"b": 1, "a": [1, 2]}, backend) == b'{"b":1,"a":[1,2]}'
+    assert dumps({"b": 1, "a": 2}, backend, sort_keys=True) == b'{"a":2,"b":1}'
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_post_endpoints_write_timestamps_with_z(backend):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "ENABLE_RATE_LIMITING": False,
+            "JSON_BACKEND": backend,
+        }
+    )
+    assert isinstance(app.json, FastJSONProvider) and app.json.backend == backend
+    with app.app_context():
+        db.create_all()
+        post = Post(username="TidyWren10", message="hi")
+        post.timestamp = datetime(2025, 1, 2, 3, 4, 5)
+        db.session.add(post)
+        db.session.commit()
+    client = app.test_client()
+    body = client.get("/api/posts/1").get_json()
+    assert body["creation_timestamp"] == "2025-01-02T03:04:05Z"
+    assert body["meta"] == {"display": "2025-01-02T03:04:05Z", "future": False}
+
+    created = client.post("/api/posts", json={"message": "hello"}).get_json()
+    assert created["creation_timestamp"].endswith("Z")
+    assert created["meta"]["display"] == created["creation_timestamp"]
+
+
+def test_backend_selection():
+    assert backend_name("stdlib") == "stdlib"
+    assert backend_name() == ("orjson" if orjson is not None else "stdlib")
+    with pytest.raises(ValueError, match="JSON_BACKEND"):
+        backend_name("ujson")
+    if orjson is None:
+        with pytest.raises(ValueError, match="not installed"):
+            backend_name("orjson")
@@ -0,0 +1,146 @@
+"""
+test_kindness.py
+Tests for the kindness token issuance and redemption endpoints.
+"""
+
+from urllib.parse import urlencode
+
+import pytest
+
+from app.settings import reload_settings
+
+
+@pytest.fixture(autouse=True)
+def enable_kindness(monkeypatch):
+    monkeypatch.setenv("ENABLE_KINDNESS_POINTS", "1")
+
+
+def _create_posts(client, count):
+    ids = []
+    for i in range(count):
+        resp = client.post("/api/posts", json={"message": f"Kind post {i}"})
+        assert resp.status_code == 201
+        ids.append(resp.get_json()["id"])
+    return ids
+
+
+def test_issue_and_redeem_single_token(client):
+    (post_id,) = _create_posts(client, 1)
+    resp = client.post(f"/api/kindness/token?post_id={post_id}")
+    assert resp.status_code == 200
+    token = resp.get_json()["token"]
+
+    resp = client.post(
+        "/api/kindness/redeem", json={"post_id": post_id, "token": token}
+    )
+    assert resp.status_code == 200
+    assert resp.get_json()["new_points"] == 1
+
+    resp = client.post(
+        "/api/kindness/redeem", json={"post_id": post_id, "token": token}
+    )
+    assert resp.status_code == 409
+
+
+def test_mutated_token_cannot_be_redeemed_again(client):
+    (post_id,) = _create_posts(client, 1)
+    token = client.post(f"/api/kindness/token?post_id={post_id}").get_json()["token"]
+    resp = client.post(
+        "/api/kindness/redeem", json={"post_id": post_id, "token": token}
+    )
+    assert resp.get_json()["new_points"] == 1
+    # Non-alphabet characters and padding used to decode to the same token
+    for suffix in ("!", "$", "="):
+        resp = client.post(
+            "/api/kindness/redeem", json={"post_id": post_id, "token": token + suffix}
+        )
+        assert resp.status_code in (400, 403), suffix
+    assert client.get(f"/api/posts/{post_id}/kindness").get_json() == {
+        "kindness_points": 1
+    }
+
+
+@pytest.mark.parametrize("encoding", ["json", "form", "raw_qs", "query"])
+def test_redeem_accepts_all_encodings(client, encoding):
+    (post_id,) = _create_posts(client, 1)
+    token = client.post("/api/kindness/token", json={"post_id": post_id}).get_json()[
+        "token"
+    ]
+    fields = {"post_id": str(post_id), "token": token}
+    url = "/api/kindness/redeem"
+    if encoding == "json":
+        resp = client.post(url, json=fields)
+    elif encoding == "form":
+        resp = client.post(url, data=fields)
+    elif encoding == "raw_qs":
+        resp = client.post(
+            url, data=urlencode(fields), content_type="text/plain; charset=utf-8"
+        )
+    else:
+        resp = client.post(f"{url}?{urlencode(fields)}")
+    assert resp.status_code == 200
+    assert resp.get_json()["new_points"] == 1
+
+
+def test_redeem_missing_fields(client):
+    (post_id,) = _create_posts(client, 1)
+    resp = client.post("/api/kindness/redeem", json={"post_id": post_id})
+    assert resp.status_code == 400
+    resp = client.post("/api/kindness/token", data="not json")
+    assert resp.status_code == 400
+
+
+def test_batch_tokens_issued_for_existing_posts(client):
+    ids = _create_posts(client, 3)
+    resp = client.post("/api/kindness/tokens", json={"post_ids": ids + [9999]})
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert sorted(data["tokens"]) == sorted(str(i) for i in ids)
+    assert data["missing"] == [9999]
+    assert data["expires_in"] == 300
+
+    # Every batch-issued token is redeemable for its own post
+    for pid in ids:
+        token = data["tokens"][str(pid)]
+        resp = client.post(
+            "/api/kindness/redeem", json={"post_id": pid, "token": token}
+        )
+        assert resp.status_code == 200
+
+
+def test_batch_tokens_accepts_query_string(client):
+    ids = _create_posts(client, 2)
+    resp = client.post(f"/api/kindness/tokens?post_ids={ids[0]},{ids[1]}")
+    assert resp.status_code == 200
+    assert len(resp.get_json()["tokens"]) == 2
+
+
+@pytest.mark.parametrize(
+    "body",
+    [{}, {"post_ids": []}, {"post_ids": "1"}, {"post_ids": ["abc"]}],
+)
+def test_batch_tokens_rejects_bad_input(client, body):
+    resp = client.post("/api/kindness/tokens", json=body)
+    assert resp.status_code == 400
+
+
+@pytest.mark.parametrize("post_ids", [[1.9], [True], [1, False], [1.5, 2]])
+def test_batch_tokens_rejects_non_integer_ids(client, post_ids):
+    _create_posts(client, 2)
+    resp = client.post("/api/kindness/tokens", json={"post_ids": post_ids})
+    assert resp.status_code == 400
+    assert resp.get_json() == {"error": "post_ids must be integers"}
+
+
+def test_batch_tokens_enforces_limit(client):
+    from app.routes import KINDNESS_TOKEN_BATCH_LIMIT
+
+    body = {"post_ids": list(range(1, KINDNESS_TOKEN_BATCH_LIMIT + 2))}
+    resp = client.post("/api/kindness/tokens", json=body)
+    assert resp.status_code == 400
+
+
+def test_batch_tokens_feature_disabled(client):
+    reload_settings(client.application, ENABLE_KINDNESS_POINTS=False)
+    resp = client.post("/api/kindness/tokens", json={"post_ids": [1]})
+    assert resp.status_code == 404
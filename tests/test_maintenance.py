@@ -0,0 +1,103 @@
+"""
+test_maintenance.py
+Tests for the chunked maintenance engine (app/maintenance.py).
+"""
+
+import io
+
+import pytest
+
+from app import db
+from app.checkpoints import read_checkpoint, write_checkpoint
+from app.maintenance import TASKS, run_task
+from app.models import KindnessVote, Post
+
+
+@pytest.fixture
+def seeded(client):
+    app = client.application
+    with app.app_context():
+        for i in range(20):
+            length = 300 if i % 4 == 0 else 20
+            db.session.add(Post(username=f"LongFox{i:02d}", message="x" * length))
+        db.session.commit()
+        db.session.add(KindnessVote(post_id=1, token_hash="a" * 64))
+        db.session.commit()
+    return app
+
+
+def _lengths(app):
+    with app.app_context():
+        return {p.id: len(p.message) for p in Post.query.all()}
+
+
+def test_dry_run_counts_without_changes(seeded, tmp_path):
+    out = io.StringIO()
+    with seeded.app_context():
+        stats = run_task(
+            db.engine,
+            TASKS["truncate-long-posts"],
+            batch_size=6,
+            dry_run=True,
+            checkpoint=str(tmp_path / "cp"),
+            out=out,
+        )
+    assert stats["matched"] == 5
+    assert len(out.getvalue().splitlines()) == 4  # ranges of 6 ids over 20 posts
+    assert max(_lengths(seeded).values()) == 300
+    assert read_checkpoint(str(tmp_path / "cp")) is None
+
+
+def test_truncate_in_batches(seeded, tmp_path):
+    with seeded.app_context():
+        stats = run_task(
+            db.engine,
+            TASKS["truncate-long-posts"],
+            batch_size=6,
+            checkpoint=str(tmp_path / "cp"),
+            out=None,
+        )
+    assert stats["affected"] == 5
+    lengths = _lengths(seeded)
+    assert len(lengths) == 20
+    assert max(lengths.values()) == 280
+    # Completed runs remove their checkpoint
+    assert read_checkpoint(str(tmp_path / "cp")) is None
+
+
+def test_delete_removes_posts_and_their_votes(seeded, tmp_path):
+    with seeded.app_context():
+        stats = run_task(
+            db.engine,
+            TASKS["delete-long-posts"],
+            batch_size=7,
+            checkpoint=str(tmp_path / "cp"),
+            out=None,
+        )
+        assert KindnessVote.query.count() == 0
+    assert stats["affected"] == 5
+    assert len(_lengths(seeded)) == 15
+
+
+def test_resume_from_checkpoint(seeded, tmp_path):
+    cp = str(tmp_path / "cp")
+    write_checkpoint(cp, {"task": "truncate-long-posts", "next_id": 10, "affected": 3})
+    with seeded.app_context():
+        stats = run_task(
+            db.engine, TASKS["truncate-long-posts"], checkpoint=cp, out=None
+        )
+    assert stats["affected"] == 3 + 2  # ids 13 and 17 remain after id 10
+    lengths = _lengths(seeded)
+    assert lengths[1] == 300 and lengths[5] == 300 and lengths[9] == 300
+    assert lengths[13] == 280 and lengths[17] == 280
+
+
+def test_empty_table(client, tmp_path):
+    with client.application.app_context():
+        stats = run_task(
+            db.engine,
+            TASKS["truncate-long-posts"],
+            checkpoint=str(tmp_path / "cp"),
+            out=None,
+        )
+    assert stats["affected"] == 0
@@ -0,0 +1,185 @@
+"""
+test_metrics.py
+Tests for the Prometheus metrics (app/metrics.py).
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+prometheus_client = pytest.importorskip("prometheus_client")
+
+from prometheus_client.parser import text_string_to_metric_families  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.models import Post  # noqa: E402
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def make_app(**config):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "ENABLE_RATE_LIMITING": False,
+            "ENABLE_METRICS": True,
+            **config,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+        for i in range(40):
+            db.session.add(Post(username=f"CalmHeron{i}", message=f"hello {i}"))
+        db.session.commit()
+    return app
+
+
+def sample(name, **labels):
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def scrape(client):
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/plain"
+    return {
+        (s.name, tuple(sorted(s.labels.items()))): s.value
+        for family in text_string_to_metric_families(resp.get_data(as_text=True))
+        for s in family.samples
+    }
+
+
+def test_metrics_endpoint_is_off_by_default():
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"})
+    assert app.test_client().get("/metrics").status_code == 404
+
+
+def test_requests_queries_and_stages_are_recorded():
+    client = make_app().test_client()
+    feed = {"method": "GET", "route": "/api/posts"}
+    before = {
+        "requests": sample("jeet_http_requests_total", status="200", **feed),
+        "latency": sample("jeet_http_request_duration_seconds_count", **feed),
+        "queries": sample("jeet_db_queries_total", route="/api/posts"),
+        "per_request": sample("jeet_db_queries_per_request_sum", route="/api/posts"),
+        "missing": sample(
+            "jeet_http_requests_total",
+            method="GET",
+            route="/api/posts/<int:post_id>",
+            status="404",
+        ),
+        "moderation": sample("jeet_moderation_duration_seconds_count"),
+        "serialization": sample(
+            "jeet_serialization_duration_seconds_count", schema="PostPage"
+        ),
+    }
+
+    client.get("/api/posts?page=1")
+    client.get("/api/posts?page=2")
+    client.get("/api/posts/999")
+
+    assert sample("jeet_http_requests_total", status="200", **feed) == (
+        before["requests"] + 2
+    )
+    assert sample("jeet_http_request_duration_seconds_count", **feed) == (
+        before["latency"] + 2
+    )
+    # A count and a page query per offset-paged request
+    assert sample("jeet_db_queries_total", route="/api/posts") == before["queries"] + 4
+    assert sample("jeet_db_queries_per_request_sum", route="/api/posts") == (
+        before["per_request"] + 4
+    )
+    assert sample(
+        "jeet_http_requests_total",
+        method="GET",
+        route="/api/posts/<int:post_id>",
+        status="404",
+    ) == (before["missing"] + 1)
+
+    client.post("/api/posts", json={"message": "be kind"})
+    assert sample("jeet_moderation_duration_seconds_count") == before["moderation"] + 1
+    assert sample("jeet_serialization_duration_seconds_count", schema="PostPage") == (
+        before["serialization"] + 2
+    )
+
+    scraped = scrape(client)
+    key = (
+        "jeet_http_requests_total",
+        (("method", "GET"), ("route", "/api/posts"), ("status", "200")),
+    )
+    assert scraped[key] == sample("jeet_http_requests_total", status="200", **feed)
+
+
+def test_compression_cache_hits_and_misses():
+    client = make_app(COMPRESS_MIN_SIZE=100).test_client()
+    hit = sample("jeet_cache_requests_total", cache="compression", result="hit")
+    miss = sample("jeet_cache_requests_total", cache="compression", result="miss")
+    for _ in range(3):
+        resp = client.get("/api/posts", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+    assert sample("jeet_cache_requests_total", cache="compression", result="miss") == (
+        miss + 1
+    )
+    assert sample("jeet_cache_requests_total", cache="compression", result="hit") == (
+        hit + 2
+    )
+
+
+def test_queries_outside_requests_are_background():
+    app = make_app()
+    before = sample("jeet_db_queries_total", route="<background>")
+    with app.app_context():
+        Post.query.count()
+    assert sample("jeet_db_queries_total", route="<background>") == before + 1
+
+
+def test_metrics_endpoint_merges_worker_processes(tmp_path):
+    # prometheus_client picks multiprocess mode at import, so use subprocesses
+    script = textwrap.dedent(
+        """
+        import sys
+        from app import create_app, db
+
+        app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///" + sys.argv[1],
+            "ENABLE_RATE_LIMITING": False,
+            "ENABLE_METRICS": True,
+        })
+        client = app.test_client()
+        if sys.argv[2] == "scrape":
+            print(client.get("/metrics").get_data(as_text=True))
+        else:
+            with app.app_context():
+                db.create_all()
+            for _ in range(int(sys.argv[2])):
+                client.get("/api/posts")
+        """
+    )
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path / "metrics"))
+    database = str(tmp_path / "metrics.db")
+
+    def run(arg):
+        return subprocess.run(
+            [sys.executable, "-c", script, database, arg],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+
+    run("2")
+    run("3")
+    families = text_string_to_metric_families(run("scrape"))
+    values = {
+        s.labels.get("route"): s.value
+        for family in families
+        for s in family.samples
+        if s.name == "jeet_http_requests_total"
+    }
+    assert values["/api/posts"] == 5
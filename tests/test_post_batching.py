@@ -0,0 +1,115 @@
+"""
+test_post_batching.py
+Tests for the optional group-commit write pipeline (ENABLE_POST_BATCHING).
+"""
+
+import threading
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app, db
+from app.post_writer import get_post_writer
+
+
+@pytest.fixture
+def batching_app():
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "ENABLE_RATE_LIMITING": False,
+            "ENABLE_POST_BATCHING": True,
+            "POST_BATCH_SIZE": 8,
+            "POST_BATCH_DELAY_MS": 50,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+    yield app
+    get_post_writer(app).close()
+    with app.app_context():
+        db.drop_all()
+
+
+def test_batching_disabled_by_default(client):
+    assert get_post_writer(client.application) is None
+
+
+def test_batched_create_returns_real_ids(batching_app):
+    client = batching_app.test_client()
+    resp = client.post("/api/posts", json={"message": "Batched kindness"})
+    assert resp.status_code == 201
+    data = resp.get_json()
+    assert data["message"] == "Batched kindness"
+    assert data["creation_timestamp"].endswith("Z")
+
+    fetched = client.get(f"/api/posts/{data['id']}").get_json()
+    assert fetched["username"] == data["username"]
+    assert fetched["creation_timestamp"] == data["creation_timestamp"]
+
+
+def test_concurrent_posts_share_commits(batching_app):
+    writer = get_post_writer(batching_app)
+    commits = []
+    event.listen(writer.engine, "commit", lambda conn: commits.append(1))
+
+    results = []
+
+    def post(i):
+        client = batching_app.test_client()
+        resp = client.post("/api/posts", json={"message": f"Post {i}"})
+        results.append((resp.status_code, resp.get_json()["id"]))
+
+    threads = [threading.Thread(target=post, args=(i,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+
+    assert [code for code, _ in results] == [201] * 16
+    assert len({pid for _, pid in results}) == 16
+    assert len(commits) < 16
+
+    resp = batching_app.test_client().get("/api/posts?limit=50")
+    assert resp.get_json()["total_count"] == 16
+
+
+def test_failed_row_does_not_fail_its_batch(batching_app):
+    writer = get_post_writer(batching_app)
+    now = datetime.utcnow()
+    good = writer.submit(username="KindFox10", message="fine", timestamp=now)
+    bad = writer.submit(username="KindFox11", message=None, timestamp=now)
+    assert good.result(timeout=5)[0] > 0
+    with pytest.raises(Exception):
+        bad.result(timeout=5)
+
+
+def test_timed_out_post_is_not_written_later(batching_app, monkeypatch):
+    writer = get_post_writer(batching_app)
+    client = batching_app.test_client()
+    # No writer thread yet: the post waits in the queue until the request
+    # gives up
+    monkeypatch.setattr("app.routes.POST_WRITE_TIMEOUT", 0.05)
+    monkeypatch.setattr(writer, "_ensure_started", lambda: None)
+    assert client.post("/api/posts", json={"message": "slow"}).status_code == 500
+
+    monkeypatch.undo()
+    resp = client.post("/api/posts", json={"message": "retry"})
+    assert resp.status_code == 201
+    posts = client.get("/api/posts").get_json()
+    assert [p["message"] for p in posts] == ["retry"]
+
+
+def test_dead_writer_thread_is_replaced(batching_app):
+    writer = get_post_writer(batching_app)
+    now = datetime.utcnow()
+    writer.submit(username="KindFox12", message="first", timestamp=now).result(5)
+    dead = writer._thread
+    # The shutdown sentinel ends the thread without going through close()
+    writer._queue.put(None)
+    dead.join(5)
+    future = writer.submit(username="KindFox13", message="second", timestamp=now)
+    assert future.result(timeout=5)[0] > 0
+    assert writer._thread is not dead
@@ -136,3 +136,42 @@ def test_message_character_limit_boundary_plus_one(client):
     data = resp.get_json()
     assert "error" in data
     assert "exceeds 280 character limit" in data["error"]
+
+
+def test_cursor_paging_walks_feed_without_gaps(client):
+    from datetime import datetime
+
+    from app.models import Post
+
+    stamp = datetime(2026, 1, 1, 12, 0, 0)
+    with client.application.app_context():
+        # Shared timestamps: the id tie-break must keep pages exact
+        for i in range(7):
+            db.session.add(
+                Post(username=f"CursorCat{i}0", message=f"m{i}", timestamp=stamp)
+            )
+        db.session.commit()
+    seen, cursor = [], ""
+    while cursor is not None:
+        data = client.get(f"/api/posts?limit=3&cursor={cursor}").get_json()
+        assert "total_count" not in data and data["limit"] == 3
+        seen.extend(p["id"] for p in data["posts"])
+        assert data["has_more"] == (data["next_cursor"] is not None)
+        cursor = data["next_cursor"]
+    assert seen == [7, 6, 5, 4, 3, 2, 1]
+    assert client.get("/api/posts?cursor=not-a-cursor").status_code == 400
+
+
+@pytest.mark.parametrize("query", ["cursor=&limit=0", "cursor=&limit=-1", "limit=0"])
+def test_feed_rejects_limits_below_one(client, query):
+    resp = client.get(f"/api/posts?{query}")
+    assert resp.status_code == 400
+    assert resp.get_json() == {"error": "limit must be at least 1"}
+
+
+def test_feed_limit_is_capped(client):
+    from app.post_service import MAX_FEED_LIMIT
+
+    assert client.get("/api/posts?limit=abc").status_code == 400
+    data = client.get("/api/posts?cursor=&limit=100000").get_json()
+    assert data["limit"] == MAX_FEED_LIMIT
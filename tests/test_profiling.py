@@ -0,0 +1,143 @@
+"""
+test_profiling.py
+Tests for sampled request profiling (app/profiling.py) and `jeet profiles`.
+"""
+
+import json
+import os
+import time
+from collections import Counter
+
+import pytest
+
+from app import create_app, db, profiling
+from app.cli import main
+
+
+def make_app(tmp_path, **config):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "ENABLE_RATE_LIMITING": False,
+            "ENABLE_PROFILING": True,
+            "PROFILE_INTERVAL_MS": 1,
+            "PROFILE_DIR": str(tmp_path / "profiles"),
+            **config,
+        }
+    )
+
+    def slow_view():
+        time.sleep(0.05)
+        return "done"
+
+    app.add_url_rule("/slow", "slow", slow_view)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def index(tmp_path):
+    return profiling.load_index(str(tmp_path / "profiles"))
+
+
+def test_sampled_requests_write_collapsed_stacks(tmp_path):
+    client = make_app(tmp_path, PROFILE_SAMPLE_RATE=1.0).test_client()
+    assert client.get("/slow?tz=UTC").status_code == 200
+    (entry,) = index(tmp_path)
+    assert entry["route"] == "/slow" and entry["path"] == "/slow?tz=UTC"
+    assert entry["trigger"] == "sampled" and entry["status"] == 200
+    assert entry["duration_ms"] >= 50 and entry["samples"] > 5
+
+    counts = profiling.read_stacks(str(tmp_path / "profiles" / entry["file"]))
+    assert sum(counts.values()) == entry["samples"]
+    # time.sleep is C code, so the view itself is the sampled leaf
+    leaves = Counter(stack.split(";")[-1] for stack in counts.elements())
+    (leaf, _), *_ = leaves.most_common()
+    assert leaf.startswith("slow_view (") and "test_profiling.py:" in leaf
+    assert any("full_dispatch_request (flask/app.py:" in stack for stack in counts)
+
+
+def test_index_keeps_only_allow_listed_query_parameters(tmp_path):
+    client = make_app(tmp_path, PROFILE_SAMPLE_RATE=1.0).test_client()
+    client.get("/slow?token=secret-token&view=top&limit=5")
+    (entry,) = index(tmp_path)
+    assert entry["path"] == "/slow?view=top&limit=5"
+    assert "secret-token" not in (tmp_path / "profiles" / profiling.INDEX).read_text()
+
+
+def test_header_needs_the_admin_token(tmp_path):
+    client = make_app(tmp_path, ADMIN_TOKEN="s3cret").test_client()
+    client.get("/slow")
+    client.get("/slow", headers={"X-Profile": "1", "X-Admin-Token": "wrong"})
+    assert index(tmp_path) == []
+    client.get("/slow", headers={"X-Profile": "1", "X-Admin-Token": "s3cret"})
+    assert [e["trigger"] for e in index(tmp_path)] == ["header"]
+
+
+def test_profiling_is_off_by_default(tmp_path):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "PROFILE_SAMPLE_RATE": 1.0,
+            "PROFILE_DIR": str(tmp_path / "profiles"),
+        }
+    )
+    with app.app_context():
+        db.create_all()
+    app.test_client().get("/api/posts")
+    assert profiling.EXTENSION_KEY not in app.extensions
+    assert not os.path.exists(tmp_path / "profiles")
+
+
+def test_cli_aggregates_per_route(tmp_path, capsys):
+    client = make_app(tmp_path, PROFILE_SAMPLE_RATE=1.0).test_client()
+    for _ in range(2):
+        client.get("/slow")
+    client.get("/api/posts?view=top")
+    out = tmp_path / "merged"
+
+    code = main(
+        [
+            "profiles",
+            "--dir",
+            str(tmp_path / "profiles"),
+            "--route",
+            "/slow",
+            "--out",
+            str(out),
+            "--format",
+            "speedscope",
+        ]
+    )
+    assert code == 0
+    printed = capsys.readouterr().out
+    assert printed.startswith("GET /slow: 2 profiles")
+    assert "% total  slow_view (" in printed
+    assert "/api/posts" not in printed
+
+    doc = json.loads((out / "GET_slow.speedscope.json").read_text())
+    (profile,) = doc["profiles"]
+    assert profile["type"] == "sampled"
+    assert len(profile["samples"]) == len(profile["weights"])
+    assert all(i < len(doc["shared"]["frames"]) for s in profile["samples"] for i in s)
+
+    groups = profiling.aggregate(str(tmp_path / "profiles"), min_ms=40)
+    assert list(groups) == [("GET", "/slow")]
+
+
+def test_cli_reports_missing_profiles(tmp_path):
+    assert main(["profiles", "--dir", str(tmp_path / "none")]) == 1
+
+
+@pytest.mark.parametrize(
+    "method, route, slug",
+    [
+        ("GET", "/api/posts", "GET_api_posts"),
+        ("GET", "/api/posts/<int:post_id>", "GET_api_posts_post_id"),
+        ("GET", "/", "GET"),
+    ],
+)
+def test_route_slug(method, route, slug):
+    assert profiling.route_slug(method, route) == slug
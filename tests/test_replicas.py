@@ -0,0 +1,80 @@
+"""
+test_replicas.py
+Tests for read-replica routing and read-your-writes (app/replicas.py).
+"""
+
+import pytest
+
+from app import create_app, db
+from app.models import Post
+from app.replicas import REPLICA_BIND, RYW_COOKIE, wrote_recently
+
+
+@pytest.fixture
+def app(tmp_path):
+    # Two SQLite files stand in for primary and replica; nothing replicates
+    # between them, so a row's presence shows which one served the read.
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'primary.db'}",
+            "DATABASE_REPLICA_URL": f"sqlite:///{tmp_path / 'replica.db'}",
+            "ENABLE_RATE_LIMITING": False,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines[REPLICA_BIND])
+        db.session.add(Post(username="PrimaryOwl10", message="only on primary"))
+        db.session.commit()
+    yield app
+    with app.app_context():
+        db.drop_all()
+        db.metadata.drop_all(db.engines[REPLICA_BIND])
+
+
+def test_feed_reads_go_to_replica(app):
+    client = app.test_client()
+    assert client.get("/api/posts").get_json() == []
+    assert client.get("/api/posts/1").status_code == 404
+    assert client.get("/api/posts/1/kindness").status_code == 404
+
+
+def test_client_reads_its_own_writes(app):
+    client = app.test_client()
+    resp = client.post("/api/posts", json={"message": "fresh"})
+    assert resp.status_code == 201
+    assert client.get_cookie(RYW_COOKIE) is not None
+    messages = [p["message"] for p in client.get("/api/posts").get_json()]
+    assert messages == ["fresh", "only on primary"]
+    # Other clients still read the (lagging) replica
+    assert app.test_client().get("/api/posts").get_json() == []
+
+
+def test_failed_writes_do_not_pin_to_primary(app):
+    client = app.test_client()
+    assert client.post("/api/posts", json={"message": ""}).status_code == 400
+    assert client.get_cookie(RYW_COOKIE) is None
+
+
+def test_wrote_recently():
+    assert wrote_recently("200", now=100)
+    assert not wrote_recently("100", now=200)
+    assert not wrote_recently("garbage") and not wrote_recently(None)
+
+
+def test_without_replica_nothing_changes(tmp_path):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'solo.db'}",
+            "ENABLE_RATE_LIMITING": False,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+        assert REPLICA_BIND not in db.engines
+    client = app.test_client()
+    assert client.post("/api/posts", json={"message": "hi"}).status_code == 201
+    assert client.get_cookie(RYW_COOKIE) is None
+    assert len(client.get("/api/posts").get_json()) == 1
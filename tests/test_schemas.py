@@ -0,0 +1,103 @@
+"""
+test_schemas.py
+Tests for the typed response schemas (app/schemas.py).
+"""
+
+from typing import List
+
+import pytest
+
+from app import create_app, db, schemas
+from app.models import Post
+
+
+@pytest.fixture
+def client():
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "ENABLE_RATE_LIMITING": False,
+            "COMPRESS_RESPONSES": False,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+        for i in range(3):
+            db.session.add(Post(username=f"GentleFinch{i}", message=f"hello {i}"))
+        db.session.commit()
+    yield app.test_client()
+    with app.app_context():
+        db.drop_all()
+
+
+def _post(**kwargs):
+    fields = dict(
+        id=1,
+        username="GentleFinch1",
+        message="hi",
+        timestamp="2025-01-02T03:04:05Z",
+        kindness_points=0,
+    )
+    fields.update(kwargs)
+    return schemas.Post(**fields)
+
+
+def test_encode_round_trip():
+    post = _post(
+        content="hi",
+        creation_timestamp="2025-01-02T03:04:05Z",
+        meta=schemas.PostMeta(display="2025-01-02T03:04:05Z", future=False),
+    )
+    page = schemas.PostPage(
+        posts=[post], total_count=1, page=1, limit=20, has_more=False
+    )
+    assert schemas.decode(schemas.encode(page), schemas.PostPage) == page
+
+
+def test_unset_optional_fields_are_omitted_but_required_nulls_kept():
+    compact = schemas.to_builtins(_post())
+    assert set(compact) == {"id", "username", "message", "timestamp", "kindness_points"}
+    page = schemas.CursorPage(posts=[], limit=20, has_more=False, next_cursor=None)
+    assert b'"next_cursor":null' in schemas.encode(page)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b'{"success": true}',
+        b'{"success": 1, "new_points": 2}',
+        b'{"success": true, "new_points": true}',
+        b'{"success": true, "new_points": "2"}',
+        b"not json",
+        b'{"success": tr',
+    ],
+)
+def test_decode_rejects_invalid_payloads(payload):
+    with pytest.raises(schemas.ValidationError):
+        schemas.decode(payload, schemas.KindnessResult)
+
+
+def test_post_endpoints_share_one_shape(client):
+    listed = schemas.decode(client.get("/api/posts").data, List[schemas.Post])
+    single = schemas.decode(client.get("/api/posts/1").data, schemas.Post)
+    assert single == next(p for p in listed if p.id == 1)
+    assert single.kindness_points == 0 and single.timestamp.endswith("Z")
+
+    resp = client.post("/api/posts", json={"message": "hello there"})
+    assert resp.status_code == 201
+    created = schemas.decode(resp.data, schemas.Post)
+    assert created.message == "hello there" and created.meta is not None
+
+    page = schemas.decode(
+        client.get("/api/posts?cursor=&limit=2").data, schemas.CursorPage
+    )
+    assert len(page.posts) == 2 and page.has_more and page.next_cursor
+    offset = schemas.decode(client.get("/api/posts?page=1").data, schemas.PostPage)
+    assert offset.total_count == 4
+
+    compact = client.get("/api/posts?compact=1").get_json()
+    assert all("meta" not in item for item in compact)
+    assert schemas.decode(
+        client.get("/api/posts/1/kindness").data, schemas.KindnessCount
+    ) == schemas.KindnessCount(kindness_points=0)
@@ -0,0 +1,88 @@
+"""
+test_settings.py
+Tests for the startup settings snapshot, /_debug/flags and the admin reload hook.
+"""
+
+import dataclasses
+
+import pytest
+
+from app import create_app
+from app.settings import get_settings, load_settings
+
+
+def _app(**overrides):
+    config = {
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+        "ENABLE_RATE_LIMITING": False,
+    }
+    config.update(overrides)
+    return create_app(config)
+
+
+def test_load_settings_from_environ():
+    settings = load_settings(
+        {
+            "ENABLE_KINDNESS_POINTS": "1",
+            "RATE_LIMIT": "5/minute",
+            "FLASK_ENV": "production",
+            "KINDNESS_TOKEN_KEYS": "k2:new,k1:old",
+        }
+    )
+    assert settings.enable_kindness_points is True
+    assert settings.rate_limit == "5/minute"
+    assert settings.debug_flags_enabled is False
+    assert settings.token_keys == (("k2", "new"), ("k1", "old"))
+
+
+def test_load_settings_defaults_and_overrides():
+    settings = load_settings({}, overrides={"RATE_LIMIT": "2/second", "TESTING": 1})
+    assert settings.enable_kindness_points is False
+    assert settings.enable_rate_limiting is True
+    assert settings.rate_limit == "2/second"
+    assert settings.token_keys == (("k0", "dev-secret"),)
+
+
+def test_settings_are_immutable():
+    settings = load_settings({})
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        settings.rate_limit = "10/second"
+
+
+def test_snapshot_ignores_later_environment_changes(monkeypatch):
+    monkeypatch.setenv("ENABLE_KINDNESS_POINTS", "1")
+    app = _app()
+    monkeypatch.setenv("ENABLE_KINDNESS_POINTS", "0")
+    assert get_settings(app).enable_kindness_points is True
+    flags = app.test_client().get("/_debug/flags").get_json()["flags"]
+    assert flags["ENABLE_KINDNESS_POINTS"] == "1"
+
+
+def test_debug_flags_hidden_in_production():
+    app = _app(FLASK_ENV="production")
+    assert app.test_client().get("/_debug/flags").status_code == 404
+
+
+def test_admin_reload_requires_token():
+    client = _app().test_client()
+    assert client.post("/_admin/config/reload").status_code == 404
+
+    client = _app(ADMIN_TOKEN="s3cret").test_client()
+    resp = client.post("/_admin/config/reload", headers={"X-Admin-Token": "nope"})
+    assert resp.status_code == 403
+
+
+def test_admin_reload_picks_up_environment(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+    monkeypatch.setenv("RATE_LIMIT", "1/minute")
+    app = _app()
+    monkeypatch.setenv("RATE_LIMIT", "3/minute")
+    assert get_settings(app).rate_limit == "1/minute"
+
+    resp = app.test_client().post(
+        "/_admin/config/reload", headers={"X-Admin-Token": "s3cret"}
+    )
+    assert resp.status_code == 200
+    assert resp.get_json()["flags"]["RATE_LIMIT"] == "3/minute"
+    assert get_settings(app).rate_limit == "3/minute"
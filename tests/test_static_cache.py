@@ -0,0 +1,119 @@
+"""
+test_static_cache.py
+Tests for the STATIC_SERVE modes (app/static_cache.py).
+"""
+
+import gzip
+
+import pytest
+
+from app import create_app, db
+from app.assets import IMMUTABLE, build
+from app.static_cache import StaticFileCache
+
+
+def make_app(**config):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "ENABLE_RATE_LIMITING": False,
+            **config,
+        }
+    )
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+@pytest.fixture
+def dist(tmp_path):
+    src = tmp_path / "static"
+    src.mkdir()
+    (src / "main.js").write_text("function hello() {\n  return 'hi';\n}\n" * 40)
+    (src / "index.html").write_text('<script src="/static/main.js"></script>')
+    out = tmp_path / "dist"
+    return out, build(str(src), str(out))
+
+
+def test_memory_mode_serves_without_flask():
+    app = make_app(STATIC_SERVE="memory")
+    assert isinstance(app.wsgi_app, StaticFileCache)
+
+    @app.before_request
+    def fail():  # registered after startup: only requests reaching Flask hit it
+        raise AssertionError("static request reached Flask")
+
+    client = app.test_client()
+    with open(app.static_folder + "/main.js", "rb") as f:
+        source = f.read()
+    resp = client.get("/static/main.js")
+    assert resp.status_code == 200
+    assert resp.data == source
+    assert resp.headers["Content-Type"].startswith(("application/javascript", "text/"))
+    assert resp.headers["Cache-Control"] == "no-cache"
+
+    resp = client.get("/static/main.js", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(resp.data) == source
+
+    etag = resp.headers["ETag"]
+    resp = client.get(
+        "/static/main.js",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": etag},
+    )
+    assert resp.status_code == 304 and resp.data == b""
+
+    resp = client.head("/static/styles.css")
+    assert resp.status_code == 200 and resp.data == b""
+    assert int(resp.headers["Content-Length"]) > 0
+    assert client.get("/").status_code == 200
+
+
+def test_memory_mode_passes_api_requests_through():
+    app = make_app(STATIC_SERVE="memory")
+    client = app.test_client()
+    assert client.get("/api/posts").status_code == 200
+    assert client.get("/static/missing.js").status_code == 404
+
+
+def test_memory_mode_serves_hashed_build(dist):
+    out, manifest = dist
+    app = make_app(STATIC_SERVE="memory", STATIC_DIST=True, STATIC_DIST_DIR=str(out))
+    client = app.test_client()
+    resp = client.get(f"/static/{manifest['main.js']}")
+    assert resp.status_code == 200
+    assert resp.headers["Cache-Control"] == IMMUTABLE
+    assert resp.headers["Vary"] == "Accept-Encoding"
+    assert f"/static/{manifest['main.js']}".encode() in client.get("/").data
+
+
+def test_x_accel_redirect(dist):
+    out, manifest = dist
+    app = make_app(STATIC_SERVE="x-accel", STATIC_DIST=True, STATIC_DIST_DIR=str(out))
+    client = app.test_client()
+    name = manifest["main.js"]
+    resp = client.get(f"/static/{name}")
+    assert resp.status_code == 200
+    assert resp.headers["X-Accel-Redirect"] == f"/_static/{name}"
+    assert resp.headers["Cache-Control"] == IMMUTABLE
+    assert resp.data == b""
+    assert client.get("/").headers["X-Accel-Redirect"] == "/_static/index.html"
+
+    app = make_app(STATIC_SERVE="x-accel", STATIC_ACCEL_PREFIX="/internal/")
+    client = app.test_client()
+    resp = client.get("/static/main.js")
+    assert resp.headers["X-Accel-Redirect"] == "/internal/main.js"
+    assert client.get("/static/missing.js").status_code == 404
+
+
+def test_x_sendfile():
+    app = make_app(STATIC_SERVE="x-sendfile")
+    resp = app.test_client().get("/static/main.js")
+    assert resp.headers["X-Sendfile"].endswith("main.js")
+    resp.close()
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="STATIC_SERVE"):
+        make_app(STATIC_SERVE="nginx")
@@ -0,0 +1,40 @@
+import pytest
+
+from app.gunicorn_conf import resolve
+
+
+def test_defaults_scale_with_cpus():
+    conf = resolve({}, cpu_count=4)
+    assert conf["worker_class"] == "gthread"
+    assert conf["workers"] == 9 and conf["threads"] == 4
+    assert conf["preload_app"] is True
+    assert conf["max_requests_jitter"] == conf["max_requests"] // 10
+
+
+def test_sync_and_overrides():
+    conf = resolve(
+        {"WEB_WORKER_CLASS": "sync", "WEB_WORKERS": "3", "WEB_PRELOAD": "0"},
+        cpu_count=8,
+    )
+    assert conf["workers"] == 3 and conf["threads"] == 1
+    assert conf["preload_app"] is False
+
+
+def test_gevent_falls_back_without_gevent(monkeypatch):
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+    assert resolve({"WEB_WORKER_CLASS": "gevent"}, cpu_count=2)["worker_class"] == (
+        "gthread"
+    )
+
+
+def test_gevent_does_not_preload_by_default(monkeypatch):
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: object())
+    conf = resolve({"WEB_WORKER_CLASS": "gevent"}, cpu_count=2)
+    assert conf["worker_class"] == "gevent" and conf["preload_app"] is False
+    conf = resolve({"WEB_WORKER_CLASS": "gevent", "WEB_PRELOAD": "1"}, cpu_count=2)
+    assert conf["preload_app"] is True
+
+
+def test_rejects_unknown_worker_class():
+    with pytest.raises(ValueError):
+        resolve({"WEB_WORKER_CLASS": "tornado"}, cpu_count=1)
@@ -0,0 +1,68 @@
+import multiprocessing
+
+from app.ratelimit_storage import SQLiteStorage
+
+
+def _hammer(uri, n):
+    storage = SQLiteStorage(uri)
+    for _ in range(n):
+        storage.incr("shared", 60)
+
+
+def test_scheme_registered_with_limits(tmp_path):
+    from limits.storage import storage_from_string
+
+    storage = storage_from_string(f"sqlite:///{tmp_path}/rl.db")
+    assert isinstance(storage, SQLiteStorage)
+    assert storage.path == f"{tmp_path}/rl.db"
+    assert storage.check()
+
+
+def test_incr_get_and_clear():
+    storage = SQLiteStorage("sqlite://")
+    assert storage.get("k") == 0
+    assert storage.incr("k", 60) == 1
+    assert storage.incr("k", 60, amount=2) == 3
+    assert storage.get("k") == 3
+    assert storage.get_expiry("k") > 0
+    storage.clear("k")
+    assert storage.get("k") == 0
+
+
+def test_expired_window_restarts(monkeypatch):
+    import app.ratelimit_storage as mod
+
+    now = [1000.0]
+    monkeypatch.setattr(mod.time, "time", lambda: now[0])
+    storage = SQLiteStorage("sqlite://")
+    storage.incr("k", 10)
+    storage.incr("k", 10)
+    now[0] += 11
+    assert storage.get("k") == 0
+    assert storage.incr("k", 10) == 1
+
+
+def test_counters_shared_across_processes(tmp_path):
+    uri = f"sqlite:///{tmp_path}/rl.db"
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_hammer, args=(uri, 50)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(30)
+        assert p.exitcode == 0
+    assert SQLiteStorage(uri).get("shared") == 150
+
+
+def test_fixed_window_limiter_enforced_across_instances(tmp_path):
+    from limits import parse
+    from limits.strategies import FixedWindowRateLimiter
+
+    uri = f"sqlite:///{tmp_path}/rl.db"
+    worker_a = FixedWindowRateLimiter(SQLiteStorage(uri))
+    worker_b = FixedWindowRateLimiter(SQLiteStorage(uri))
+    limit = parse("2/minute")
+    assert worker_a.hit(limit, "1.2.3.4")
+    assert worker_b.hit(limit, "1.2.3.4")
+    assert not worker_a.hit(limit, "1.2.3.4")
+    assert not worker_b.test(limit, "1.2.3.4")
@@ -0,0 +1,98 @@
+import hashlib
+import hmac
+
+import pytest
+
+from app.token_codec import TokenCodec, parse_keyring
+
+
+def _legacy_token(secret, post_id, nonce, expiry):
+    payload = f"{post_id}:{nonce}:{expiry}".encode("utf-8")
+    sig = hmac.new(secret.encode("utf-8"), payload, hashlib.sha256).hexdigest()
+    return f"{sig}|{expiry}|{nonce}|{post_id}"
+
+
+def test_issue_and_decode_roundtrip():
+    codec = TokenCodec([("k1", "secret")])
+    token = codec.issue(42, now=1000)
+    assert token.startswith("k1.")
+    assert "|" not in token
+    post_id, nonce = codec.decode(token, now=1000)
+    assert post_id == 42
+    assert nonce
+
+
+def test_tokens_are_unique_and_compact():
+    codec = TokenCodec([("k1", "secret")])
+    legacy = _legacy_token("secret", 42, "x" * 22, 1300)
+    tokens = {codec.issue(42) for _ in range(50)}
+    assert len(tokens) == 50
+    assert all(len(t) < len(legacy) for t in tokens)
+
+
+def test_expired_token_rejected():
+    codec = TokenCodec([("k1", "secret")], ttl=300)
+    token = codec.issue(1, now=1000)
+    assert codec.decode(token, now=1300) is not None
+    assert codec.decode(token, now=1301) is None
+
+
+def test_tampered_or_unknown_key_rejected():
+    codec = TokenCodec([("k1", "secret")])
+    token = codec.issue(7)
+    kid, data = token.split(".")
+    flipped = data[:-2] + ("A" if data[-2] != "A" else "B") + data[-1]
+    assert codec.decode(f"{kid}.{flipped}") is None
+    assert codec.decode(f"k9.{data}") is None
+    assert TokenCodec([("k1", "other")]).decode(token) is None
+    assert codec.decode("garbage") is None
+    assert codec.decode("k1.!!!") is None
+    assert codec.decode(None) is None
+
+
+def test_only_the_canonical_spelling_verifies():
+    codec = TokenCodec([("k1", "secret")])
+    token = codec.issue(7)
+    assert codec.decode(token) is not None
+    for variant in (token + "!", token + "$", token + "=", token + "==", token + " "):
+        assert codec.decode(variant) is None, variant
+    # The same bytes spelled in the standard base64 alphabet
+    token = next(t for t in (codec.issue(7) for _ in range(100)) if "-" in t)
+    assert codec.decode(token.replace("-", "+")) is None
+
+
+def test_legacy_tokens_only_verify_canonically():
+    codec = TokenCodec([("k1", "secret")])
+    token = _legacy_token("secret", "5", "abc", 2000)
+    sig, expiry, nonce, post_id = token.split("|")
+    assert codec.decode(f"{sig}| {expiry}|{nonce}|{post_id}", now=1999) is None
+    assert codec.decode(f"{sig}|+{expiry}|{nonce}|{post_id}", now=1999) is None
+    # "5:ab" + "c" signs the same payload as "5" + "ab:c"
+    shifted = _legacy_token("secret", "5:ab", "c", 2000)
+    assert codec.decode(shifted, now=1999) is None
+
+
+def test_key_rotation_accepts_old_key():
+    old = TokenCodec([("k1", "old-secret")])
+    rotated = TokenCodec([("k2", "new-secret"), ("k1", "old-secret")])
+    assert rotated.decode(old.issue(3))[0] == 3
+    assert rotated.issue(3).startswith("k2.")
+    # Once the old key is dropped its tokens no longer verify
+    assert TokenCodec([("k2", "new-secret")]).decode(old.issue(3)) is None
+
+
+def test_legacy_tokens_still_verify():
+    codec = TokenCodec([("k2", "new-secret"), ("k1", "secret")])
+    token = _legacy_token("secret", "5", "abc", 2000)
+    assert codec.decode(token, now=1999) == ("5", "abc")
+    assert codec.decode(token, now=2001) is None
+    assert codec.decode(_legacy_token("wrong", "5", "abc", 2000), now=1999) is None
+
+
+def test_parse_keyring():
+    assert parse_keyring("k2:new, k1:old") == [("k2", "new"), ("k1", "old")]
+    assert parse_keyring("") == []
+    with pytest.raises(ValueError):
+        parse_keyring("missing-secret")
+    with pytest.raises(ValueError):
+        TokenCodec([("bad.kid", "s")])
@@ -0,0 +1,40 @@
+import re
+
+import pytest
+
+from app.usernames import UsernameAllocator, load_words
+from app.utils import ADJECTIVES, ANIMALS
+
+
+def test_names_follow_format_and_do_not_repeat_within_window():
+    allocator = UsernameAllocator(ADJECTIVES, ANIMALS, recent_window=5000)
+    names = [allocator.allocate() for _ in range(5000)]
+    assert len(set(names)) == 5000
+    assert all(re.match(r"^[A-Za-z]+[A-Za-z]+\d{2}$", n) for n in names)
+
+
+def test_small_pool_skips_recent_names():
+    allocator = UsernameAllocator(["Calm"], ["Fox", "Owl"], numbers=range(10, 13))
+    # Window is capped at pool size - 1, so a full cycle has no repeats
+    assert allocator.recent_window == 5
+    first = [allocator.allocate() for _ in range(6)]
+    assert len(set(first)) == 6
+    allocator.remember([first[0]])
+    assert allocator.allocate() != first[0]
+
+
+def test_pool_is_shared_permutation_and_capped():
+    a = UsernameAllocator(ADJECTIVES, ANIMALS, seed=7).warm()
+    b = UsernameAllocator(ADJECTIVES, ANIMALS, seed=7).warm()
+    assert list(a._pool[:100]) == list(b._pool[:100])
+    capped = UsernameAllocator(ADJECTIVES, ANIMALS, max_pool=1000).warm()
+    assert len(capped._pool) == 1000
+    assert capped.recent_window == 999
+
+
+def test_custom_word_lists(tmp_path):
+    path = tmp_path / "animals.txt"
+    path.write_text("# comment\nYak\n\nYak\nEmu  # trailing\n", encoding="utf-8")
+    assert load_words(str(path)) == ["Yak", "Emu"]
+    with pytest.raises(ValueError):
+        UsernameAllocator(["X" * 20], ["Y" * 20])
@@ -61,6 +61,10 @@ else
   fi
 fi
 
-# Run migrations and start Flask
-flask db upgrade
-flask run --host=0.0.0.0
+# Development keeps the Flask dev server (auto-reload); everything else runs
+# migrations and gunicorn with the production profile via run.py
+if [ "$FLASK_ENV" = "development" ]; then
+  flask db upgrade
+  exec flask run --host=0.0.0.0
+fi
+exec python run.py